@@ -1,9 +1,12 @@
 """Application module."""
+import datetime
 import logging
 
 from dependency_injector.wiring import Provide, inject
+from prometheus_client import start_http_server
 
 from bwg.currency_pairs.containers import create_container
+from bwg.currency_pairs.services.candles import CandlesAggregator
 from bwg.currency_pairs.services.processor import ProcessorService
 
 __all__ = ("Application",)
@@ -28,5 +31,23 @@ class Application:
     @inject
     def run(
             processor: "ProcessorService" = Provide['processor'],
+            metrics_port: int = Provide['config.metrics.port'],
     ) -> None:
+        start_http_server(metrics_port)
         processor.run_infinity_loop()
+
+    @staticmethod
+    @inject
+    def run_consumers(
+            processor: "ProcessorService" = Provide['processor'],
+    ) -> None:
+        processor.run_consumers()
+
+    @staticmethod
+    @inject
+    def backfill_candles(
+            start: datetime.date,
+            end: datetime.date,
+            candles_aggregator: "CandlesAggregator" = Provide['candles_aggregator'],
+    ) -> None:
+        candles_aggregator.backfill(start, end)
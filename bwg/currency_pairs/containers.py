@@ -8,11 +8,24 @@ import logging
 from dependency_injector import containers, providers
 
 from bwg.currency_pairs.services.binance_service import BinanceService
+from bwg.currency_pairs.services.binance_stream import BinanceStreamService
+from bwg.currency_pairs.services.candles import CandlesAggregator
 from bwg.currency_pairs.services.coingecko import CoinGeckoService
+from bwg.currency_pairs.services.consolidator import Consolidator
+from bwg.currency_pairs.services.consumer import ConsumerService
+from bwg.currency_pairs.services.cross_rates import CrossRates
+from bwg.currency_pairs.services.fetcher import FetcherService
 from bwg.currency_pairs.services.processor import ProcessorService
+from bwg.currency_pairs.services.scheduler import Scheduler
+from bwg.currency_pairs.services.source_selector import SourceSelector
+from bwg.currency_pairs.services.ticks_writer import TicksWriter
+from bwg.lib.broker import InProcessBroker, ZeroMQBroker
 from bwg.lib.env_config import get_config_path, maybe_load_env
+from bwg.lib.pair_registry import PairRegistry
 from bwg.lib.postgres.containers import PostgresContainer
+from bwg.lib.repositories.currency_candles import CurrencyCandlesRepository
 from bwg.lib.repositories.currency_pairs import CurrencyPairsRepository
+from bwg.lib.repositories.currency_ticks import CurrencyTicksRepository
 
 __all__ = ("create_container",)
 
@@ -28,29 +41,176 @@ class Container(containers.DeclarativeContainer):
     postgres_package: providers.Container[PostgresContainer] = providers.Container(
         PostgresContainer,
         config=config.postgres,
+        role="worker",
+        pool_options=config.postgres.pool.worker,
+    )
+
+    pair_registry: providers.Singleton[PairRegistry] = providers.Singleton(
+        PairRegistry,
+        tokens=config.pairs.tokens,
+        currencies=config.pairs.currencies,
+    )
+
+    cross_rates: providers.Singleton[CrossRates] = providers.Singleton(
+        CrossRates,
+        max_hops=config.cross_rates.max_hops,
+        path=config.cross_rates.path,
+    )
+
+    fetcher: providers.Singleton[FetcherService] = providers.Singleton(
+        FetcherService,
+        max_workers=config.fetcher.max_workers,
     )
 
     coingecko: providers.Singleton[CoinGeckoService] = providers.Singleton(
         CoinGeckoService,
+        api_url=config.exchanges.coingecko.api_url,
+        rate_limit=config.exchanges.coingecko.rate_limit,
+        burst=config.exchanges.coingecko.burst,
+        timeout=config.exchanges.coingecko.timeout,
+        failure_threshold=config.exchanges.coingecko.failure_threshold,
+        reset_timeout=config.exchanges.coingecko.reset_timeout,
+        max_reset_timeout=config.exchanges.coingecko.max_reset_timeout,
+    )
+
+    coingecko.add_attributes(
+        fetcher=fetcher,
+        pair_registry=pair_registry,
     )
 
     binance:  providers.Singleton[BinanceService] = providers.Singleton(
         BinanceService,
+        api_url=config.exchanges.binance.api_url,
+        rate_limit=config.exchanges.binance.rate_limit,
+        burst=config.exchanges.binance.burst,
+        timeout=config.exchanges.binance.timeout,
+        failure_threshold=config.exchanges.binance.failure_threshold,
+        reset_timeout=config.exchanges.binance.reset_timeout,
+        max_reset_timeout=config.exchanges.binance.max_reset_timeout,
+        basis=config.exchanges.binance.basis,
+    )
+
+    binance.add_attributes(
+        fetcher=fetcher,
+        pair_registry=pair_registry,
+        cross_rates=cross_rates,
+    )
+
+    binance_stream: providers.Singleton[BinanceStreamService] = providers.Singleton(
+        BinanceStreamService,
+        ws_url=config.exchanges.binance.ws_url,
+        stream=config.exchanges.binance.stream,
+        max_age=config.exchanges.binance.stream_max_age,
+        reconnect_min_delay=config.exchanges.binance.reconnect_min_delay,
+        reconnect_max_delay=config.exchanges.binance.reconnect_max_delay,
+    )
+
+    binance_stream.add_attributes(
+        binance=binance,
     )
 
     currency_pairs_repository: providers.Singleton[CurrencyPairsRepository] = providers.Singleton(
         CurrencyPairsRepository,
     )
 
+    currency_ticks_repository: providers.Singleton[CurrencyTicksRepository] = providers.Singleton(
+        CurrencyTicksRepository,
+    )
+
+    currency_candles_repository: providers.Singleton[CurrencyCandlesRepository] = providers.Singleton(
+        CurrencyCandlesRepository,
+    )
+
+    candles_aggregator: providers.Singleton[CandlesAggregator] = providers.Singleton(
+        CandlesAggregator,
+    )
+
+    candles_aggregator.add_attributes(
+        db_postgres=postgres_package.db,
+        currency_candles_repository=currency_candles_repository,
+        currency_ticks_repository=currency_ticks_repository,
+    )
+
+    ticks_writer: providers.Singleton[TicksWriter] = providers.Singleton(
+        TicksWriter,
+        batch_size=config.ticks.batch_size,
+        flush_interval=config.ticks.flush_interval,
+        max_buffer=config.ticks.max_buffer,
+        max_failures=config.ticks.max_failures,
+    )
+
+    ticks_writer.add_attributes(
+        db_postgres=postgres_package.db,
+        currency_ticks_repository=currency_ticks_repository,
+        candles_aggregator=candles_aggregator,
+    )
+
+    broker: providers.Selector = providers.Selector(
+        config.broker.type,
+        in_process=providers.Singleton(
+            InProcessBroker,
+            max_size=config.broker.max_size,
+        ),
+        zeromq=providers.Singleton(
+            ZeroMQBroker,
+            url=config.broker.zeromq.url,
+            bind_url=config.broker.zeromq.bind_url,
+            high_water_mark=config.broker.max_size,
+        ),
+    )
+
+    consumer: providers.Singleton[ConsumerService] = providers.Singleton(
+        ConsumerService,
+        workers=config.broker.consumers,
+        batch_size=config.broker.batch_size,
+        batch_timeout=config.broker.batch_timeout,
+    )
+
+    consumer.add_attributes(
+        broker=broker,
+        db_postgres=postgres_package.db,
+        currency_pairs_repository=currency_pairs_repository,
+        ticks_writer=ticks_writer,
+    )
+
+    source_selector: providers.Singleton[SourceSelector] = providers.Singleton(
+        SourceSelector,
+        latency_budget=config.source_selector.latency_budget,
+        timeout=config.source_selector.timeout,
+        alpha=config.source_selector.alpha,
+        max_error_rate=config.source_selector.max_error_rate,
+        probe_interval=config.source_selector.probe_interval,
+    )
+
+    scheduler: providers.Singleton[Scheduler] = providers.Singleton(
+        Scheduler,
+        max_concurrent=config.processor.max_concurrent_cycles,
+    )
+
+    consolidator: providers.Singleton[Consolidator] = providers.Singleton(
+        Consolidator,
+        divergence_threshold=config.consolidation.divergence_threshold,
+        half_life=config.consolidation.half_life,
+    )
+
     processor: providers.Singleton[ProcessorService] = providers.Singleton(
         ProcessorService,
+        mode=config.processor.mode,
+        poll_interval=config.processor.poll_interval,
+        stream_interval=config.processor.stream_interval,
+        consolidate=config.processor.consolidate,
     )
 
     processor.add_attributes(
-        db_postgres=postgres_package.db,
         coingecko=coingecko,
-        currency_pairs_repository=currency_pairs_repository,
         binance=binance,
+        binance_stream=binance_stream,
+        broker=broker,
+        consumer=consumer,
+        source_selector=source_selector,
+        scheduler=scheduler,
+        consolidator=consolidator,
+        pair_registry=pair_registry,
     )
 
 
@@ -1,5 +1,8 @@
 """Main entrypoint for application."""
 # isort: skip_file
+import argparse
+import datetime
+
 from bwg.lib.setup_logger import setup_logger
 from bwg.currency_pairs.logging_config import LOGGING_CONFIG
 
@@ -21,5 +24,32 @@ def run() -> None:
     app.run()
 
 
+def run_consumers() -> None:
+    """
+    Run only consumers of price events.
+
+    Returns:
+        None
+    """
+    app = Application()
+    app.run_consumers()
+
+
+def backfill_candles() -> None:
+    """
+    Recompute candles from stored ticks.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Recompute candles of days [start, end) from stored ticks.")
+    parser.add_argument("start", type=datetime.date.fromisoformat, help="first day, YYYY-MM-DD")
+    parser.add_argument("end", type=datetime.date.fromisoformat, help="day after the last one, YYYY-MM-DD")
+    args = parser.parse_args()
+
+    app = Application()
+    app.backfill_candles(args.start, args.end)
+
+
 if __name__ == "__main__":  # pragma: no cover
     run()
@@ -1,41 +1,123 @@
-"""CoinGecko client module."""
-# pylint: disable=consider-iterating-dictionary
+"""Binance client module."""
 # pylint: disable=broad-exception-caught
+import json
 import logging
 import time
-from typing import Dict
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
 
 from binance.client import Client
 
+from bwg.currency_pairs.services.circuit_breaker import CircuitBreaker
+from bwg.currency_pairs.services.cross_rates import CrossRates, Quote
+from bwg.currency_pairs.services.fetcher import FetcherService, RateLimiter
+from bwg.lib.pair_registry import PairRegistry
+
 __all__ = ("BinanceService",)
 
 logger = logging.getLogger(__name__)
 
 
+class BinanceClient(Client):
+    """Binance client with configurable REST endpoint."""
+
+    def __init__(self, api_url: str, **kwargs: Any) -> None:
+        self.API_URL = api_url
+        self._initialized = False
+        super().__init__(**kwargs)
+        self._initialized = True
+
+    def ping(self) -> Dict:
+        # Client.__init__ pings the exchange, skip it so the worker starts while Binance is down
+        if not self._initialized:
+            return {}
+        return super().ping()
+
+
 class BinanceService:
-    """Binance service."""
+    """Binance service.
 
-    def __init__(self) -> None:
-        self.client = Client()
-        self.compendium = {
-            'USDT': 'USD',
-            'RUB': 'RUB'
-        }
+    Fetches markets of `basis`, given as BASE/QUOTE names of Binance, e.g. BTC/USDT,
+    or the market of every pair without basis. Prices of pairs are derived from them by `cross_rates`,
+    e.g. BTC-RUB from BTC/USDT and USDT/RUB, a pair with its own market in basis uses it directly.
+    """
+
+    fetcher: "FetcherService"
+    pair_registry: "PairRegistry"
+    cross_rates: "CrossRates"
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            api_url: str = "https://api.binance.com/api",
+            rate_limit: float = 10,
+            burst: int = 1,
+            timeout: float = 2,
+            failure_threshold: int = 3,
+            reset_timeout: float = 5,
+            max_reset_timeout: float = 60,
+            basis: Optional[List[str]] = None,
+    ) -> None:
+        self.basis = basis or []
+        self.client = BinanceClient(api_url, requests_params={"timeout": timeout})
+        self.rate_limiter = RateLimiter(rate_limit, burst)
+        self.circuit_breaker = CircuitBreaker("binance", failure_threshold, reset_timeout, max_reset_timeout)
+        self.timeout = timeout
+
+    @cached_property
+    def symbols(self) -> Dict[str, Tuple[str, str]]:
+        """
+        Get markets to fetch, symbol is base name followed by quote name, e.g. BTCUSDT.
 
-    def get_currency_by_pair(self, pairs:  Dict) -> dict:
-        res = {}
-        for token in pairs.keys():
-            token_buffer = {}  # type: ignore[var-annotated]
-            for currency in pairs[token]:
-                symbol = token+currency
-                tickers = self.client.get_symbol_ticker(symbol=symbol)
-                if token not in token_buffer.keys():
-                    token_buffer[str(token)] = {self.compendium[currency]: tickers['price']}
-                else:
-                    token_buffer[str(token)].update({self.compendium[currency]: tickers['price']})
-                res.update(token_buffer)
-            time.sleep(0.2)
-        return res
+        Returns:
+            dict: (base, quote) by symbol
+        """
+        if not self.basis:
+            return {base + quote: (base, quote) for base, quote in self.pair_registry.codes('binance')}
+        markets = [tuple(market.upper().split('/', 1)) for market in self.basis]
+        return {base + quote: (base, quote) for base, quote in markets}
+
+    def get_prices(self) -> Dict[Tuple[str, str], Quote]:
+        return self.parse_tickers(self.fetch_tickers(list(self.symbols)))
+
+    def fetch_tickers(self, symbols: List[str]) -> List[dict]:
+        tickers = self.fetcher.call(
+            "binance tickers",
+            lambda: self.get_tickers(symbols),
+            self.rate_limiter,
+            self.timeout,
+            self.circuit_breaker,
+        )
+        return tickers or []
+
+    def get_tickers(self, symbols: List[str]) -> List[dict]:
+        """
+        Get prices of all symbols with one request.
+
+        Returns:
+            list: tickers in form of {"symbol": ..., "price": ...}
+        """
+        return self.client.get_symbol_ticker(symbols=json.dumps(symbols, separators=(',', ':')))
+
+    def parse_tickers(self, tickers: List[dict]) -> Dict[Tuple[str, str], Quote]:
+        """
+        Derive prices of canonical pairs from tickers, one market may be a price of several pairs.
+
+        A ticker without `epoch` seconds is received now.
+
+        Returns:
+            dict: quote by (token, currency), empty without tickers
+        """
+        if not tickers:
+            return {}
+        now = time.time()
+        symbols = self.symbols
+        quotes = {
+            symbols[ticker['symbol']]: Quote(float(ticker['price']), ticker.get('epoch', now))
+            for ticker in tickers if ticker['symbol'] in symbols
+        }
+        codes = self.pair_registry.codes('binance')
+        derived = self.cross_rates.derive(quotes, codes)
+        return {pair: quote for market, quote in derived.items() for pair in codes[market]}
 
     def ping(self) -> bool:
         try:
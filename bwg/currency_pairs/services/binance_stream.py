@@ -0,0 +1,109 @@
+"""Binance stream client module."""
+# pylint: disable=broad-exception-caught
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+import websockets
+from prometheus_client import Counter
+
+from bwg.currency_pairs.services.binance_service import BinanceService
+from bwg.currency_pairs.services.cross_rates import Quote
+
+__all__ = ("BinanceStreamService",)
+
+logger = logging.getLogger(__name__)
+
+STREAM_RECONNECTS = Counter("binance_stream_reconnects", "Number of reconnects to the Binance ticker stream.")
+STREAM_FALLBACKS = Counter(
+    "binance_stream_rest_fallbacks",
+    "Number of cycles which fetched symbols without a live stream price over REST.",
+)
+
+
+class BinanceStreamService:  # pylint: disable=too-many-instance-attributes
+    """Binance stream service.
+
+    Subscribes to the ticker stream of the configured symbols and keeps the latest prices.
+    Symbols without a live price are fetched from REST API of `binance`.
+    """
+
+    binance: "BinanceService"
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            ws_url: str = "wss://stream.binance.com:9443",
+            stream: str = "miniTicker",
+            max_age: float = 5,
+            reconnect_min_delay: float = 0.5,
+            reconnect_max_delay: float = 30,
+    ) -> None:
+        self.ws_url = ws_url
+        self.stream = stream
+        self.max_age = max_age
+        self.reconnect_min_delay = reconnect_min_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self._prices: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, symbols: List[str]) -> None:
+        if self._thread is not None:
+            return
+        streams = "/".join(f"{symbol.lower()}@{self.stream}" for symbol in symbols)
+        url = f"{self.ws_url}/stream?streams={streams}"
+        self._thread = threading.Thread(target=asyncio.run, args=(self._run(url),), name="binance-stream", daemon=True)
+        self._thread.start()
+
+    async def _run(self, url: str) -> None:
+        delay = self.reconnect_min_delay
+        while True:
+            try:
+                async with websockets.connect(url) as connection:
+                    logger.info(f"Connected to Binance stream {url}")
+                    async for message in connection:
+                        self._on_message(message)
+                        delay = self.reconnect_min_delay
+            except Exception as exc:
+                logger.warning(f"Binance stream dropped with {exc=}.")
+            STREAM_RECONNECTS.inc()
+            jittered_delay = delay * random.uniform(0.5, 1.5)
+            logger.info(f"Reconnect to Binance stream in {jittered_delay:.2f}s")
+            await asyncio.sleep(jittered_delay)
+            delay = min(delay * 2, self.reconnect_max_delay)
+
+    def _on_message(self, message: Union[str, bytes]) -> None:
+        data = json.loads(message)
+        data = data.get("data", data)
+        with self._lock:
+            self._prices[data["s"]] = (data["c"], time.monotonic())
+
+    def get_tickers(self) -> List[dict]:
+        """
+        Get live prices received from the stream.
+
+        Returns:
+            list: tickers in form of {"symbol": ..., "price": ..., "epoch": ...} not older than `max_age`
+        """
+        now = time.monotonic()
+        epoch = time.time()
+        with self._lock:
+            return [{"symbol": symbol, "price": price, "epoch": epoch - (now - received_at)}
+                    for symbol, (price, received_at) in self._prices.items()
+                    if now - received_at <= self.max_age]
+
+    def get_prices(self) -> Dict[Tuple[str, str], Quote]:
+        tickers = self.get_tickers()
+        missing = set(self.binance.symbols) - {ticker["symbol"] for ticker in tickers}
+        if missing:
+            logger.debug(f"No live prices for {missing}, fall back to REST")
+            STREAM_FALLBACKS.inc()
+            tickers += self.binance.fetch_tickers(sorted(missing))
+        return self.binance.parse_tickers(tickers)
+
+    def ping(self) -> bool:
+        return self.binance.ping()
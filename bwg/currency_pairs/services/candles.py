@@ -0,0 +1,122 @@
+"""Candles aggregator module."""
+import datetime
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import orm
+
+from bwg.lib.postgres import PostgresDatabase
+from bwg.lib.repositories.currency_candles import (CANDLE_RESOLUTIONS,
+                                                   CurrencyCandlesRepository)
+from bwg.lib.repositories.currency_ticks import CurrencyTicksRepository
+
+__all__ = ("CandlesAggregator",)
+
+logger = logging.getLogger(__name__)
+
+
+class CandlesAggregator:
+    """Candles aggregator.
+
+    Maintains OHLC candles of every resolution from ticks, separately for every exchanger.
+    """
+
+    currency_candles_repository: "CurrencyCandlesRepository"
+    currency_ticks_repository: "CurrencyTicksRepository"
+    db_postgres: "PostgresDatabase"
+
+    def __init__(self, resolutions: Optional[Dict[str, int]] = None) -> None:
+        self.resolutions = resolutions or CANDLE_RESOLUTIONS
+
+    def update(self, session: orm.Session, rows: List[dict]) -> None:
+        """
+        Merge new ticks into stored candles.
+
+        Changes are committed by caller.
+        """
+        if not rows:
+            return
+        columns = zip(*(
+            (row['token'], row['currency'], row['exchanger'], row['timestamp'], row['value']) for row in rows
+        ))
+        self.currency_candles_repository.merge_candles(session, self.aggregate(*columns))
+
+    def backfill(self, start: datetime.date, end: datetime.date) -> None:
+        """Recompute candles from stored ticks day by day."""
+        day = start
+        while day < end:
+            next_day = day + datetime.timedelta(days=1)
+            with self.db_postgres.session() as session:  # type: ignore[var-annotated]
+                ticks = self.currency_ticks_repository.get_ticks(
+                    session,
+                    datetime.datetime.combine(day, datetime.time()),
+                    datetime.datetime.combine(next_day, datetime.time()),
+                )
+                if ticks:
+                    candles = self.aggregate(*zip(*ticks))
+                    self.currency_candles_repository.replace_candles(session, candles)
+                    session.commit()  # type: ignore[attr-defined]
+                logger.info(f"Backfilled candles of {day} from {len(ticks)} ticks")
+            day = next_day
+
+    def aggregate(  # pylint: disable=too-many-locals,too-many-arguments
+            self,
+            tokens: Sequence[str],
+            currencies: Sequence[str],
+            exchangers: Sequence[str],
+            timestamps: Sequence[datetime.datetime],
+            values: Sequence[float],
+    ) -> List[dict]:
+        """
+        Aggregate ticks into candles of every resolution.
+
+        Returns:
+            list: candles ready to be written to currency_candles
+        """
+        # (token, currency, exchanger) -> id, candles of every exchanger are separate
+        pairs: Dict[Tuple[str, str, str], int] = {}
+        pair_ids = np.fromiter(
+            (pairs.setdefault(pair, len(pairs)) for pair in zip(tokens, currencies, exchangers)), dtype=np.int64,
+        )
+        names = list(pairs)
+        times = np.array(timestamps, dtype="datetime64[us]").astype(np.int64)
+        prices = np.array(values, dtype=np.float64)
+
+        order = np.lexsort((times, pair_ids))
+        pair_ids, times, prices = pair_ids[order], times[order], prices[order]
+
+        res = []
+        for resolution, seconds in self.resolutions.items():
+            step = seconds * 1_000_000
+            buckets = times // step * step
+            starts = np.flatnonzero(np.r_[True, (pair_ids[1:] != pair_ids[:-1]) | (buckets[1:] != buckets[:-1])])
+            ends = np.r_[starts[1:], len(prices)]
+            candles = zip(
+                pair_ids[starts].tolist(),
+                buckets[starts].astype("datetime64[us]").tolist(),
+                prices[starts].tolist(),
+                np.maximum.reduceat(prices, starts).tolist(),
+                np.minimum.reduceat(prices, starts).tolist(),
+                prices[ends - 1].tolist(),
+                (ends - starts).tolist(),
+                times[starts].astype("datetime64[us]").tolist(),
+                times[ends - 1].astype("datetime64[us]").tolist(),
+            )
+            for pair_id, bucket, open_, high, low, close, ticks, opened_at, closed_at in candles:
+                token, currency, exchanger = names[pair_id]
+                res.append({
+                    'token': token,
+                    'currency': currency,
+                    'exchanger': exchanger,
+                    'resolution': resolution,
+                    'bucket': bucket,
+                    'open': open_,
+                    'high': high,
+                    'low': low,
+                    'close': close,
+                    'ticks': ticks,
+                    'opened_at': opened_at,
+                    'closed_at': closed_at,
+                })
+        return res
@@ -0,0 +1,111 @@
+"""Circuit breaker module."""
+import enum
+import logging
+import random
+import threading
+import time
+
+from prometheus_client import Counter, Gauge
+
+__all__ = (
+    "CircuitBreaker",
+    "CircuitState",
+)
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_STATE = Gauge(
+    "exchange_circuit_state",
+    "State of the exchange circuit breaker: 0 - closed, 1 - half-open, 2 - open.",
+    ["exchange"],
+)
+CIRCUIT_OPENED = Counter(
+    "exchange_circuit_opened",
+    "Number of times the exchange circuit breaker opened.",
+    ["exchange"],
+)
+CIRCUIT_REJECTED = Counter(
+    "exchange_circuit_rejected",
+    "Number of requests to the exchange rejected by the open circuit breaker.",
+    ["exchange"],
+)
+
+
+class CircuitState(enum.IntEnum):
+    """State of circuit breaker, values are exported as metric."""
+
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class CircuitBreaker:  # pylint: disable=too-many-instance-attributes
+    """Circuit breaker of an exchange.
+
+    Opens after `failure_threshold` consecutive failures and rejects requests for a jittered
+    backoff, which starts at `reset_timeout` and doubles up to `max_reset_timeout`
+    every time a probe fails. After the backoff one probe request is let through (half-open),
+    its success closes the breaker.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            failure_threshold: int = 3,
+            reset_timeout: float = 5,
+            max_reset_timeout: float = 60,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._backoff = reset_timeout
+        self._opened_until = 0.0
+        self._lock = threading.Lock()
+        CIRCUIT_STATE.labels(exchange=name).set(self.state)
+
+    def allow(self) -> bool:
+        """
+        Check whether a request can be sent.
+
+        Returns:
+            bool: False while the breaker is open or its probe is in flight
+        """
+        with self._lock:
+            if self.state == CircuitState.OPEN and time.monotonic() >= self._opened_until:
+                self._set_state(CircuitState.HALF_OPEN)
+                return True
+            if self.state == CircuitState.CLOSED:
+                return True
+        CIRCUIT_REJECTED.labels(exchange=self.name).inc()
+        return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._backoff = self.reset_timeout
+            if self.state != CircuitState.CLOSED:
+                logger.info(f"Circuit of {self.name} closed")
+                self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == CircuitState.HALF_OPEN:
+                self._backoff = min(self._backoff * 2, self.max_reset_timeout)
+                self._open()
+            elif self.state == CircuitState.CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        delay = self._backoff * random.uniform(0.5, 1.5)
+        self._opened_until = time.monotonic() + delay
+        self._set_state(CircuitState.OPEN)
+        CIRCUIT_OPENED.labels(exchange=self.name).inc()
+        logger.warning(f"Circuit of {self.name} opened for {delay:.2f}s after {self._failures} failures")
+
+    def _set_state(self, state: CircuitState) -> None:
+        self.state = state
+        CIRCUIT_STATE.labels(exchange=self.name).set(state)
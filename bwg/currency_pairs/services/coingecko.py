@@ -1,10 +1,15 @@
 """CoinGecko client module."""
 import logging
 import time
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 from pycoingecko import CoinGeckoAPI
 
+from bwg.currency_pairs.services.circuit_breaker import CircuitBreaker
+from bwg.currency_pairs.services.cross_rates import Quote
+from bwg.currency_pairs.services.fetcher import FetcherService, RateLimiter
+from bwg.lib.pair_registry import PairRegistry
+
 __all__ = ("CoinGeckoService",)
 
 logger = logging.getLogger(__name__)
@@ -13,15 +18,50 @@ logger = logging.getLogger(__name__)
 class CoinGeckoService:
     """CoinGecko service."""
 
-    def __init__(self) -> None:
-        self.client = CoinGeckoAPI()
+    fetcher: "FetcherService"
+    pair_registry: "PairRegistry"
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            api_url: str = "https://api.coingecko.com/api/v3/",
+            rate_limit: float = 0.5,
+            burst: int = 1,
+            timeout: float = 2,
+            failure_threshold: int = 3,
+            reset_timeout: float = 5,
+            max_reset_timeout: float = 60,
+    ) -> None:
+        self.client = CoinGeckoAPI(retries=0)
+        self.client.api_base_url = api_url
+        self.client.request_timeout = timeout
+        self.rate_limiter = RateLimiter(rate_limit, burst)
+        self.circuit_breaker = CircuitBreaker("coingecko", failure_threshold, reset_timeout, max_reset_timeout)
+        self.timeout = timeout
+
+    def get_prices(self) -> Dict[Tuple[str, str], Quote]:
+        """
+        Get prices of all pairs with one request.
+
+        Returns:
+            dict: quote by (token, currency)
+        """
+        codes = self.pair_registry.codes('coingecko')
+        ids = sorted({token_code for token_code, _ in codes})
+        vs_currencies = sorted({currency_code for _, currency_code in codes})
+        prices = self.fetcher.call(
+            "coingecko prices",
+            lambda: self.client.get_price(ids=ids, vs_currencies=vs_currencies),
+            self.rate_limiter,
+            self.timeout,
+            self.circuit_breaker,
+        ) or {}
 
-    def get_currency_by_pair(self, pairs: Dict) -> dict:
-        res = {}
-        for token in pairs.keys():
-            pair = self.client.get_price(ids=token, vs_currencies=pairs[token])
-            time.sleep(0.2)
-            res.update(pair)
+        now = time.time()
+        res: Dict[Tuple[str, str], Quote] = {}
+        for (token_code, currency_code), pairs in codes.items():
+            price = prices.get(token_code, {}).get(currency_code)
+            if price is not None:
+                res.update((pair, Quote(float(price), now)) for pair in pairs)
         return res
 
     def ping(self) -> Optional[bool]:
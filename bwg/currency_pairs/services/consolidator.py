@@ -0,0 +1,109 @@
+"""Consolidator module."""
+import logging
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+from bwg.currency_pairs.services.cross_rates import Quote
+
+__all__ = (
+    "ConsolidatedPrice",
+    "Consolidator",
+)
+
+logger = logging.getLogger(__name__)
+
+PRICE_SPREAD = Gauge(
+    "exchange_spread_ratio",
+    "Spread of exchange prices of the direction relative to the consolidated price.",
+    ["direction"],
+)
+PRICE_DIVERGENCE = Counter(
+    "price_divergence",
+    "Number of consolidated prices with spread above the divergence threshold.",
+    ["direction"],
+)
+
+Pair = Tuple[str, str]
+
+
+class ConsolidatedPrice(NamedTuple):
+    """Price of a pair consolidated across exchanges."""
+
+    value: float
+    spread: float
+    sources: int
+    epoch: float
+
+
+class Consolidator:
+    """Consolidator of prices of several exchanges.
+
+    The consolidated price is the median of exchange prices, the mean of two prices.
+    With three prices and more the median is weighted by freshness, weight of a price halves
+    every `half_life` seconds of its age. Spread is (max - min) / consolidated price, a price
+    with spread above `divergence_threshold` is diverged.
+    """
+
+    def __init__(self, divergence_threshold: float = 0.01, half_life: float = 5) -> None:
+        self.divergence_threshold = divergence_threshold
+        self.half_life = half_life
+
+    def consolidate_all(self, results: Dict[str, Dict[Pair, Quote]]) -> Dict[Pair, ConsolidatedPrice]:
+        """
+        Consolidate prices of every pair from quotes by exchanger.
+
+        Returns:
+            dict: consolidated price by (token, currency)
+        """
+        quotes: Dict[Pair, List[Quote]] = {}
+        for prices in results.values():
+            for pair, quote in prices.items():
+                quotes.setdefault(pair, []).append(quote)
+        res = {}
+        for pair, pair_quotes in quotes.items():
+            price = self.consolidate(pair_quotes)
+            if price is not None:
+                res[pair] = price
+                self.check_divergence(pair, price)
+        return res
+
+    def consolidate(self, quotes: List[Quote]) -> Optional[ConsolidatedPrice]:
+        """
+        Consolidate quotes of a pair, the consolidated price is as recent as the newest quote.
+
+        Returns:
+            ConsolidatedPrice: price or None without positive quotes
+        """
+        quotes = [quote for quote in quotes if quote.value > 0]
+        if not quotes:
+            return None
+        now = time.time()
+        weighted = len(quotes) > 2
+        values = sorted(
+            (value, 0.5 ** (max(now - epoch, 0.0) / self.half_life) if weighted else 1.0) for value, epoch in quotes
+        )
+        half = sum(weight for _, weight in values) / 2
+        cumulative = 0.0
+        median = values[-1][0]
+        for index, (value, weight) in enumerate(values):
+            cumulative += weight
+            if cumulative > half:
+                median = value
+                break
+            if cumulative == half:
+                median = (value + values[index + 1][0]) / 2
+                break
+        spread = (values[-1][0] - values[0][0]) / median
+        return ConsolidatedPrice(median, spread, len(values), max(quote.epoch for quote in quotes))
+
+    def is_diverged(self, spread: Optional[float]) -> bool:
+        return spread is not None and spread > self.divergence_threshold
+
+    def check_divergence(self, pair: Pair, price: ConsolidatedPrice) -> None:
+        direction = f"{pair[0]}-{pair[1]}"
+        PRICE_SPREAD.labels(direction=direction).set(price.spread)
+        if self.is_diverged(price.spread):
+            PRICE_DIVERGENCE.labels(direction=direction).inc()
+            logger.warning(f"Prices of {direction} diverged by {price.spread:.2%} across {price.sources} exchanges")
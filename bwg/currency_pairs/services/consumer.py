@@ -0,0 +1,119 @@
+"""Consumer module."""
+# pylint: disable=broad-exception-caught
+import logging
+import datetime
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from prometheus_client import Counter, Histogram
+
+from bwg.currency_pairs.services.ticks_writer import TicksWriter
+from bwg.lib.broker import Broker
+from bwg.lib.postgres import PostgresDatabase
+from bwg.lib.repositories.currency_pairs import CurrencyPairsRepository
+
+__all__ = ("ConsumerService",)
+
+logger = logging.getLogger(__name__)
+
+WRITE_DURATION = Histogram(
+    "worker_db_write_duration_seconds",
+    "Duration of writing a batch of prices to the database, upsert, notify and commit.",
+)
+WRITE_BATCH_SIZE = Histogram(
+    "worker_write_batch_size",
+    "Number of events in a batch taken from the broker.",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+WRITE_LAG = Histogram(
+    "worker_write_lag_seconds",
+    "Age of the newest price of a batch when it is committed, from the time the exchange price was received.",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+WRITE_FAILURES = Counter(
+    "worker_write_failures",
+    "Number of batches of events which failed to be written.",
+)
+
+
+class ConsumerService:
+    """Consumer service.
+
+    Takes price events from the broker and writes them to the database in batches.
+    Every worker thread consumes on its own, so consumers scale independently of fetchers.
+    """
+
+    broker: "Broker"
+    db_postgres: "PostgresDatabase"
+    currency_pairs_repository: "CurrencyPairsRepository"
+    ticks_writer: "TicksWriter"
+
+    def __init__(self, workers: int = 1, batch_size: int = 500, batch_timeout: float = 0.2) -> None:
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        """Run `workers` consumer threads in background."""
+        for number in range(self.workers - len(self._threads)):
+            thread = threading.Thread(target=self.run, name=f"consumer-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def join(self) -> None:
+        for thread in self._threads:
+            thread.join()
+
+    def run(self) -> None:
+        logger.info("Run consumer loop")
+        while True:
+            try:
+                events = self.broker.consume(self.batch_size, self.batch_timeout)
+            except Exception as exc:
+                # the thread must outlive a broken message or connection, the worker keeps publishing
+                logger.exception(f"Failed to consume events with {exc=}.")
+                time.sleep(self.batch_timeout)
+                continue
+            if not events:
+                continue
+            WRITE_BATCH_SIZE.observe(len(events))
+            try:
+                self.write(events)
+            except Exception as exc:
+                WRITE_FAILURES.inc()
+                logger.exception(f"Failed to write {len(events)} events with {exc=}.")
+
+    def write(self, events: List[dict]) -> None:
+        """Write the latest price per row and all events as ticks."""
+        rows = self.latest(events)
+        with WRITE_DURATION.time(), self.db_postgres.session() as session:  # type: ignore[var-annotated]
+            self.currency_pairs_repository.bulk_upsert(session, rows)
+            self.currency_pairs_repository.notify(session, rows)
+            session.commit()  # type: ignore[attr-defined]
+        WRITE_LAG.observe(time.time() - self.epoch_of(max(row['timestamp'] for row in rows)))
+        logger.info(rows)
+        try:
+            self.ticks_writer.write(events)
+        except Exception as exc:
+            logger.exception(f"Failed to write ticks with {exc=}.")
+
+    @staticmethod
+    def epoch_of(timestamp: str) -> float:
+        return datetime.datetime.fromisoformat(timestamp.rstrip('Z')).replace(tzinfo=datetime.timezone.utc).timestamp()
+
+    @classmethod
+    def latest(cls, events: List[dict]) -> List[dict]:
+        """
+        Collapse events of the same row, one statement cannot upsert a row twice.
+
+        Returns:
+            list: the latest event per primary key
+        """
+        res: Dict[Tuple, dict] = {}
+        for event in events:
+            key = tuple(CurrencyPairsRepository.primary_key_of(event).values())
+            if key not in res or res[key]['timestamp'] <= event['timestamp']:
+                res[key] = event
+        return list(res.values())
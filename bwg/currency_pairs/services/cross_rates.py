@@ -0,0 +1,103 @@
+"""Cross rates module."""
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+__all__ = (
+    "CrossRates",
+    "Quote",
+)
+
+logger = logging.getLogger(__name__)
+
+# (base, quote) names of an exchange, e.g. (BTC, USDT)
+Market = Tuple[str, str]
+
+
+class Quote(NamedTuple):
+    """Price with epoch seconds when it was received."""
+
+    value: float
+    epoch: float
+
+
+class CrossRates:
+    """Cross rates engine.
+
+    Builds a graph of assets from quotes of markets, a market is an edge in both directions
+    (price and 1 / price). A rate of a target market is the product of rates along a path of
+    at most `max_hops` edges: the freshest one, whose oldest quote is the newest, or with
+    `path="shortest"` the one with the fewest hops, ties are broken by the other criterion.
+    A derived quote is as old as the oldest quote of its path.
+    """
+
+    def __init__(self, max_hops: int = 2, path: str = "freshest") -> None:
+        if path not in ("freshest", "shortest"):
+            raise ValueError(f"Unknown path {path}, expected freshest or shortest")
+        self.max_hops = max_hops
+        self.path = path
+        self._missing: List[Market] = []
+
+    def derive(self, quotes: Dict[Market, Quote], targets: Iterable[Market]) -> Dict[Market, Quote]:
+        """
+        Get rates of target markets.
+
+        Returns:
+            dict: quote by target market, targets without a path are missing
+        """
+        graph = self.make_graph(quotes)
+        res = {}
+        missing = []
+        for target in targets:
+            quote = self.find(graph, *target)
+            if quote is None:
+                missing.append(target)
+            else:
+                res[target] = quote
+        if missing != self._missing:
+            # log changes only, a cycle runs every few seconds
+            if missing:
+                logger.warning(f"No cross rates of {missing} from {list(quotes)}")
+            self._missing = missing
+        return res
+
+    @staticmethod
+    def make_graph(quotes: Dict[Market, Quote]) -> Dict[str, List[Tuple[str, Quote]]]:
+        """
+        Get edges of every asset.
+
+        Returns:
+            dict: (asset, rate) edges by asset
+        """
+        graph: Dict[str, List[Tuple[str, Quote]]] = {}
+        for (base, quote), (value, epoch) in quotes.items():
+            if value <= 0:
+                continue
+            graph.setdefault(base, []).append((quote, Quote(value, epoch)))
+            graph.setdefault(quote, []).append((base, Quote(1 / value, epoch)))
+        return graph
+
+    def find(self, graph: Dict[str, List[Tuple[str, Quote]]], base: str, quote: str) -> Optional[Quote]:
+        """
+        Find the best path from `base` to `quote`, depth-first over paths without cycles.
+
+        Returns:
+            Quote: rate and epoch of the path, None without a path
+        """
+        best_rank: Optional[Tuple[float, float]] = None
+        best: Optional[Quote] = None
+        # (asset, rate from base, epoch of the oldest rate, assets of the path)
+        stack: List[Tuple[str, float, float, Tuple[str, ...]]] = [(base, 1.0, float("inf"), (base,))]
+        while stack:
+            asset, value, epoch, path = stack.pop()
+            if asset == quote:
+                hops = len(path) - 1
+                rank = (epoch, -hops) if self.path == "freshest" else (-hops, epoch)
+                if best_rank is None or rank > best_rank:
+                    best_rank, best = rank, Quote(value, epoch)
+                continue
+            if len(path) - 1 >= self.max_hops:
+                continue
+            for next_asset, rate in graph.get(asset, ()):
+                if next_asset not in path:
+                    stack.append((next_asset, value * rate.value, min(epoch, rate.epoch), (*path, next_asset)))
+        return best
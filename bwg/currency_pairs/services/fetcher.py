@@ -0,0 +1,138 @@
+"""Fetcher module."""
+# pylint: disable=broad-exception-caught
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+from prometheus_client import Counter, Histogram
+
+from bwg.currency_pairs.services.circuit_breaker import CircuitBreaker
+
+__all__ = (
+    "FetcherService",
+    "RateLimiter",
+)
+
+logger = logging.getLogger(__name__)
+
+EXCHANGE_REQUEST_DURATION = Histogram(
+    "exchange_request_duration_seconds",
+    "Duration of exchange requests, from the start of the request after the rate limiter to its result.",
+    ["request"],
+)
+EXCHANGE_REQUESTS = Counter(
+    "exchange_requests",
+    "Number of exchange requests by outcome: ok, failed (error or timeout) or rejected by the circuit breaker.",
+    ["request", "outcome"],
+)
+
+
+class RateLimiter:
+    """Token bucket rate limiter.
+
+    Allows `rate` requests per second with bursts up to `burst` requests.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+
+
+class FetcherService:
+    """Fetcher service.
+
+    Runs exchange requests concurrently in a bounded worker pool.
+    """
+
+    def __init__(self, max_workers: int = 8) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetcher")
+
+    def map(
+            self,
+            func: Callable[[Any], Any],
+            items: Iterable[Hashable],
+            rate_limiter: RateLimiter,
+            timeout: float,
+    ) -> Dict[Hashable, Any]:
+        """
+        Call `func` for every item concurrently.
+
+        Every call takes a token from `rate_limiter` before it starts.
+        Failed calls and calls not finished within `timeout` seconds are skipped.
+
+        Returns:
+            dict: results of the successful calls by item
+        """
+        def call(item: Hashable) -> Any:
+            rate_limiter.acquire()
+            return func(item)
+
+        futures: Dict[Hashable, Future] = {item: self._executor.submit(call, item) for item in items}
+        wait(futures.values(), timeout=timeout)
+
+        res = {}
+        for item, future in futures.items():
+            if not future.done():
+                future.cancel()
+                logger.warning(f"Request for {item} timed out after {timeout}s")
+                continue
+            try:
+                res[item] = future.result()
+            except Exception as exc:
+                logger.warning(f"Request for {item} failed with {exc=}.")
+        return res
+
+    def call(  # pylint: disable=too-many-arguments
+            self,
+            name: str,
+            func: Callable[[], Any],
+            rate_limiter: RateLimiter,
+            timeout: float,
+            circuit_breaker: Optional[CircuitBreaker] = None,
+    ) -> Optional[Any]:
+        """
+        Call `func` in the worker pool.
+
+        When `circuit_breaker` is open the call is skipped without taking a token from `rate_limiter`.
+
+        Returns:
+            Any: result of the call or None when it failed, timed out or was skipped
+        """
+        if circuit_breaker is not None and not circuit_breaker.allow():
+            logger.debug(f"Request for {name} skipped, circuit of {circuit_breaker.name} is open")
+            EXCHANGE_REQUESTS.labels(request=name, outcome="rejected").inc()
+            return None
+
+        def timed(_: Hashable) -> Any:
+            # a timed out request is observed when it finishes, so the histogram shows its real duration
+            with EXCHANGE_REQUEST_DURATION.labels(request=name).time():
+                return func()
+
+        res = self.map(timed, [name], rate_limiter, timeout).get(name)
+        EXCHANGE_REQUESTS.labels(request=name, outcome="failed" if res is None else "ok").inc()
+        if circuit_breaker is not None:
+            if res is None:
+                circuit_breaker.record_failure()
+            else:
+                circuit_breaker.record_success()
+        return res
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,82 +1,230 @@
 """Processor module."""
-# pylint: disable=broad-exception-caught
 import datetime
 import logging
 import time
-from typing import Optional
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from prometheus_client import Gauge, Histogram
 
 from bwg.currency_pairs.services.binance_service import BinanceService
+from bwg.currency_pairs.services.binance_stream import BinanceStreamService
 from bwg.currency_pairs.services.coingecko import CoinGeckoService
-from bwg.lib.postgres import PostgresDatabase
-from bwg.lib.repositories.currency_pairs import CurrencyPairsRepository
+from bwg.currency_pairs.services.consolidator import Consolidator
+from bwg.currency_pairs.services.consumer import ConsumerService
+from bwg.currency_pairs.services.cross_rates import Quote
+from bwg.currency_pairs.services.scheduler import Scheduler
+from bwg.currency_pairs.services.source_selector import SourceSelector
+from bwg.lib.broker import Broker
+from bwg.lib.pair_registry import CONSOLIDATED, PairRegistry
 
 __all__ = ("ProcessorService",)
 
 logger = logging.getLogger(__name__)
 
+STAGE_DURATION = Histogram(
+    "worker_stage_duration_seconds",
+    "Duration of stages of a worker cycle: fetch, consolidate and publish.",
+    ["stage"],
+)
+PUBLISHED_PRICE_AGE = Histogram(
+    "worker_published_price_age_seconds",
+    "Age of prices when they are published, from the time the exchange price was received.",
+    ["exchanger"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+LAST_PUBLISHED = Gauge(
+    "worker_last_published_timestamp_seconds",
+    "Epoch seconds of the last published batch of prices.",
+)
+
 
 class ProcessorService:
-    """Processor service."""
+    """Processor service.
+
+    Fetches prices from exchanges and publishes them to the broker,
+    `consumer` writes them to the database.
+    Pairs the selected exchange has no price of, e.g. USDTTRC-USD without a market on Binance,
+    are filled from the other exchanges in the same cycle.
+    With `consolidate` prices of all exchanges are fetched concurrently and published
+    together with prices consolidated across them (see Consolidator).
+    """
 
     coingecko: "CoinGeckoService"
     binance: "BinanceService"
-    db_postgres: "PostgresDatabase"
-    currency_pairs_repository: "CurrencyPairsRepository"
+    binance_stream: "BinanceStreamService"
+    broker: "Broker"
+    consumer: "ConsumerService"
+    source_selector: "SourceSelector"
+    scheduler: "Scheduler"
+    consolidator: "Consolidator"
+    pair_registry: "PairRegistry"
 
-    def __init__(self) -> None:
-        self.binance_pairs = {
-            'BTC': ['RUB', 'USDT'],
-            'ETH': ['RUB', 'USDT'],
-        }
+    def __init__(
+            self,
+            mode: str = 'poll',
+            poll_interval: float = 2,
+            stream_interval: float = 0.5,
+            consolidate: bool = False,
+    ) -> None:
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.stream_interval = stream_interval
+        self.consolidate = consolidate
+        self.exchangers = ['binance', 'coingecko']
 
-        self.coingecko_pairs = {
-            'BITCOIN': ['RUB', 'USD'],
-            'ETHEREUM': ['RUB', 'USD'],
-        }
+    def run_infinity_loop(self) -> None:
+        logger.info("Run infinity loop")
+        self.consumer.start()
+        if self.mode == 'stream':
+            self.binance_stream.start(list(self.binance.symbols))
+            self.scheduler.run(self.run_cycle, self.stream_interval)
+        else:
+            self.scheduler.run(self.run_cycle, self.poll_interval)
 
-        self.default_exchanger = 'binance'
+    def run_cycle(self) -> Optional[str]:
+        """
+        Fetch prices and publish them to the broker.
 
-    def run_infinity_loop(self) -> None:
-        try:
-            logger.info("Run infinity loop")
-            exchaner = self.default_exchanger
-            while True:
-                pairs = None
-                with self.db_postgres.session() as session:  # type: ignore[var-annotated]
-                    if exchaner == 'coingecko':
-                        pairs = self.coingecko.get_currency_by_pair(self.coingecko_pairs)
-                    elif exchaner == 'binance':
-                        pairs = self.binance.get_currency_by_pair(self.binance_pairs)
-                    if not pairs:
-                        self.exchanges_selector()
-                    for token in pairs.keys():
-                        for currency in pairs[token].keys():
-                            value = pairs[token][currency]
-                            to_insert = self.make_msg(token, currency, value, exchaner)
-                            self.currency_pairs_repository.insert_or_update(session, **to_insert)
-                            session.commit()  # type: ignore[attr-defined]
-                            logger.info(to_insert)
-                time.sleep(2)
-        except Exception as exc:
-            logger.exception(f"Failed with {exc=}.")
-
-    def exchanges_selector(self) -> Optional[str]:
-        while True:
-            if not self.coingecko.ping():
-                return 'coingecko'
-            if not self.binance.ping():
-                return 'binance'
-            logger.error("Could not connect to exchanges")
-            time.sleep(60)
+        Returns:
+            str: selected exchanger, None when no exchanger returned prices
+        """
+        if self.consolidate:
+            return self.run_consolidated_cycle()
+        sources = self.get_sources()
+        with STAGE_DURATION.labels(stage="fetch").time():
+            selected, prices = self.source_selector.fetch(sources)
+            if selected is None:
+                return None
+            results = {selected: prices, **self.fill_missing(prices, sources, selected)}
+        events = [
+            self.make_msg(token, currency, quote.value, exchanger, self.timestamp_of(quote.epoch))
+            for exchanger, quotes in results.items()
+            for (token, currency), quote in quotes.items()
+        ]
+        for exchanger, quotes in results.items():
+            self.observe_ages(exchanger, quotes.values())
+        self.publish(events)
+        logger.debug(f"Published {len(events)} events of {list(results)}")
+        return selected
+
+    def fill_missing(
+            self,
+            prices: Dict[Tuple[str, str], Quote],
+            sources: Dict[str, Callable[[], dict]],
+            exchanger: str,
+    ) -> Dict[str, Dict[Tuple[str, str], Quote]]:
+        """
+        Get prices of pairs missing in `prices` of `exchanger` from the other sources.
+
+        Returns:
+            dict: prices of the missing pairs by exchanger, a pair comes from the best source having it
+        """
+        missing = self.pair_registry.pair_set.difference(prices)
+        others = {name: func for name, func in sources.items() if name != exchanger}
+        if not missing or not others:
+            return {}
+        results = self.source_selector.fetch_all(others)
+        filled: Dict[str, Dict[Tuple[str, str], Quote]] = {}
+        for name in self.source_selector.order(list(results)):
+            found = {pair: results[name][pair] for pair in missing if pair in results[name]}
+            if found:
+                filled[name] = found
+                missing = missing.difference(found)
+        if missing:
+            logger.warning(f"No prices of {sorted(missing)} from {list(sources)}")
+        return filled
+
+    def run_consolidated_cycle(self) -> Optional[str]:
+        """
+        Fetch prices of all exchangers, publish them and their consolidated prices to the broker.
+
+        A consolidated price is as recent as the newest of its quotes, so it is preferred to prices it came from.
+
+        Returns:
+            str: CONSOLIDATED, None when no exchanger returned prices
+        """
+        with STAGE_DURATION.labels(stage="fetch").time():
+            results = self.source_selector.fetch_all(self.get_sources())
+        if not results:
+            logger.error(f"No results from {self.exchangers}")
+            return None
+        events = [
+            self.make_msg(token, currency, quote.value, exchanger, self.timestamp_of(quote.epoch))
+            for exchanger, prices in results.items()
+            for (token, currency), quote in prices.items()
+        ]
+        for exchanger, prices in results.items():
+            self.observe_ages(exchanger, prices.values())
+        with STAGE_DURATION.labels(stage="consolidate").time():
+            consolidated = self.consolidator.consolidate_all(results)
+        for (token, currency), price in consolidated.items():
+            events.append(self.make_msg(
+                token, currency, price.value, CONSOLIDATED, self.timestamp_of(price.epoch), price.spread,
+            ))
+        self.publish(events)
+        logger.debug(f"Published {len(events)} events of {list(results)}")
+        return CONSOLIDATED
+
+    def publish(self, events: list) -> None:
+        with STAGE_DURATION.labels(stage="publish").time():
+            self.broker.publish(events)
+        LAST_PUBLISHED.set_to_current_time()
 
     @staticmethod
-    def make_msg(token: str, currency: str, value: float, exchanger: str) -> dict:
+    def observe_ages(exchanger: str, quotes: Iterable[Quote]) -> None:
+        now = time.time()
+        histogram = PUBLISHED_PRICE_AGE.labels(exchanger=exchanger)
+        for quote in quotes:
+            histogram.observe(max(now - quote.epoch, 0.0))
+
+    def get_sources(self) -> Dict[str, Callable[[], dict]]:
+        """
+        Get fetch functions of exchangers in order of preference.
+
+        Returns:
+            dict: function returning prices by (token, currency) by exchanger
+        """
+        sources: Dict[str, Callable[[], dict]] = {
+            'binance': self.binance.get_prices,
+            'coingecko': self.coingecko.get_prices,
+        }
+        if self.mode == 'stream':
+            sources['binance'] = self.binance_stream.get_prices
+        return {exchanger: sources[exchanger] for exchanger in self.exchangers}
+
+    def run_consumers(self) -> None:
+        """Run only consumers, fetchers of other processes publish to the same broker."""
+        logger.info("Run consumers")
+        self.consumer.start()
+        self.consumer.join()
+
+    @classmethod
+    def make_msg(  # pylint: disable=too-many-arguments
+            cls,
+            token: str,
+            currency: str,
+            value: float,
+            exchanger: str,
+            timestamp: Optional[str] = None,
+            spread: Optional[float] = None,
+    ) -> dict:
         to_insert = {
             'token': token,
             'currency': currency,
             'value': value,
             'exchanger': exchanger,
-            'timestamp': datetime.datetime.now().isoformat() + 'Z'
+            'timestamp': timestamp or cls.timestamp_of(time.time()),
+            'spread': spread,
         }
 
         return to_insert
+
+    @staticmethod
+    def timestamp_of(epoch: float) -> str:
+        """
+        Get timestamp of events from epoch seconds.
+
+        Returns:
+            str: ISO 8601 UTC timestamp
+        """
+        return datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).replace(tzinfo=None).isoformat() + 'Z'
@@ -0,0 +1,84 @@
+"""Scheduler module."""
+# pylint: disable=broad-exception-caught
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from prometheus_client import Counter, Histogram
+
+__all__ = ("Scheduler",)
+
+logger = logging.getLogger(__name__)
+
+CYCLE_LATENESS = Histogram(
+    "worker_cycle_lateness_seconds",
+    "Delay between the scheduled and the actual start of a worker cycle.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+CYCLE_DURATION = Histogram(
+    "worker_cycle_duration_seconds",
+    "Duration of a worker cycle, from fetch to publish of prices.",
+)
+CYCLE_FAILURES = Counter(
+    "worker_cycle_failures",
+    "Number of worker cycles failed with an exception.",
+)
+CYCLES_SKIPPED = Counter(
+    "worker_cycles_skipped",
+    "Number of worker cycles skipped because previous cycles were still running or late.",
+)
+
+
+class Scheduler:
+    """Fixed-rate scheduler.
+
+    Starts cycles at `start + n * interval`, so the period does not drift by the duration
+    of cycles. A cycle runs in background, the next one starts on time while the previous
+    is still running, up to `max_concurrent` cycles. A tick is skipped when all slots are busy,
+    and ticks missed while the scheduler was late are coalesced into the next one.
+    """
+
+    def __init__(self, max_concurrent: int = 2) -> None:
+        self.max_concurrent = max_concurrent
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="cycle")
+
+    def run(self, func: Callable[[], Any], interval: float) -> None:
+        """Call `func` every `interval` seconds until the process exits."""
+        logger.info(f"Run cycles every {interval}s")
+        started_at = time.monotonic()
+        tick = 0
+        while True:
+            scheduled_at = started_at + tick * interval
+            now = time.monotonic()
+            if now < scheduled_at:
+                time.sleep(scheduled_at - now)
+                now = time.monotonic()
+            missed = int((now - scheduled_at) // interval)
+            if missed:
+                logger.warning(f"Scheduler is late by {now - scheduled_at:.3f}s, coalesced {missed} cycles")
+                CYCLES_SKIPPED.inc(missed)
+                tick += missed
+                scheduled_at += missed * interval
+            lateness = now - scheduled_at
+            CYCLE_LATENESS.observe(lateness)
+            # the slot is released by the cycle in another thread, so it cannot be taken with `with`
+            if self._slots.acquire(blocking=False):  # pylint: disable=consider-using-with
+                logger.debug(f"Cycle {tick} started {lateness * 1000:.1f}ms late")
+                self._executor.submit(self._call, func)
+            else:
+                logger.warning(f"Skipped cycle {tick}, {self.max_concurrent} cycles are still running")
+                CYCLES_SKIPPED.inc()
+            tick += 1
+
+    def _call(self, func: Callable[[], Any]) -> None:
+        try:
+            with CYCLE_DURATION.time():
+                func()
+        except Exception as exc:
+            CYCLE_FAILURES.inc()
+            logger.exception(f"Failed with {exc=}.")
+        finally:
+            self._slots.release()
@@ -0,0 +1,164 @@
+"""Source selector module."""
+# pylint: disable=broad-exception-caught
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+
+__all__ = (
+    "SourceSelector",
+    "SourceStats",
+)
+
+logger = logging.getLogger(__name__)
+
+SOURCE_DURATION = Histogram(
+    "worker_source_duration_seconds",
+    "Duration of fetching all prices of a source, including failed fetches.",
+    ["source", "outcome"],
+)
+SOURCE_HEDGES = Counter(
+    "worker_source_hedges",
+    "Number of fetches hedged with the source because previous sources had no result within latency budget.",
+    ["source"],
+)
+SOURCE_FAILOVERS = Counter(
+    "worker_source_failovers",
+    "Number of cycles whose prices came from the source while it was not the first choice.",
+    ["source"],
+)
+
+
+class SourceStats:
+    """Latency and error rate of a source as exponentially weighted moving averages."""
+
+    def __init__(self, alpha: float) -> None:
+        self.alpha = alpha
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.samples = 0
+        self.sampled_at = 0.0
+
+    def record(self, latency: float, ok: bool) -> None:
+        weight = self.alpha if self.samples else 1.0
+        self.latency += weight * (latency - self.latency)
+        self.error_rate += weight * ((0.0 if ok else 1.0) - self.error_rate)
+        self.samples += 1
+        self.sampled_at = time.monotonic()
+
+
+class SourceSelector:  # pylint: disable=too-many-instance-attributes
+    """Source selector.
+
+    Calls the fastest healthy source first and hedges with the next one when
+    the first has no result within `latency_budget` seconds. When the called sources
+    have already failed, the next one is called at once as a failover, not a hedge.
+    A source with error rate above `max_error_rate` goes to the end of the order
+    until it has not been tried for `probe_interval` seconds.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            latency_budget: float = 0.5,
+            timeout: float = 3,
+            alpha: float = 0.3,
+            max_error_rate: float = 0.5,
+            probe_interval: float = 30,
+    ) -> None:
+        self.latency_budget = latency_budget
+        self.timeout = timeout
+        self.alpha = alpha
+        self.max_error_rate = max_error_rate
+        self.probe_interval = probe_interval
+        self.stats: Dict[str, SourceStats] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="source")
+
+    def order(self, names: List[str]) -> List[str]:
+        """
+        Order sources from the best to the worst, ties keep the order of `names`.
+
+        A source without samples is ranked as if its latency was `latency_budget`.
+
+        Returns:
+            list: names of sources
+        """
+        now = time.monotonic()
+        with self._lock:
+            stats = {name: self.stats.setdefault(name, SourceStats(self.alpha)) for name in names}
+
+        def score(name: str) -> Tuple[bool, float]:
+            source = stats[name]
+            unhealthy = source.error_rate > self.max_error_rate and now - source.sampled_at < self.probe_interval
+            return unhealthy, source.latency if source.samples else self.latency_budget
+
+        return sorted(names, key=score)
+
+    def record(self, name: str, latency: float, ok: bool) -> None:
+        with self._lock:
+            self.stats.setdefault(name, SourceStats(self.alpha)).record(latency, ok)
+
+    def fetch(self, sources: Dict[str, Callable[[], Any]]) -> Tuple[Optional[str], Any]:
+        """
+        Get result of the best source, hedging with the next sources.
+
+        Empty result or exception counts as error of the source.
+
+        Returns:
+            tuple: name of the source and its result, (None, None) when all sources failed
+        """
+        names = self.order(list(sources))
+        deadline = time.monotonic() + self.timeout
+        futures: Dict[Future, str] = {}
+        while True:
+            if len(futures) < len(names):
+                name = names[len(futures)]
+                futures[self._executor.submit(self._call, name, sources[name])] = name
+            pending = [future for future in futures if not future.done()]
+            hedge = len(futures) < len(names)
+            timeout = self.latency_budget if hedge else deadline - time.monotonic()
+            if pending:
+                timeout = max(0.0, min(timeout, deadline - time.monotonic()))
+                wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future, name in futures.items():
+                if future.done() and future.result():
+                    if name != names[0]:
+                        SOURCE_FAILOVERS.labels(source=name).inc()
+                    return name, future.result()
+            if time.monotonic() >= deadline or (not hedge and all(future.done() for future in futures)):
+                logger.error(f"No results from {names}")
+                return None, None
+            if hedge and all(future.done() for future in futures):
+                logger.warning(f"{list(futures.values())} failed, fail over to {names[len(futures)]}")
+            elif hedge:
+                logger.warning(f"No result from {list(futures.values())} within {self.latency_budget}s, "
+                               f"hedge with {names[len(futures)]}")
+                SOURCE_HEDGES.labels(source=names[len(futures)]).inc()
+
+    def fetch_all(self, sources: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+        """
+        Call all sources concurrently and wait for them up to `timeout` seconds.
+
+        Returns:
+            dict: non-empty result by name of the source
+        """
+        futures = {self._executor.submit(self._call, name, func): name for name, func in sources.items()}
+        done, not_done = wait(futures, timeout=self.timeout)
+        if not_done:
+            logger.warning(f"No results from {[futures[future] for future in not_done]} within {self.timeout}s")
+        return {futures[future]: future.result() for future in done if future.result()}
+
+    def _call(self, name: str, func: Callable[[], Any]) -> Any:
+        started_at = time.monotonic()
+        try:
+            res = func()
+        except Exception as exc:
+            logger.warning(f"Source {name} failed with {exc=}.")
+            res = None
+        latency = time.monotonic() - started_at
+        self.record(name, latency, bool(res))
+        SOURCE_DURATION.labels(source=name, outcome="ok" if res else "failed").observe(latency)
+        return res
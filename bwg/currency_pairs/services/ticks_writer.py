@@ -0,0 +1,115 @@
+"""Ticks writer module."""
+import datetime
+import logging
+import threading
+import time
+from typing import Dict, List, Set, Tuple
+
+from prometheus_client import Counter, Histogram
+
+from bwg.currency_pairs.services.candles import CandlesAggregator
+from bwg.lib.postgres import PostgresDatabase
+from bwg.lib.repositories.currency_ticks import CurrencyTicksRepository
+
+__all__ = ("TicksWriter",)
+
+logger = logging.getLogger(__name__)
+
+FLUSH_DURATION = Histogram(
+    "worker_ticks_flush_duration_seconds",
+    "Duration of writing buffered ticks and updating candles.",
+)
+TICKS_DROPPED = Counter(
+    "worker_ticks_dropped",
+    "Number of buffered ticks dropped because writing them kept failing.",
+)
+
+
+class TicksWriter:  # pylint: disable=too-many-instance-attributes
+    """Ticks writer.
+
+    Buffers price history and writes it in batches together with candles update.
+    A quote published again, e.g. an unchanged stream quote, is buffered and written as one tick.
+    Safe to share between consumer threads.
+    """
+
+    candles_aggregator: "CandlesAggregator"
+    currency_ticks_repository: "CurrencyTicksRepository"
+    db_postgres: "PostgresDatabase"
+
+    def __init__(
+            self,
+            batch_size: int = 500,
+            flush_interval: float = 5,
+            max_buffer: int = 10000,
+            max_failures: int = 3,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.max_failures = max_failures
+        # (token, currency, timestamp, exchanger) -> tick, the primary key of currency_ticks
+        self._buffer: Dict[Tuple, dict] = {}
+        self._failures = 0
+        self._flushed_at = time.monotonic()
+        self._partitions: Set[datetime.date] = set()
+        self._lock = threading.RLock()
+
+    def write(self, rows: List[dict]) -> None:
+        """Add rows to the buffer and flush it when batch is full or flush interval passed."""
+        with self._lock:
+            for row in rows:
+                timestamp = datetime.datetime.fromisoformat(row['timestamp'].rstrip('Z'))
+                self._buffer[(row['token'], row['currency'], timestamp, row['exchanger'])] = {
+                    'token': row['token'],
+                    'currency': row['currency'],
+                    'exchanger': row['exchanger'],
+                    'value': row['value'],
+                    'timestamp': timestamp,
+                }
+            if len(self._buffer) >= self.batch_size or time.monotonic() - self._flushed_at >= self.flush_interval:
+                self.flush()
+
+    def flush(self) -> None:
+        """
+        Write buffered rows.
+
+        Rows stay in the buffer when the write fails, the oldest of them are dropped above `max_buffer` rows
+        and all of them after `max_failures` failed writes in a row.
+        """
+        with self._lock:
+            rows = list(self._buffer.values())
+            days = {row['timestamp'].date() for row in rows}
+            new_partitions = {
+                day + datetime.timedelta(days=shift) for day in days for shift in (0, 1)
+            } - self._partitions
+            try:
+                with FLUSH_DURATION.time(), self.db_postgres.session() as session:  # type: ignore[var-annotated]
+                    for day in sorted(new_partitions):
+                        self.currency_ticks_repository.create_partition(session, day)
+                    inserted = self.currency_ticks_repository.bulk_insert(session, rows)
+                    # ticks stored by an earlier flush are already counted in candles
+                    self.candles_aggregator.update(session, inserted)
+                    session.commit()  # type: ignore[attr-defined]
+            except Exception:
+                self._failures += 1
+                self.drop_failed()
+                raise
+            logger.debug(f"Flushed {len(inserted)} of {len(rows)} ticks")
+            self._partitions |= new_partitions
+            self._buffer = {}
+            self._failures = 0
+            self._flushed_at = time.monotonic()
+
+    def drop_failed(self) -> None:
+        if self._failures >= self.max_failures:
+            dropped = len(self._buffer)
+            self._buffer = {}
+            self._failures = 0
+        else:
+            dropped = max(0, len(self._buffer) - self.max_buffer)
+            for key in list(self._buffer)[:dropped]:
+                del self._buffer[key]
+        if dropped:
+            TICKS_DROPPED.inc(dropped)
+            logger.error(f"Dropped {dropped} ticks after {self._failures or self.max_failures} failed writes")
@@ -6,8 +6,10 @@ from fastapi import FastAPI
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from bwg.currency_pairs_api.containers import create_container
+from bwg.currency_pairs_api.endpoints.v1.candles import candles_router
 from bwg.currency_pairs_api.endpoints.v1.currency_pairs import \
     currency_pairs_router
+from bwg.currency_pairs_api.endpoints.v1.history import history_router
 from bwg.currency_pairs_api.endpoints.v1.test import router_test as test_router
 from bwg.currency_pairs_api.logging_config import LOGGING_CONFIG
 from bwg.lib.setup_logger import setup_logger
@@ -40,9 +42,16 @@ class Application:
 
         app.include_router(test_router, prefix=prefix)
         app.include_router(currency_pairs_router, prefix=prefix)
+        app.include_router(history_router, prefix=prefix)
+        app.include_router(candles_router, prefix=prefix)
 
         app.container = self.container  # type: ignore[attr-defined]
         self.container.reverse_url().init_app(app)
+        snapshot = self.container.snapshot()
+        app.add_event_handler("startup", snapshot.start)
+        app.add_event_handler("shutdown", snapshot.stop)
+        app.add_event_handler("shutdown", self.container.price_board().close)
+        self.container.freshness().register_metrics()
 
         Instrumentator().instrument(app).expose(app)
         logger.info("Initialized Currency-Pairs API")
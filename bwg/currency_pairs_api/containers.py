@@ -4,20 +4,35 @@ Contains packages with components, config and higher level services.
 """
 # pylint: disable=[no-member, unsubscriptable-object]
 import logging
+from typing import Optional
 
 from dependency_injector import containers, providers
 
+from bwg.currency_pairs_api.services.broadcaster import BroadcasterService
+from bwg.currency_pairs_api.services.candles import CandlesService
 from bwg.currency_pairs_api.services.currency_pairs import CurrencyPairsService
+from bwg.currency_pairs_api.services.freshness import FreshnessService
+from bwg.currency_pairs_api.services.history import HistoryService
 from bwg.currency_pairs_api.services.reverse_url import ReverseUrlService
+from bwg.currency_pairs_api.services.snapshot import SnapshotService
 from bwg.lib.env_config import get_config_path, maybe_load_env
+from bwg.lib.pair_registry import PairRegistry
+from bwg.lib.postgres.listener import PostgresListener
 from bwg.lib.postgres.containers import PostgresContainer
+from bwg.lib.price_board import PriceBoard, ProcessLock
+from bwg.lib.repositories.currency_candles import CurrencyCandlesRepository
 from bwg.lib.repositories.currency_pairs import CurrencyPairsRepository
+from bwg.lib.repositories.currency_ticks import CurrencyTicksRepository
 
 __all__ = ("create_container",)
 
 logger = logging.getLogger(__name__)
 
 
+def database_path(is_async: Optional[bool]) -> str:
+    return "blocking" if is_async is False else "nonblocking"
+
+
 class Container(containers.DeclarativeContainer):
     """Container with components, config and services."""
 
@@ -26,6 +41,21 @@ class Container(containers.DeclarativeContainer):
     postgres_package: providers.Container[PostgresContainer] = providers.Container(
         PostgresContainer,
         config=config.postgres,
+        role="api",
+        pool_options=config.postgres.pool.api,
+    )
+
+    # asyncpg by default, psycopg2 sessions blocking the event loop with `database.async: false`
+    db_postgres_async = providers.Selector(
+        providers.Callable(database_path, config.database["async"]),
+        nonblocking=postgres_package.async_db,
+        blocking=postgres_package.blocking_async_db,
+    )
+
+    pair_registry: providers.Singleton[PairRegistry] = providers.Singleton(
+        PairRegistry,
+        tokens=config.pairs.tokens,
+        currencies=config.pairs.currencies,
     )
 
     reverse_url: providers.Singleton[ReverseUrlService] = providers.Singleton(
@@ -34,15 +64,98 @@ class Container(containers.DeclarativeContainer):
 
     currency_pairs: providers.Singleton[CurrencyPairsService] = providers.Singleton(
         CurrencyPairsService,
+        divergence_threshold=config.consolidation.divergence_threshold,
     )
 
     currency_pairs_repository: providers.Singleton[CurrencyPairsRepository] = providers.Singleton(
         CurrencyPairsRepository,
     )
 
-    currency_pairs.add_attributes(
-        db_postgres=postgres_package.db,
+    broadcaster: providers.Singleton[BroadcasterService] = providers.Singleton(
+        BroadcasterService,
+    )
+
+    listener: providers.Singleton[PostgresListener] = providers.Singleton(
+        PostgresListener,
+        db_dsn=config.postgres.async_dsn,
+        channel=CurrencyPairsRepository.Model.__tablename__,
+    )
+
+    price_board: providers.Singleton[PriceBoard] = providers.Singleton(
+        PriceBoard,
+        name=config.price_board.name,
+        pairs=pair_registry.provided.pairs,
+        exchangers=pair_registry.provided.sources,
+        users_path=config.price_board.users_path,
+    )
+
+    updater_lock: providers.Singleton[ProcessLock] = providers.Singleton(
+        ProcessLock,
+        path=config.price_board.lock_path,
+    )
+
+    snapshot: providers.Singleton[SnapshotService] = providers.Singleton(
+        SnapshotService,
+        refresh_interval=config.snapshot.refresh_interval,
+        fallback_refresh_interval=config.snapshot.fallback_refresh_interval,
+        miss_ttl=config.snapshot.miss_ttl,
+        poll_interval=config.price_board.poll_interval,
+        election_interval=config.price_board.election_interval,
+    )
+
+    snapshot.add_attributes(
+        broadcaster=broadcaster,
+        listener=listener,
+        db_postgres_async=db_postgres_async,
         currency_pairs_repository=currency_pairs_repository,
+        price_board=price_board,
+        updater_lock=updater_lock,
+    )
+
+    freshness: providers.Singleton[FreshnessService] = providers.Singleton(
+        FreshnessService,
+        max_age=config.freshness.max_age,
+        max_age_by_direction=config.freshness.max_age_by_direction,
+    )
+
+    freshness.add_attributes(
+        snapshot=snapshot,
+        pair_registry=pair_registry,
+    )
+
+    currency_pairs.add_attributes(
+        snapshot=snapshot,
+        pair_registry=pair_registry,
+        freshness=freshness,
+    )
+
+    currency_ticks_repository: providers.Singleton[CurrencyTicksRepository] = providers.Singleton(
+        CurrencyTicksRepository,
+    )
+
+    history: providers.Singleton[HistoryService] = providers.Singleton(
+        HistoryService,
+        max_points=config.history.max_points,
+    )
+
+    history.add_attributes(
+        currency_pairs=currency_pairs,
+        currency_ticks_repository=currency_ticks_repository,
+        db_postgres_async=db_postgres_async,
+    )
+
+    currency_candles_repository: providers.Singleton[CurrencyCandlesRepository] = providers.Singleton(
+        CurrencyCandlesRepository,
+    )
+
+    candles: providers.Singleton[CandlesService] = providers.Singleton(
+        CandlesService,
+    )
+
+    candles.add_attributes(
+        history=history,
+        currency_candles_repository=currency_candles_repository,
+        db_postgres_async=db_postgres_async,
     )
 
 
@@ -0,0 +1,30 @@
+""" Candles endpoint module. """
+import datetime
+from typing import Optional
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse, Response
+
+from bwg.currency_pairs_api.services.candles import CandlesService
+
+candles_router = APIRouter()
+
+
+@candles_router.get(
+    "/candles",
+    tags=["Currency Pairs V1 - Services"],
+    name="v1-currency-pairs-candles",
+)
+@inject
+async def get_candles(  # pylint: disable=too-many-arguments
+        token: str,
+        currency: str,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        resolution: str = "1m",
+        exchanger: Optional[str] = None,
+        candles: CandlesService = Depends(Provide["candles"])  # noqa
+) -> Response:
+    res = await candles.execute(token, currency, resolution, start, end, exchanger)
+    return JSONResponse(res)
@@ -1,9 +1,15 @@
 """ Test endpoint module. """
+import asyncio
+from typing import Optional, Union
+
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (APIRouter, Depends, Header, HTTPException, WebSocket,
+                     WebSocketDisconnect)
 from fastapi.responses import JSONResponse, Response
-from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
+from starlette.status import (HTTP_422_UNPROCESSABLE_ENTITY,
+                              WS_1008_POLICY_VIOLATION)
 
+from bwg.currency_pairs_api.services.broadcaster import BroadcasterService
 from bwg.currency_pairs_api.services.currency_pairs import CurrencyPairsService
 
 currency_pairs_router = APIRouter()
@@ -15,18 +21,85 @@ currency_pairs_router = APIRouter()
     name="v1-currency-pairs",
 )
 @inject
-async def get_currency_pairs(
+async def get_currency_pairs(  # pylint: disable=too-many-arguments
         token: str,
         currency: str,
+        exchanger: Optional[str] = None,
+        if_none_match: Optional[str] = Header(None),
+        if_modified_since: Optional[str] = Header(None),
         currency_pairs: CurrencyPairsService = Depends(Provide["currency_pairs"])  # noqa
 ) -> Response:
-    res = currency_pairs.execute(token, currency)
+    res = await currency_pairs.execute(token, currency, exchanger)
 
-    if not res:
+    if res is None:
         raise HTTPException(
             status_code=HTTP_422_UNPROCESSABLE_ENTITY,
             detail={
                 "message": "Pair not found",
             }
         )
+    return res.to_response(if_none_match, if_modified_since)
+
+
+@currency_pairs_router.get(
+    "/courses/batch",
+    tags=["Currency Pairs V1 - Services"],
+    name="v1-currency-pairs-batch",
+)
+@inject
+async def get_currency_pairs_batch(
+        tokens: Optional[str] = None,
+        currencies: Optional[str] = None,
+        exchanger: Optional[str] = None,
+        currency_pairs: CurrencyPairsService = Depends(Provide["currency_pairs"])  # noqa
+) -> Response:
+    res = currency_pairs.execute_batch(
+        tokens.split(',') if tokens else None,
+        currencies.split(',') if currencies else None,
+        exchanger,
+    )
     return JSONResponse(res)
+
+
+@currency_pairs_router.websocket(
+    "/courses/stream",
+    name="v1-currency-pairs-stream",
+)
+@inject
+async def stream_currency_pairs(
+        websocket: WebSocket,
+        directions: Optional[str] = None,
+        currency_pairs: CurrencyPairsService = Depends(Provide["currency_pairs"]),  # noqa
+        broadcaster: BroadcasterService = Depends(Provide["broadcaster"]),  # noqa
+) -> None:
+    try:
+        pairs = currency_pairs.parse_directions(directions.split(',') if directions else None)
+    except HTTPException as exc:
+        # detail of the services is a dict with a message, Starlette types it as str
+        detail: Union[str, dict] = exc.detail
+        reason = detail["message"] if isinstance(detail, dict) else str(detail)
+        await websocket.close(code=WS_1008_POLICY_VIOLATION, reason=reason)
+        return
+
+    await websocket.accept()
+    subscription = broadcaster.subscribe(pairs)
+    disconnected = asyncio.create_task(wait_for_disconnect(websocket))
+    try:
+        await websocket.send_json(currency_pairs.format_batch(currency_pairs.snapshot.get_many(pairs)))
+        while True:
+            updates = asyncio.create_task(subscription.get())
+            await asyncio.wait({updates, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                updates.cancel()
+                break
+            await websocket.send_json(currency_pairs.format_batch(updates.result()))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        broadcaster.unsubscribe(subscription)
+
+
+async def wait_for_disconnect(websocket: WebSocket) -> None:
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
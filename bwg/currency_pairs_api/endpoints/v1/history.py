@@ -0,0 +1,30 @@
+""" History endpoint module. """
+import datetime
+from typing import Optional
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse, Response
+
+from bwg.currency_pairs_api.services.history import HistoryService
+
+history_router = APIRouter()
+
+
+@history_router.get(
+    "/history",
+    tags=["Currency Pairs V1 - Services"],
+    name="v1-currency-pairs-history",
+)
+@inject
+async def get_history(  # pylint: disable=too-many-arguments
+        token: str,
+        currency: str,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        resolution: int = 60,
+        exchanger: Optional[str] = None,
+        history: HistoryService = Depends(Provide["history"])  # noqa
+) -> Response:
+    res = await history.execute(token, currency, start, end, resolution, exchanger)
+    return JSONResponse(res)
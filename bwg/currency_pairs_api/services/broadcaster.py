@@ -0,0 +1,65 @@
+"""Broadcaster service module."""
+import asyncio
+import logging
+from typing import Dict, Iterable, Set, Tuple
+
+__all__ = (
+    "BroadcasterService",
+    "Subscription",
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """Subscription to price updates of the pairs.
+
+    Keeps only the latest pending update per pair, so a slow client skips
+    intermediate prices instead of accumulating a backlog.
+    """
+
+    def __init__(self, pairs: Iterable[Tuple[str, str]]) -> None:
+        self.pairs = set(pairs)
+        self._pending: Dict[Tuple[str, str], dict] = {}
+        self._event = asyncio.Event()
+
+    def push(self, pair: Tuple[str, str], row: dict) -> None:
+        self._pending[pair] = row
+        self._event.set()
+
+    async def get(self) -> Dict[Tuple[str, str], dict]:
+        """
+        Wait for pending updates.
+
+        Returns:
+            dict: latest row by (token, currency) since the previous call
+        """
+        await self._event.wait()
+        self._event.clear()
+        pending, self._pending = self._pending, {}
+        return pending
+
+
+class BroadcasterService:
+    """Broadcaster service.
+
+    Fans out changed prices of the snapshot to subscriptions of the worker.
+    """
+
+    def __init__(self) -> None:
+        self._subscriptions: Dict[Tuple[str, str], Set[Subscription]] = {}
+
+    def subscribe(self, pairs: Iterable[Tuple[str, str]]) -> Subscription:
+        subscription = Subscription(pairs)
+        for pair in subscription.pairs:
+            self._subscriptions.setdefault(pair, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for pair in subscription.pairs:
+            self._subscriptions.get(pair, set()).discard(subscription)
+
+    def publish(self, changes: Dict[Tuple[str, str], dict]) -> None:
+        for pair, row in changes.items():
+            for subscription in self._subscriptions.get(pair, ()):
+                subscription.push(pair, row)
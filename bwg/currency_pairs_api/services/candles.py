@@ -0,0 +1,70 @@
+"""Candles service module."""
+import datetime
+import logging
+from typing import Optional
+
+from fastapi import HTTPException
+from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
+
+from bwg.currency_pairs_api.services.history import HistoryService
+from bwg.lib.postgres.database import PostgresAsyncDatabase
+from bwg.lib.repositories.currency_candles import (CANDLE_RESOLUTIONS,
+                                                   CurrencyCandlesRepository)
+
+__all__ = ("CandlesService",)
+
+logger = logging.getLogger(__name__)
+
+
+class CandlesService:
+    """Candles service."""
+
+    history: "HistoryService"
+    currency_candles_repository: "CurrencyCandlesRepository"
+    db_postgres_async: "PostgresAsyncDatabase"
+
+    async def execute(  # pylint: disable=too-many-arguments
+            self,
+            token: str,
+            currency: str,
+            resolution: str,
+            start: datetime.datetime,
+            end: datetime.datetime,
+            exchanger: Optional[str] = None,
+    ) -> dict:
+        token, currency = self.history.currency_pairs.normalize_pair(token, currency)
+        exchanger = self.history.source_of(token, currency, exchanger)
+        if resolution not in CANDLE_RESOLUTIONS:
+            raise HTTPException(
+                status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={
+                    "message": f"Resolution not found. Available resolutions: {list(CANDLE_RESOLUTIONS)}",
+                }
+            )
+        start, end = self.history.to_naive_utc(start), self.history.to_naive_utc(end)
+        self.history.validate_range(start, end, CANDLE_RESOLUTIONS[resolution])
+        async with self.db_postgres_async.session(read_only=True) as session:  # type: ignore[var-annotated]
+            candles = await self.currency_candles_repository.get_candles_async(
+                session=session,
+                token=token,
+                currency=currency,
+                exchanger=exchanger,
+                resolution=resolution,
+                start=start,
+                end=end,
+            )
+        return {
+            "direction": f"{token}-{currency}",
+            "exchanger": exchanger,
+            "resolution": resolution,
+            "candles": [
+                {
+                    "timestamp": candle.bucket.isoformat() + 'Z',
+                    "open": candle.open,
+                    "high": candle.high,
+                    "low": candle.low,
+                    "close": candle.close,
+                }
+                for candle in candles
+            ]
+        }
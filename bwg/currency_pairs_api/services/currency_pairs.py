@@ -1,14 +1,15 @@
 """Currency pairs service module."""
-import datetime
 import logging
+from typing import Dict, List, Optional, Tuple
 
-import dateutil.parser
 from fastapi import HTTPException
 from starlette.status import (HTTP_422_UNPROCESSABLE_ENTITY,
                               HTTP_502_BAD_GATEWAY)
 
-from bwg.lib.postgres.database import PostgresDatabase
-from bwg.lib.repositories.currency_pairs import CurrencyPairsRepository
+from bwg.currency_pairs_api.services.encoded_response import EncodedResponse
+from bwg.currency_pairs_api.services.freshness import FreshnessService
+from bwg.currency_pairs_api.services.snapshot import SnapshotService
+from bwg.lib.pair_registry import PairRegistry
 
 __all__ = ("CurrencyPairsService",)
 
@@ -16,69 +17,179 @@ logger = logging.getLogger(__name__)
 
 
 class CurrencyPairsService:
-    """Currency Pairs service."""
+    """Currency Pairs service.
 
-    currency_pairs_repository: "CurrencyPairsRepository"
-    db_postgres: "PostgresDatabase"
+    Serves the preferred price of a pair, consolidated across exchanges when the worker
+    consolidates prices, or the price of the exchanger requested explicitly.
+    A consolidated price with spread above `divergence_threshold` is marked as diverged.
+    """
 
-    def __init__(self) -> None:
-        self.token_compendium = ['BTC', 'ETH']
-        self.currency_compendium = ['RUB', 'USD']
+    snapshot: "SnapshotService"
+    pair_registry: "PairRegistry"
+    freshness: "FreshnessService"
 
-    def execute(self, token: str, currency: str) -> dict:
-        token = token.upper()
-        currency = currency.upper()
+    def __init__(self, divergence_threshold: float = 0.01) -> None:
+        self.divergence_threshold = divergence_threshold
+        self._responses: Dict[Tuple[str, str, Optional[str]], Tuple[dict, EncodedResponse]] = {}
 
+    async def execute(self, token: str, currency: str, exchanger: Optional[str] = None) -> Optional[EncodedResponse]:
+        """
+        Get encoded response of the pair.
+
+        A response is encoded once per snapshot row and reused until the row is replaced.
+
+        Returns:
+            EncodedResponse: response or None when there is no price of the pair
+        """
+        token, currency = self.normalize_pair(token, currency)
+        if exchanger is not None:
+            exchanger = self.normalize_exchanger(exchanger)
+        row = self.snapshot.get(token, currency, exchanger)
+        if row is None:
+            row = await self.snapshot.fetch(token, currency, exchanger)
+            if row is None:
+                return None
+            self.check_if_data_expired(row)
+            return self.encode(row)
+
+        self.check_if_data_expired(row)
+        key = (token, currency, exchanger)
+        cached = self._responses.get(key)
+        if cached is None or cached[0] is not row:
+            cached = (row, self.encode(row))
+            self._responses[key] = cached
+        return cached[1]
+
+    def encode(self, row: dict) -> EncodedResponse:
+        return EncodedResponse(
+            self.format_msg(row['token'], row['currency'], row['value'], row['exchanger'], self.divergence_of(row)),
+            row['timestamp'],
+            row['epoch'],
+        )
+
+    def execute_batch(
+            self,
+            tokens: Optional[List[str]],
+            currencies: Optional[List[str]],
+            exchanger: Optional[str] = None,
+    ) -> dict:
+        tokens = [self.pair_registry.normalize_token(token) for token in tokens or self.pair_registry.tokens]
+        currencies = [self.pair_registry.normalize_currency(currency)
+                      for currency in currencies or self.pair_registry.currencies]
+        if exchanger is not None:
+            exchanger = self.normalize_exchanger(exchanger)
+
+        for token in tokens:
+            for currency in currencies:
+                self.validate_pair(token, currency)
+        rows = self.snapshot.get_many(
+            ((token, currency) for token in tokens for currency in currencies),
+            exchanger,
+        )
+        return self.format_batch(rows)
+
+    def parse_directions(self, directions: Optional[List[str]]) -> List[Tuple[str, str]]:
+        """
+        Parse directions like BTC-USD.
+
+        Returns:
+            list: (token, currency) pairs, all available pairs when directions are empty
+        """
+        if not directions:
+            return list(self.pair_registry.pairs)
+        res = []
+        for direction in directions:
+            token, _, currency = direction.partition('-')
+            res.append(self.normalize_pair(token, currency))
+        return res
+
+    def normalize_pair(self, token: str, currency: str) -> Tuple[str, str]:
+        """
+        Get canonical names of the pair, e.g. (BTC, USD) for (bitcoin, usdt).
+
+        Returns:
+            tuple: (token, currency)
+        """
+        token = self.pair_registry.normalize_token(token)
+        currency = self.pair_registry.normalize_currency(currency)
         self.validate_pair(token, currency)
-        with self.db_postgres.session() as session:  # type: ignore[var-annotated]
-            result = self.currency_pairs_repository.get_row(session=session,
-                                                            token=token,
-                                                            currency=currency)
-            if result:
-                dict_result = self.currency_pairs_repository.model_as_dict(result)
-                self.check_if_data_expired(dict_result['timestamp'])
-
-                return self.format_msg(dict_result['token'], dict_result['currency'],
-                                       dict_result['value'], dict_result['exchanger'])
-        return {}
+        return token, currency
+
+    def normalize_exchanger(self, exchanger: str) -> str:
+        name = self.pair_registry.normalize_exchanger(exchanger)
+        if name is None:
+            raise HTTPException(
+                status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={
+                    "message": f"Exchanger not found. Available exchangers: {list(self.pair_registry.sources)}",
+                }
+            )
+        return name
+
+    def format_batch(self, rows: Dict[Tuple[str, str], Optional[dict]]) -> dict:
+        return {
+            "cources": [
+                {
+                    "direction": f"{token}-{currency}",
+                    "value": row['value'] if row else None,
+                    "exchanger": row['exchanger'] if row else None,
+                    "age_ms": round(self.freshness.age_ms(row)) if row else None,
+                    "stale": not row or self.freshness.is_stale(row),
+                    **(self.divergence_of(row) if row else {}),
+                }
+                for (token, currency), row in rows.items()
+            ]
+        }
+
+    def divergence_of(self, row: dict) -> dict:
+        """
+        Get spread of exchange prices and divergence flag of a consolidated row.
+
+        Returns:
+            dict: spread and diverged, empty for a row of an exchanger
+        """
+        if row.get('spread') is None:
+            return {}
+        return {
+            "spread": row['spread'],
+            "diverged": row['spread'] > self.divergence_threshold,
+        }
 
     def validate_pair(self, token: str, currency: str) -> None:
-        if token not in self.token_compendium:
+        if token not in self.pair_registry.token_set:
             raise HTTPException(
                 status_code=HTTP_422_UNPROCESSABLE_ENTITY,
                 detail={
-                    "message": f"Token not found. Available tokens: {self.token_compendium}",
+                    "message": f"Token not found. Available tokens: {list(self.pair_registry.tokens)}",
                 }
             )
-        if currency not in self.currency_compendium:
+        if currency not in self.pair_registry.currency_set:
             raise HTTPException(
                 status_code=HTTP_422_UNPROCESSABLE_ENTITY,
                 detail={
-                    "message": f"Currency not found. Available currencies: {self.currency_compendium}",
+                    "message": f"Currency not found. Available currencies: {list(self.pair_registry.currencies)}",
                 }
             )
 
     @staticmethod
-    def format_msg(token: str, currency: str, value: float, exchanger: str) -> dict:
+    def format_msg(token: str, currency: str, value: float, exchanger: str, divergence: Optional[dict] = None) -> dict:
         return {
             "exchanger": exchanger,
             "cources": [
                 {
                     "direction": f"{token}-{currency}",
-                    "value": value
+                    "value": value,
+                    **(divergence or {}),
                 }
             ]
         }
 
-    @staticmethod
-    def check_if_data_expired(date) -> None:  # type: ignore[no-untyped-def]
-        current_time = datetime.datetime.now().isoformat() + 'Z'
-        date = str(date)+'Z'
-        delta = dateutil.parser.isoparse(current_time) - dateutil.parser.isoparse(date)
-        if delta.seconds > 5:
+    def check_if_data_expired(self, row: dict) -> None:
+        if self.freshness.is_stale(row):
             raise HTTPException(
                 status_code=HTTP_502_BAD_GATEWAY,
                 detail={
                     "message": "Server stores irrelevant data",
+                    "age_ms": round(self.freshness.age_ms(row)),
                 }
             )
@@ -0,0 +1,57 @@
+"""Encoded response module."""
+import datetime
+import hashlib
+import json
+import time
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi.responses import Response
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+__all__ = ("EncodedResponse",)
+
+
+class EncodedResponse:
+    """JSON response encoded once, with its ETag and Last-Modified headers.
+
+    Sending it costs no serialization, so it is cached until the price changes.
+    Only `X-Price-Age-Ms` header with age of the price is computed per request.
+    """
+
+    __slots__ = ("body", "headers", "etag", "last_modified", "epoch")
+
+    def __init__(self, content: Any, last_modified: datetime.datetime, epoch: float) -> None:
+        self.body = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=8).hexdigest()}"'
+        self.last_modified = last_modified.replace(microsecond=0, tzinfo=datetime.timezone.utc)
+        self.headers: Dict[str, str] = {
+            "ETag": self.etag,
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+        }
+        self.epoch = epoch
+
+    def is_not_modified(self, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+        """
+        Check conditional request headers, If-None-Match takes precedence over If-Modified-Since.
+
+        Returns:
+            bool: True when the client has the same response
+        """
+        if if_none_match is not None:
+            return if_none_match.strip() == "*" or self.etag in (
+                tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+            )
+        if if_modified_since is not None:
+            try:
+                return self.last_modified <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def to_response(self, if_none_match: Optional[str] = None, if_modified_since: Optional[str] = None) -> Response:
+        headers = dict(self.headers)
+        headers["X-Price-Age-Ms"] = str(round((time.time() - self.epoch) * 1000))
+        if self.is_not_modified(if_none_match, if_modified_since):
+            return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
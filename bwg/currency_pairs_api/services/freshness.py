@@ -0,0 +1,74 @@
+"""Freshness service module."""
+import functools
+import logging
+import time
+from typing import Dict, Optional
+
+from prometheus_client import Counter, Gauge
+
+from bwg.currency_pairs_api.services.snapshot import SnapshotService
+from bwg.lib.pair_registry import PairRegistry
+
+__all__ = ("FreshnessService",)
+
+logger = logging.getLogger(__name__)
+
+PRICE_AGE = Gauge(
+    "price_age_seconds",
+    "Age of the most recent price of the direction in the snapshot, NaN without price.",
+    ["direction"],
+)
+STALE_PRICES = Counter(
+    "stale_prices",
+    "Number of prices older than max age found while serving requests.",
+    ["direction"],
+)
+
+
+class FreshnessService:
+    """Freshness service.
+
+    Age of a price is computed from `epoch` seconds stored with the snapshot row,
+    so checking it costs a subtraction. Max age is `max_age` seconds unless
+    the direction, e.g. BTC-USD, has its own in `max_age_by_direction`.
+    """
+
+    snapshot: "SnapshotService"
+    pair_registry: "PairRegistry"
+
+    def __init__(self, max_age: float = 5, max_age_by_direction: Optional[Dict[str, float]] = None) -> None:
+        self.max_age_ms = max_age * 1000
+        self.max_age_ms_by_pair = {
+            tuple(direction.upper().split('-', 1)): seconds * 1000
+            for direction, seconds in (max_age_by_direction or {}).items()
+        }
+
+    @staticmethod
+    def age_ms(row: dict) -> float:
+        """
+        Get age of the row.
+
+        Returns:
+            float: milliseconds since the price was fetched
+        """
+        return (time.time() - row['epoch']) * 1000
+
+    def max_age_ms_of(self, token: str, currency: str) -> float:
+        return self.max_age_ms_by_pair.get((token, currency), self.max_age_ms)
+
+    def is_stale(self, row: dict) -> bool:
+        stale = self.age_ms(row) > self.max_age_ms_of(row['token'], row['currency'])
+        if stale:
+            STALE_PRICES.labels(direction=f"{row['token']}-{row['currency']}").inc()
+        return stale
+
+    def register_metrics(self) -> None:
+        """Export age of every pair, computed when metrics are scraped."""
+        for token, currency in self.pair_registry.pairs:
+            PRICE_AGE.labels(direction=f"{token}-{currency}").set_function(
+                functools.partial(self.age_seconds_of, token, currency)
+            )
+
+    def age_seconds_of(self, token: str, currency: str) -> float:
+        row = self.snapshot.get(token, currency)
+        return self.age_ms(row) / 1000 if row is not None else float("nan")
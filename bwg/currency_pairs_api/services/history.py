@@ -0,0 +1,103 @@
+"""History service module."""
+import datetime
+import logging
+from typing import Optional
+
+from fastapi import HTTPException
+from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
+
+from bwg.currency_pairs_api.services.currency_pairs import CurrencyPairsService
+from bwg.lib.postgres.database import PostgresAsyncDatabase
+from bwg.lib.repositories.currency_ticks import CurrencyTicksRepository
+
+__all__ = ("HistoryService",)
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryService:
+    """History service.
+
+    History of a pair comes from one source, prices of different exchangers are never mixed.
+    """
+
+    currency_pairs: "CurrencyPairsService"
+    currency_ticks_repository: "CurrencyTicksRepository"
+    db_postgres_async: "PostgresAsyncDatabase"
+
+    def __init__(self, max_points: int = 10000) -> None:
+        self.max_points = max_points
+
+    async def execute(  # pylint: disable=too-many-arguments
+            self,
+            token: str,
+            currency: str,
+            start: datetime.datetime,
+            end: datetime.datetime,
+            resolution: int,
+            exchanger: Optional[str] = None,
+    ) -> dict:
+        token, currency = self.currency_pairs.normalize_pair(token, currency)
+        exchanger = self.source_of(token, currency, exchanger)
+        start, end = self.to_naive_utc(start), self.to_naive_utc(end)
+        self.validate_range(start, end, resolution)
+        async with self.db_postgres_async.session(read_only=True) as session:  # type: ignore[var-annotated]
+            rows = await self.currency_ticks_repository.get_history_async(
+                session=session,
+                token=token,
+                currency=currency,
+                start=start,
+                end=end,
+                resolution=datetime.timedelta(seconds=resolution),
+                exchanger=exchanger,
+            )
+        return self.format_msg(token, currency, exchanger, resolution, rows)
+
+    def source_of(self, token: str, currency: str, exchanger: Optional[str] = None) -> str:
+        """
+        Get source of the history, the source of the current price served by /courses when none is requested.
+
+        Returns:
+            str: exchanger or consolidated, the first exchanger when the pair has no price yet
+        """
+        if exchanger is not None:
+            return self.currency_pairs.normalize_exchanger(exchanger)
+        row = self.currency_pairs.snapshot.get(token, currency)
+        return row['exchanger'] if row else self.currency_pairs.pair_registry.exchangers[0]
+
+    def validate_range(self, start: datetime.datetime, end: datetime.datetime, resolution: int) -> None:
+        if resolution <= 0 or start >= end:
+            raise HTTPException(
+                status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={
+                    "message": "Expected start < end and positive resolution",
+                }
+            )
+        if (end - start).total_seconds() / resolution > self.max_points:
+            raise HTTPException(
+                status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={
+                    "message": f"Too many points requested. Max points: {self.max_points}",
+                }
+            )
+
+    @staticmethod
+    def to_naive_utc(date: datetime.datetime) -> datetime.datetime:
+        if date.tzinfo is None:
+            return date
+        return date.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+    @staticmethod
+    def format_msg(token: str, currency: str, exchanger: str, resolution: int, rows: list) -> dict:
+        return {
+            "direction": f"{token}-{currency}",
+            "exchanger": exchanger,
+            "resolution": resolution,
+            "prices": [
+                {
+                    "timestamp": bucket.isoformat() + 'Z',
+                    "value": value,
+                }
+                for bucket, value in rows
+            ]
+        }
@@ -0,0 +1,233 @@
+"""Snapshot service module."""
+# pylint: disable=broad-exception-caught
+import asyncio
+import datetime
+import json
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bwg.currency_pairs_api.services.broadcaster import BroadcasterService
+from bwg.lib.pair_registry import CONSOLIDATED
+from bwg.lib.postgres.database import PostgresAsyncDatabase
+from bwg.lib.price_board import PriceBoard, ProcessLock
+from bwg.lib.postgres.listener import PostgresListener
+from bwg.lib.repositories.currency_pairs import CurrencyPairsRepository
+
+__all__ = ("SnapshotService",)
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotService:  # pylint: disable=too-many-instance-attributes
+    """Snapshot service.
+
+    Keeps the latest prices of every pair on the price board shared by API workers.
+    The preferred price of a pair is the consolidated one when it is as recent as the others,
+    otherwise the most recent price.
+    One worker, holding the updater lock, keeps a copy of the currency pairs table and writes
+    the board. Its rows are updated from notifications of the worker, full refresh runs every
+    `refresh_interval` seconds or every `fallback_refresh_interval` seconds while the listener
+    is disconnected. Other workers read the board, check it for changes to publish every
+    `poll_interval` seconds and try to take the lock every `election_interval` seconds.
+    A pair missing on the board is read from database, a pair missing there too is not read
+    again for `miss_ttl` seconds.
+    """
+
+    broadcaster: "BroadcasterService"
+    currency_pairs_repository: "CurrencyPairsRepository"
+    db_postgres_async: "PostgresAsyncDatabase"
+    listener: "PostgresListener"
+    price_board: "PriceBoard"
+    updater_lock: "ProcessLock"
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            refresh_interval: float = 5,
+            fallback_refresh_interval: float = 0.5,
+            poll_interval: float = 0.05,
+            election_interval: float = 1,
+            miss_ttl: float = 1,
+    ) -> None:
+        self.refresh_interval = refresh_interval
+        self.fallback_refresh_interval = fallback_refresh_interval
+        self.poll_interval = poll_interval
+        self.election_interval = election_interval
+        self.miss_ttl = miss_ttl
+        self._rows: Dict[Tuple[str, str], Dict[str, dict]] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._refresh_requested = asyncio.Event()
+        # pairs are validated by the registry before fetch, so keys are bounded by configured pairs
+        self._misses: Dict[Tuple[str, str, Optional[str]], float] = {}
+
+    async def refresh(self) -> None:
+        async with self.db_postgres_async.session(read_only=True) as session:  # type: ignore[var-annotated]
+            models = await self.currency_pairs_repository.get_all_async(session)
+        self.update([self.currency_pairs_repository.model_as_dict(model) for model in models], replace=True)
+
+    def update(self, rows: List[dict], replace: bool = False) -> None:
+        """
+        Put rows into snapshot, write changed rows to the board and publish changed pairs.
+
+        Every row gets `epoch` seconds of its timestamp for cheap freshness checks.
+
+        With `replace` pairs missing in rows are dropped. A row never
+        replaces a newer row of the same exchanger, e.g. one that came with a notification.
+        """
+        current = self._rows
+        new_rows = {} if replace else {pair: dict(by_exchanger) for pair, by_exchanger in current.items()}
+        for row in rows:
+            row['epoch'] = self.epoch_of(row['timestamp'])
+            pair = (row['token'], row['currency'])
+            known = current.get(pair, {}).get(row['exchanger'])
+            new_rows.setdefault(pair, {})[row['exchanger']] = (
+                known if known is not None and known['timestamp'] > row['timestamp'] else row
+            )
+        self._rows = new_rows
+        for pair, by_exchanger in new_rows.items():
+            current_by_exchanger = current.get(pair, {})
+            for exchanger, row in by_exchanger.items():
+                if row is not current_by_exchanger.get(exchanger):
+                    self.price_board.write(row)
+            row = self.preferred(by_exchanger)
+            if row is not self.preferred(current_by_exchanger):
+                self.price_board.write(row, default=True)
+        if replace:
+            # the board may hold rows of a previous updater
+            for pair, exchanger in self.price_board.slots:
+                kept = exchanger in new_rows.get(pair, {}) if exchanger else pair in new_rows
+                if not kept and self.price_board.get(pair, exchanger) is not None:
+                    self.price_board.clear(pair, exchanger)
+        self.price_board.commit()
+        self.publish()
+
+    def publish(self) -> None:
+        self.broadcaster.publish(self.price_board.changes())
+
+    def on_notification(self, payload: str) -> None:
+        if not payload:
+            self.request_refresh()
+            return
+        self.update([
+            dict(
+                row,
+                value=float(row['value']),
+                timestamp=datetime.datetime.fromisoformat(row['timestamp'].rstrip('Z')),
+            )
+            for row in json.loads(payload)
+        ])
+
+    def request_refresh(self) -> None:
+        self._refresh_requested.set()
+
+    def get(self, token: str, currency: str, exchanger: Optional[str] = None) -> Optional[dict]:
+        """
+        Get the preferred row of the pair, or the row of the exchanger.
+
+        Returns:
+            dict: row of the pair or None when the pair is not on the board
+        """
+        return self.price_board.get((token, currency), exchanger)
+
+    def get_many(
+            self,
+            pairs: Iterable[Tuple[str, str]],
+            exchanger: Optional[str] = None,
+    ) -> Dict[Tuple[str, str], Optional[dict]]:
+        """
+        Get the preferred rows of the pairs, or the rows of the exchanger.
+
+        Returns:
+            dict: row or None by (token, currency)
+        """
+        board = self.price_board
+        return {pair: board.get(pair, exchanger) for pair in pairs}
+
+    @staticmethod
+    def epoch_of(timestamp: datetime.datetime) -> float:
+        """
+        Get epoch seconds of a naive UTC timestamp.
+
+        Returns:
+            float: seconds since epoch
+        """
+        return timestamp.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+    @staticmethod
+    def preferred(by_exchanger: Dict[str, dict]) -> Optional[dict]:
+        """
+        Get the most recent row, consolidated one when it is as recent as the rows it came from.
+
+        Returns:
+            dict: row or None without rows
+        """
+        if not by_exchanger:
+            return None
+        return max(by_exchanger.values(), key=lambda row: (row['timestamp'], row['exchanger'] == CONSOLIDATED))
+
+    async def fetch(self, token: str, currency: str, exchanger: Optional[str] = None) -> Optional[dict]:
+        """
+        Read the preferred row of the pair, or the row of the exchanger, from database, bypassing the snapshot.
+
+        Used on snapshot miss, e.g. before the first refresh has finished.
+        A pair not found in database is not read again for `miss_ttl` seconds.
+
+        Returns:
+            dict: row of the pair or None when the pair is not in database
+        """
+        key = (token, currency, exchanger)
+        if self._misses.get(key, 0.0) > time.monotonic():
+            return None
+        async with self.db_postgres_async.session(read_only=True) as session:  # type: ignore[var-annotated]
+            model = await self.currency_pairs_repository.get_row_async(session, token, currency, exchanger)
+            if model is None:
+                self._misses[key] = time.monotonic() + self.miss_ttl
+                return None
+            row = self.currency_pairs_repository.model_as_dict(model)
+        row['epoch'] = self.epoch_of(row['timestamp'])
+        return row
+
+    async def run(self) -> None:
+        while True:
+            self._refresh_requested.clear()
+            try:
+                await self.refresh()
+            except Exception as exc:
+                logger.exception(f"Snapshot refresh failed with {exc=}.")
+            interval = self.refresh_interval if self.listener.connected else self.fallback_refresh_interval
+            try:
+                await asyncio.wait_for(self._refresh_requested.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def follow(self) -> None:
+        generation = None
+        while True:
+            if self.price_board.generation != generation:
+                generation = self.price_board.generation
+                self.publish()
+            await asyncio.sleep(self.poll_interval)
+
+    async def elect(self) -> None:
+        while not self.updater_lock.acquire():
+            await asyncio.sleep(self.election_interval)
+        logger.info("Took over the price board")
+        self._tasks += [
+            asyncio.create_task(self.run()),
+            asyncio.create_task(self.listener.listen(self.on_notification, on_connect=self.request_refresh)),
+        ]
+
+    async def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self.follow()),
+                asyncio.create_task(self.elect()),
+            ]
+            logger.info("Started snapshot refresh")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        # let another worker take over without waiting for exit of this one
+        self.updater_lock.release()
@@ -0,0 +1,10 @@
+# pylint: disable=missing-module-docstring
+from .base import Broker
+from .in_process import InProcessBroker
+from .zeromq import ZeroMQBroker
+
+__all__ = (
+    "Broker",
+    "InProcessBroker",
+    "ZeroMQBroker",
+)
@@ -0,0 +1,25 @@
+"""Broker module."""
+import abc
+from typing import List
+
+__all__ = ("Broker",)
+
+
+class Broker(abc.ABC):
+    """Broker of price events between producers and consumers."""
+
+    @abc.abstractmethod
+    def publish(self, events: List[dict]) -> None:
+        """Publish events, never blocks the producer."""
+
+    @abc.abstractmethod
+    def consume(self, max_events: int, timeout: float) -> List[dict]:
+        """
+        Wait up to `timeout` seconds for events.
+
+        Returns:
+            list: up to `max_events` events, empty when nothing arrived
+        """
+
+    def close(self) -> None:
+        """Release resources of the broker."""
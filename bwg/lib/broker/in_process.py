@@ -0,0 +1,38 @@
+"""In-process Broker module."""
+import logging
+import queue
+import time
+from typing import List
+
+from .base import Broker
+
+__all__ = ("InProcessBroker",)
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessBroker(Broker):
+    """In-process Broker.
+
+    Bounded queue shared by producer and consumer threads of the process.
+    """
+
+    def __init__(self, max_size: int = 10000) -> None:
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=max_size)
+
+    def publish(self, events: List[dict]) -> None:
+        for event in events:
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                logger.warning(f"Queue is full, dropped {event}")
+
+    def consume(self, max_events: int, timeout: float) -> List[dict]:
+        deadline = time.monotonic() + timeout
+        events: List[dict] = []
+        while len(events) < max_events:
+            try:
+                events.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+        return events
@@ -0,0 +1,96 @@
+"""ZeroMQ Broker module."""
+import json
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from .base import Broker
+
+try:
+    import zmq
+except ImportError:  # pragma: no cover
+    zmq = None
+
+__all__ = ("ZeroMQBroker",)
+
+logger = logging.getLogger(__name__)
+
+
+class ZeroMQBroker(Broker):
+    """ZeroMQ Broker.
+
+    Producer binds PUSH socket to `bind_url`, consumers of any process connect PULL
+    sockets to `url` and get events round-robin. ZeroMQ sockets are not thread-safe:
+    the PUSH socket is bound once and shared by producer threads under a lock,
+    PULL sockets are created per thread. A message which is not a JSON object is logged and skipped.
+    """
+
+    def __init__(
+            self,
+            url: str = "tcp://127.0.0.1:5556",
+            bind_url: Optional[str] = None,
+            high_water_mark: int = 10000,
+    ) -> None:
+        if zmq is None:
+            raise RuntimeError("pyzmq is not installed, install with `poetry install -E zeromq`")
+        self.url = url
+        self.bind_url = bind_url or url
+        self.high_water_mark = high_water_mark
+        self._context = zmq.Context.instance()
+        self._local = threading.local()
+        self._push_socket: Optional["zmq.Socket"] = None
+        self._push_lock = threading.Lock()
+
+    def _pull_socket(self) -> "zmq.Socket":
+        socket = getattr(self._local, "socket", None)
+        if socket is None:
+            socket = self._context.socket(zmq.PULL)
+            socket.setsockopt(zmq.RCVHWM, self.high_water_mark)
+            socket.connect(self.url)
+            self._local.socket = socket
+        return socket
+
+    def publish(self, events: List[dict]) -> None:
+        messages = [json.dumps(event, default=str).encode() for event in events]
+        with self._push_lock:
+            if self._push_socket is None:
+                socket = self._context.socket(zmq.PUSH)
+                socket.setsockopt(zmq.SNDHWM, self.high_water_mark)
+                socket.bind(self.bind_url)
+                self._push_socket = socket
+            for event, message in zip(events, messages):
+                try:
+                    self._push_socket.send(message, flags=zmq.NOBLOCK)
+                except zmq.Again:
+                    logger.warning(f"No consumer is ready, dropped {event}")
+
+    def consume(self, max_events: int, timeout: float) -> List[dict]:
+        socket = self._pull_socket()
+        deadline = time.monotonic() + timeout
+        events: List[dict] = []
+        while len(events) < max_events:
+            if not socket.poll(max(0, int((deadline - time.monotonic()) * 1000))):
+                break
+            message = socket.recv()
+            try:
+                event = json.loads(message)
+            except ValueError as exc:
+                logger.warning(f"Skipped malformed message {message[:100]!r} with {exc=}.")
+                continue
+            if not isinstance(event, dict):
+                logger.warning(f"Skipped message {message[:100]!r} which is not an event.")
+                continue
+            events.append(event)
+        return events
+
+    def close(self) -> None:
+        """Close the PUSH socket and the PULL socket of the calling thread."""
+        with self._push_lock:
+            if self._push_socket is not None:
+                self._push_socket.close(linger=0)
+                self._push_socket = None
+        socket = getattr(self._local, "socket", None)
+        if socket is not None:
+            socket.close(linger=0)
+            self._local.socket = None
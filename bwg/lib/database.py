@@ -1,43 +1,201 @@
 # pylint: disable=protected-access
 """Database module."""
-import datetime
+import itertools
 import logging
-from contextlib import AbstractContextManager, contextmanager
-from typing import Any, Callable, Optional
+import time
+from contextlib import (AbstractAsyncContextManager, AbstractContextManager,
+                        asynccontextmanager, contextmanager)
+from typing import Any, Callable, Iterator, List, Optional
 
-from sqlalchemy import create_engine, orm
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import create_engine, orm, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 
-__all__ = ("Database",)
+__all__ = (
+    "AsyncDatabase",
+    "BlockingAsyncDatabase",
+    "Database",
+)
 
 logger = logging.getLogger(__name__)
 
+# defaults of the `pool` section of a process role in postgres config
+DEFAULT_POOL_OPTIONS = {
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_timeout": 30,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
+POOL_SIZE = Gauge("db_pool_size", "Number of connections kept in the pool.", ["pool"])
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Number of connections in use.", ["pool"])
+POOL_OVERFLOW = Gauge("db_pool_overflow", "Number of connections opened above pool size.", ["pool"])
+POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time to get a connection from the pool, including opening a new one.",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+
+
+class InstrumentedPoolMixin:
+    """Pool measuring time to get a connection."""
+
+    pool_name = "default"
+
+    def _do_get(self) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        finally:
+            POOL_WAIT.labels(pool=self.pool_name).observe(time.perf_counter() - started_at)
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    """Instrumented pool of sync engine."""
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """Instrumented pool of async engine."""
+
+
+REPLICA_LAG = Gauge("db_replica_lag_seconds", "Replication lag of the replica at the last check.", ["pool"])
+REPLICA_FALLBACK = Counter(
+    "db_replica_fallback",
+    "Number of read-only sessions sent to primary because no replica was usable.",
+    ["pool"],
+)
+
+# NULL, an unknown lag, unless the server is a replica streaming from the primary: a replica which lost
+# the primary replays everything it has received and would look fresh forever.
+# Zero when a streaming replica has replayed everything it received, so an idle primary does not look like lag
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN NULL "
+    "WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def instrument_pool(pool: Pool, name: str) -> None:
+    """Export size, checked out and overflow connections of the pool, computed on scrape."""
+    pool.pool_name = name  # type: ignore[attr-defined]
+    POOL_SIZE.labels(pool=name).set_function(pool.size)  # type: ignore[attr-defined]
+    POOL_CHECKED_OUT.labels(pool=name).set_function(pool.checkedout)  # type: ignore[attr-defined]
+    POOL_OVERFLOW.labels(pool=name).set_function(lambda: max(0, pool.overflow()))  # type: ignore[attr-defined]
+
+
+class Replica:
+    """Replica with its engine and the last measured lag."""
+
+    def __init__(self, name: str, engine: Any, session_factory: sessionmaker) -> None:
+        self.name = name
+        self.engine = engine
+        self.session_factory = session_factory
+        self.lag: Optional[float] = None
+        self.checked_at: Optional[float] = None
+
+
+class ReplicaSet:
+    """Read replicas balanced round-robin.
+
+    A replica is usable while its lag, measured at most every `lag_check_interval` seconds,
+    is not above `max_lag` seconds. Failed check or unknown lag makes the replica unusable until the next check.
+    """
+
+    def __init__(self, name: str, replicas: List[Replica], max_lag: float, lag_check_interval: float) -> None:
+        self.name = name
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self._offsets = itertools.count()
+
+    def candidates(self) -> Iterator[Replica]:
+        """
+        Iterate replicas, every call starts from the next one.
+
+        Returns:
+            Iterator: replicas
+        """
+        if not self.replicas:
+            return
+        offset = next(self._offsets) % len(self.replicas)
+        yield from self.replicas[offset:] + self.replicas[:offset]
+
+    def is_check_due(self, replica: Replica) -> bool:
+        """Check whether lag of the replica should be measured, concurrent callers get True once."""
+        now = time.monotonic()
+        if replica.checked_at is not None and now - replica.checked_at < self.lag_check_interval:
+            return False
+        replica.checked_at = now
+        return True
+
+    @staticmethod
+    def lag_of(replica: Replica, value: Any) -> Optional[float]:
+        """
+        Get lag of REPLICA_LAG_QUERY result.
+
+        Returns:
+            float: lag in seconds, None when it is unknown, e.g. the replica does not stream from the primary
+        """
+        if value is None:
+            logger.warning(f"Lag of {replica.name} is unknown, it is not a replica streaming from the primary")
+            return None
+        return float(value)
+
+    def record_lag(self, replica: Replica, lag: Optional[float]) -> None:
+        if lag is not None and lag > self.max_lag:
+            logger.warning(f"Replica {replica.name} lags {lag:.2f}s behind primary")
+        replica.lag = lag
+        REPLICA_LAG.labels(pool=replica.name).set(float("nan") if lag is None else lag)
+
+    def is_usable(self, replica: Replica) -> bool:
+        return replica.lag is not None and replica.lag <= self.max_lag
+
+    def fallback(self) -> None:
+        logger.debug(f"No usable replica of {self.name}, read from primary")
+        REPLICA_FALLBACK.labels(pool=self.name).inc()
+
 
 class Database:
-    """Database for ORM Models."""
+    """Database for ORM Models.
+
+    Pool settings come from `pool_options` (see DEFAULT_POOL_OPTIONS), the pool is exported
+    to metrics with `name` label. Read-only sessions go to `replica_dsns` (see ReplicaSet)
+    and fall back to primary when no replica is usable.
+    """
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
             self,
             db_dsn: str,
             execution_options: Optional[dict] = None,
             enable_logging: bool = False,
+            name: str = "default",
+            pool_options: Optional[dict] = None,
+            replica_dsns: Optional[List[str]] = None,
+            max_replica_lag: float = 5,
+            replica_lag_check_interval: float = 5,
             **kwargs: Any,
     ) -> None:
         if execution_options is None:
             execution_options = {}
-
-        read_only_execution_options = dict(
-            execution_options or {},
-            read_only=True,
-            staleness=kwargs.get("staleness") or {"exact_staleness": datetime.timedelta(seconds=2)},
-        )
+        kwargs = {**DEFAULT_POOL_OPTIONS, **(pool_options or {}), **kwargs}
 
         self._engine = self._create_engine(db_dsn, enable_logging, execution_options, **kwargs)
-        self._read_only_engine = self._create_engine(db_dsn, enable_logging, read_only_execution_options, **kwargs)
-
         self._session_factory = self._create_session_factory(self._engine)
-        self._read_only_session_factory = self._create_session_factory(self._read_only_engine)
+        instrument_pool(self._engine.pool, name)
+
+        replicas = []
+        for number, replica_dsn in enumerate(replica_dsns or []):
+            engine = self._create_engine(replica_dsn, enable_logging, execution_options, **kwargs)
+            replicas.append(Replica(f"{name}_replica{number}", engine, self._create_session_factory(engine)))
+            instrument_pool(engine.pool, replicas[-1].name)
+        self._replicas = ReplicaSet(name, replicas, max_replica_lag, replica_lag_check_interval)
 
     @staticmethod
     def _create_engine(db_dsn: str, enable_logging: bool, execution_options: dict, **kwargs: Any) -> Engine:
@@ -45,8 +203,7 @@ class Database:
             db_dsn,
             echo=enable_logging,
             execution_options=execution_options,
-            pool_size=50,
-            pool_timeout=1800,
+            poolclass=InstrumentedQueuePool,
             **kwargs,
         )
 
@@ -59,6 +216,25 @@ class Database:
             bind=bind_engine,
         )
 
+    def _read_only_session_factory(self) -> sessionmaker:
+        for replica in self._replicas.candidates():
+            if self._replicas.is_check_due(replica):
+                self._replicas.record_lag(replica, self._check_lag(replica))
+            if self._replicas.is_usable(replica):
+                return replica.session_factory
+        if self._replicas.replicas:
+            self._replicas.fallback()
+        return self._session_factory
+
+    @staticmethod
+    def _check_lag(replica: Replica) -> Optional[float]:
+        try:
+            with replica.engine.connect() as connection:
+                return ReplicaSet.lag_of(replica, connection.execute(REPLICA_LAG_QUERY).scalar())
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception(f"Failed to check lag of {replica.name}")
+            return None
+
     @contextmanager  # type: ignore[arg-type]
     def session(  # type: ignore[misc]
             self,
@@ -69,16 +245,12 @@ class Database:
         Session management.
 
         Returns:
-            Session: created database session
-        """
-        if read_only:
-            session: Session = self._read_only_session_factory(
-                autocommit=autocommit,
-            )
-        else:
-            session: Session = self._session_factory(  # type: ignore[no-redef]
-                autocommit=autocommit,
-            )
+            Session: created database session, of a replica when `read_only`
+        """
+        session_factory = self._read_only_session_factory() if read_only else self._session_factory
+        session: Session = session_factory(
+            autocommit=autocommit,
+        )
         try:
             yield session
         except Exception:
@@ -95,3 +267,165 @@ class Database:
             None
         """
         self._engine.dispose()
+        for replica in self._replicas.replicas:
+            replica.engine.dispose()
+
+
+class AsyncDatabase:
+    """Async Database for ORM Models.
+
+    Pool settings come from `pool_options` (see DEFAULT_POOL_OPTIONS), the pool is exported
+    to metrics with `name` label. Read-only sessions go to `replica_dsns` (see ReplicaSet)
+    and fall back to primary when no replica is usable.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            db_dsn: str,
+            execution_options: Optional[dict] = None,
+            enable_logging: bool = False,
+            name: str = "default",
+            pool_options: Optional[dict] = None,
+            replica_dsns: Optional[List[str]] = None,
+            max_replica_lag: float = 5,
+            replica_lag_check_interval: float = 5,
+            **kwargs: Any,
+    ) -> None:
+        if execution_options is None:
+            execution_options = {}
+        kwargs = {**DEFAULT_POOL_OPTIONS, **(pool_options or {}), **kwargs}
+
+        self._engine = self._create_engine(db_dsn, enable_logging, execution_options, **kwargs)
+        self._session_factory = self._create_session_factory(self._engine)
+        instrument_pool(self._engine.sync_engine.pool, name)
+
+        replicas = []
+        for number, replica_dsn in enumerate(replica_dsns or []):
+            engine = self._create_engine(replica_dsn, enable_logging, execution_options, **kwargs)
+            replicas.append(Replica(f"{name}_replica{number}", engine, self._create_session_factory(engine)))
+            instrument_pool(engine.sync_engine.pool, replicas[-1].name)
+        self._replicas = ReplicaSet(name, replicas, max_replica_lag, replica_lag_check_interval)
+
+    @staticmethod
+    def _create_engine(db_dsn: str, enable_logging: bool, execution_options: dict, **kwargs: Any) -> AsyncEngine:
+        return create_async_engine(
+            db_dsn,
+            echo=enable_logging,
+            execution_options=execution_options,
+            poolclass=InstrumentedAsyncQueuePool,
+            **kwargs,
+        )
+
+    @staticmethod
+    def _create_session_factory(bind_engine: AsyncEngine) -> sessionmaker:
+        return orm.sessionmaker(
+            autoflush=False,
+            expire_on_commit=False,
+            bind=bind_engine,
+            class_=AsyncSession,
+        )
+
+    async def _read_only_session_factory(self) -> sessionmaker:
+        for replica in self._replicas.candidates():
+            if self._replicas.is_check_due(replica):
+                self._replicas.record_lag(replica, await self._check_lag(replica))
+            if self._replicas.is_usable(replica):
+                return replica.session_factory
+        if self._replicas.replicas:
+            self._replicas.fallback()
+        return self._session_factory
+
+    @staticmethod
+    async def _check_lag(replica: Replica) -> Optional[float]:
+        try:
+            async with replica.engine.connect() as connection:
+                return ReplicaSet.lag_of(replica, (await connection.execute(REPLICA_LAG_QUERY)).scalar())
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception(f"Failed to check lag of {replica.name}")
+            return None
+
+    @asynccontextmanager  # type: ignore[arg-type]
+    async def session(  # type: ignore[misc]
+            self,
+            read_only: bool = False,
+    ) -> Callable[..., AbstractAsyncContextManager[AsyncSession]]:
+        """
+        Async session management.
+
+        Returns:
+            AsyncSession: created database session, of a replica when `read_only`
+        """
+        session_factory = await self._read_only_session_factory() if read_only else self._session_factory
+        session: AsyncSession = session_factory()
+        try:
+            yield session
+        except Exception:
+            logger.exception("Session rollback because of exception")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def close(self) -> None:
+        """
+        Close database.
+
+        Returns:
+            None
+        """
+        await self._engine.dispose()
+        for replica in self._replicas.replicas:
+            await replica.engine.dispose()
+
+
+class BlockingAsyncSession:
+    """AsyncSession interface over a sync Session, every call blocks the event loop."""
+
+    def __init__(self, session: Session) -> None:
+        self.sync_session = session
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        return self.sync_session.execute(*args, **kwargs)
+
+    async def merge(self, *args: Any, **kwargs: Any) -> Any:
+        return self.sync_session.merge(*args, **kwargs)
+
+    async def commit(self) -> None:
+        self.sync_session.commit()
+
+    async def rollback(self) -> None:
+        self.sync_session.rollback()
+
+
+class BlockingAsyncDatabase:
+    """AsyncDatabase interface over a sync Database.
+
+    Sessions run psycopg2 queries inside the coroutine as the API did before the async path,
+    used with `database.async: false` to compare both paths under the same load.
+    """
+
+    def __init__(self, database: Database) -> None:
+        self._database = database
+
+    @asynccontextmanager  # type: ignore[arg-type]
+    async def session(  # type: ignore[misc]
+            self,
+            read_only: bool = False,
+    ) -> Callable[..., AbstractAsyncContextManager[BlockingAsyncSession]]:
+        """
+        Async session management over a sync session.
+
+        Returns:
+            BlockingAsyncSession: created database session, of a replica when `read_only`
+        """
+        with self._database.session(read_only=read_only) as session:  # type: ignore[var-annotated]
+            yield BlockingAsyncSession(session)
+
+    async def close(self) -> None:
+        """
+        Close database.
+
+        Returns:
+            None
+        """
+        self._database.close()
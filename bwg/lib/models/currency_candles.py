@@ -0,0 +1,28 @@
+"""CurrencyCandles module."""
+from sqlalchemy import Column, DateTime, Float, Integer, String
+
+from bwg.lib.models.base import Base
+
+__all__ = ("CurrencyCandles",)
+
+
+class CurrencyCandles(Base):
+    """CurrencyCandles model.
+
+    OHLC candles of the pair on one exchanger, or of consolidated prices, maintained from ticks.
+    """
+    __tablename__ = "currency_candles"
+
+    token = Column(String(20), primary_key=True)
+    currency = Column(String(20), primary_key=True)
+    exchanger = Column(String(20), primary_key=True)
+    resolution = Column(String(4), primary_key=True)
+    bucket = Column(DateTime, primary_key=True)
+    open = Column(Float(50), nullable=False)
+    high = Column(Float(50), nullable=False)
+    low = Column(Float(50), nullable=False)
+    close = Column(Float(50), nullable=False)
+    ticks = Column(Integer, nullable=False)
+    # times of the first and the last tick, batches of ticks may be merged out of order
+    opened_at = Column(DateTime, nullable=False)
+    closed_at = Column(DateTime, nullable=False)
@@ -15,3 +15,5 @@ class CurrencyPairs(Base):
     value = Column(Float(50), nullable=False)
     exchanger = Column(String(20), primary_key=True)
     timestamp = Column(DateTime, nullable=False)
+    # (max - min) / value of exchange prices, only for consolidated prices
+    spread = Column(Float(50), nullable=True)
@@ -0,0 +1,20 @@
+"""CurrencyTicks module."""
+from sqlalchemy import Column, DateTime, Float, String
+
+from bwg.lib.models.base import Base
+
+__all__ = ("CurrencyTicks",)
+
+
+class CurrencyTicks(Base):
+    """CurrencyTicks model.
+
+    Append-only price history, partitioned by range of timestamp.
+    """
+    __tablename__ = "currency_ticks"
+
+    token = Column(String(20), primary_key=True)
+    currency = Column(String(20), primary_key=True)
+    timestamp = Column(DateTime, primary_key=True)
+    exchanger = Column(String(20), primary_key=True)
+    value = Column(Float(50), nullable=False)
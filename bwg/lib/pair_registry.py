@@ -0,0 +1,110 @@
+"""Pair registry module."""
+import logging
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+__all__ = (
+    "CONSOLIDATED",
+    "PairRegistry",
+)
+
+logger = logging.getLogger(__name__)
+
+Pair = Tuple[str, str]
+
+# exchanger of prices consolidated across exchanges
+CONSOLIDATED = "consolidated"
+
+
+class PairRegistry:  # pylint: disable=too-many-instance-attributes
+    """Pair registry.
+
+    Tokens and currencies are configured by canonical name with their names on every exchange
+    (empty when the exchange has no such asset). Pairs are all tokens by all currencies.
+    Lookup tables are computed once, so validation and mapping of exchange symbols are O(1).
+    """
+
+    def __init__(self, tokens: Dict[str, Dict[str, str]], currencies: Dict[str, Dict[str, str]]) -> None:
+        self.tokens: Tuple[str, ...] = tuple(token.upper() for token in tokens)
+        self.currencies: Tuple[str, ...] = tuple(currency.upper() for currency in currencies)
+        self.token_set: FrozenSet[str] = frozenset(self.tokens)
+        self.currency_set: FrozenSet[str] = frozenset(self.currencies)
+        self.pairs: Tuple[Pair, ...] = tuple((token, currency) for token in self.tokens for currency in self.currencies)
+        self.pair_set: FrozenSet[Pair] = frozenset(self.pairs)
+        self.exchangers: Tuple[str, ...] = tuple(sorted(
+            {exchanger for codes in (*tokens.values(), *currencies.values()) for exchanger in codes}
+        ))
+        self.sources: Tuple[str, ...] = (*self.exchangers, CONSOLIDATED)
+
+        self._token_aliases = self.make_aliases(tokens)
+        self._currency_aliases = self.make_aliases(currencies)
+        self._codes: Dict[str, Dict[Pair, List[Pair]]] = {}
+        for token, token_codes in tokens.items():
+            for currency, currency_codes in currencies.items():
+                for exchanger, token_code in token_codes.items():
+                    currency_code = currency_codes.get(exchanger)
+                    # the same asset, e.g. USDTTRC-USD on Binance which quotes USD as USDT, has no market
+                    if not token_code or not currency_code or token_code == currency_code:
+                        continue
+                    pair = (token.upper(), currency.upper())
+                    self._codes.setdefault(exchanger, {}).setdefault((token_code, currency_code), []).append(pair)
+
+    @staticmethod
+    def make_aliases(assets: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+        """
+        Map upper-cased canonical and exchange names to canonical name.
+
+        A name shared by several assets, e.g. USDT of USDTTRC and USDTERC, is not an alias.
+
+        Returns:
+            dict: canonical name by alias
+        """
+        candidates: Dict[str, set] = {}
+        for asset, codes in assets.items():
+            for alias in (asset, *codes.values()):
+                if alias:
+                    candidates.setdefault(alias.upper(), set()).add(asset.upper())
+        aliases = {alias: next(iter(names)) for alias, names in candidates.items() if len(names) == 1}
+        aliases.update({asset.upper(): asset.upper() for asset in assets})
+        return aliases
+
+    def normalize_token(self, token: str) -> str:
+        """
+        Get canonical name of the token, e.g. BTC for bitcoin.
+
+        Returns:
+            str: canonical name, upper-cased `token` when it is unknown
+        """
+        token = token.upper()
+        return self._token_aliases.get(token, token)
+
+    def normalize_currency(self, currency: str) -> str:
+        """
+        Get canonical name of the currency, e.g. USD for USDT.
+
+        Returns:
+            str: canonical name, upper-cased `currency` when it is unknown
+        """
+        currency = currency.upper()
+        return self._currency_aliases.get(currency, currency)
+
+    def normalize_exchanger(self, exchanger: str) -> Optional[str]:
+        """
+        Get name of the exchanger or consolidated prices.
+
+        Returns:
+            str: lower-cased name, None when it is unknown
+        """
+        exchanger = exchanger.lower()
+        return exchanger if exchanger in self.sources else None
+
+    def is_valid(self, token: str, currency: str) -> bool:
+        return (token, currency) in self.pair_set
+
+    def codes(self, exchanger: str) -> Dict[Pair, List[Pair]]:
+        """
+        Get names used by the exchange.
+
+        Returns:
+            dict: canonical pairs by (token, currency) names of the exchange
+        """
+        return self._codes.get(exchanger, {})
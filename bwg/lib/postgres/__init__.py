@@ -1,6 +1,8 @@
 # pylint: disable=missing-module-docstring
-from .database import PostgresDatabase
+from .database import PostgresAsyncDatabase, PostgresBlockingAsyncDatabase, PostgresDatabase
 
 __all__ = (
+    "PostgresAsyncDatabase",
+    "PostgresBlockingAsyncDatabase",
     "PostgresDatabase",
 )
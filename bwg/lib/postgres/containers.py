@@ -4,21 +4,51 @@ import logging
 
 from dependency_injector import containers, providers
 
-from .database import PostgresDatabase
+from .database import PostgresAsyncDatabase, PostgresBlockingAsyncDatabase, PostgresDatabase
 
 __all__ = ("PostgresContainer",)
 
 logger = logging.getLogger(__name__)
 
 
+def async_name(role: str) -> str:
+    return f"{role}_async"
+
+
 class PostgresContainer(containers.DeclarativeContainer):
     """Spanner package container."""
 
     # config provided for the component
     config = providers.Dependency()  # type: ignore[var-annotated]
 
+    # process role, e.g. worker or api, and its pool settings
+    role = providers.Dependency(instance_of=str, default="default")
+    pool_options = providers.Dependency(default=None)  # type: ignore[var-annotated]
+
     # database layer sqlalchemy
     db = providers.Singleton(
         PostgresDatabase,
         db_dsn=config.provided["dsn"],
+        name=role,
+        pool_options=pool_options,
+        replica_dsns=config.provided["replica_dsns"],
+        max_replica_lag=config.provided["max_replica_lag"],
+        replica_lag_check_interval=config.provided["replica_lag_check_interval"],
+    )
+
+    # async database layer sqlalchemy
+    async_db = providers.Singleton(
+        PostgresAsyncDatabase,
+        db_dsn=config.provided["async_dsn"],
+        name=providers.Callable(async_name, role),
+        pool_options=pool_options,
+        replica_dsns=config.provided["async_replica_dsns"],
+        max_replica_lag=config.provided["max_replica_lag"],
+        replica_lag_check_interval=config.provided["replica_lag_check_interval"],
+    )
+
+    # async interface over the sync database layer, blocks the event loop
+    blocking_async_db = providers.Singleton(
+        PostgresBlockingAsyncDatabase,
+        database=db,
     )
@@ -1,12 +1,24 @@
 """Postgres Database module."""
 import logging
 
-from bwg.lib.database import Database
+from bwg.lib.database import AsyncDatabase, BlockingAsyncDatabase, Database
 
-__all__ = ("PostgresDatabase",)
+__all__ = (
+    "PostgresAsyncDatabase",
+    "PostgresBlockingAsyncDatabase",
+    "PostgresDatabase",
+)
 
 logger = logging.getLogger(__name__)
 
 
 class PostgresDatabase(Database):
     """Postgres Database."""
+
+
+class PostgresAsyncDatabase(AsyncDatabase):
+    """Postgres Async Database."""
+
+
+class PostgresBlockingAsyncDatabase(BlockingAsyncDatabase):
+    """Postgres Async Database over the sync one."""
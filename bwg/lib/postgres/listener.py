@@ -0,0 +1,67 @@
+"""Postgres Listener module."""
+# pylint: disable=broad-exception-caught
+import asyncio
+import logging
+from typing import Any, Callable, Optional
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+__all__ = ("PostgresListener",)
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresListener:
+    """Postgres Listener.
+
+    Listens to the channel on a dedicated connection and reconnects when it is lost.
+    """
+
+    def __init__(
+            self,
+            db_dsn: str,
+            channel: str,
+            reconnect_min_delay: float = 0.5,
+            reconnect_max_delay: float = 30,
+    ) -> None:
+        self._dsn = make_url(db_dsn).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.channel = channel
+        self.reconnect_min_delay = reconnect_min_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.connected = False
+
+    async def listen(
+            self,
+            on_notification: Callable[[str], Any],
+            on_connect: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        """
+        Call `on_notification` with payload of every notification until cancelled.
+
+        `on_connect` is called after every (re)connect, notifications sent while
+        the connection was lost are not delivered.
+        """
+        delay = self.reconnect_min_delay
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self._dsn)
+                terminated = asyncio.Event()
+                connection.add_termination_listener(lambda _: terminated.set())
+                await connection.add_listener(self.channel, lambda *args: on_notification(args[-1]))
+                self.connected = True
+                logger.info(f"Listening to {self.channel}")
+                delay = self.reconnect_min_delay
+                if on_connect is not None:
+                    on_connect()
+                await terminated.wait()
+            except Exception as exc:
+                logger.warning(f"Listener of {self.channel} failed with {exc=}.")
+            finally:
+                self.connected = False
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            logger.info(f"Reconnect listener of {self.channel} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.reconnect_max_delay)
@@ -0,0 +1,266 @@
+"""Price board module."""
+import datetime
+import fcntl
+import hashlib
+import logging
+import math
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import IO, Dict, List, Optional, Sequence, Tuple
+
+__all__ = (
+    "PriceBoard",
+    "ProcessLock",
+)
+
+logger = logging.getLogger(__name__)
+
+Pair = Tuple[str, str]
+# pair and its exchanger, None for the default slot
+Slot = Tuple[Pair, Optional[str]]
+
+# header: generation, bumped by the writer after every batch of slots
+GENERATION = struct.Struct("<Q")
+# slot: sequence, then value, exchanger id (0 when empty), epoch seconds of the price and spread (NaN when none)
+SEQUENCE = struct.Struct("<Q")
+PRICE = struct.Struct("<dIxxxxdd")
+SLOT_SIZE = SEQUENCE.size + PRICE.size
+
+READ_RETRIES = 100
+
+
+class PriceBoard:  # pylint: disable=too-many-instance-attributes
+    """Latest price of every pair in shared memory.
+
+    The segment has a fixed layout, and is shared by all processes opening the board with the same
+    name, pairs and exchangers. Every pair has a default slot with the preferred price of the pair
+    and a slot per exchanger. One process writes it, others read
+    without locks: a slot is guarded by a sequence which is odd while the slot is written (seqlock),
+    a reader retries when the sequence is odd or changed while reading.
+
+    A row read from a slot is cached until the sequence of the slot changes, so reading
+    an unchanged price is one memory load and returns the same dict.
+
+    The segment outlives processes. Every process holds a shared lock of `users_path` while
+    the board is open, the last one to close the board removes the segment. Without `users_path`
+    the process is the only user and removes the segment on close.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            pairs: Sequence[Pair],
+            exchangers: Sequence[str],
+            users_path: Optional[str] = None,
+    ) -> None:
+        self.pairs = tuple(pairs)
+        self.exchangers = tuple(exchangers)
+        self.slots: Tuple[Slot, ...] = tuple(
+            (pair, exchanger) for pair in self.pairs for exchanger in (None, *self.exchangers)
+        )
+        layout = repr((PRICE.format, self.pairs, self.exchangers)).encode()
+        self.name = f"{name}_{hashlib.blake2b(layout, digest_size=4).hexdigest()}"
+        self.size = GENERATION.size + SLOT_SIZE * len(self.slots)
+
+        self._indexes: Dict[Slot, int] = {slot: index for index, slot in enumerate(self.slots)}
+        self._exchanger_ids: Dict[str, int] = {exchanger: i for i, exchanger in enumerate(self.exchangers, 1)}
+        self._sequences: List[int] = [0] * len(self.slots)
+        self._rows: List[Optional[dict]] = [None] * len(self.slots)
+        self._published: Dict[Pair, Tuple[float, str]] = {}
+        self._users: Optional[IO] = None
+        if users_path is not None:
+            # waits while the last user of a previous segment removes it
+            self._users = open(users_path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+            fcntl.flock(self._users.fileno(), fcntl.LOCK_SH)
+        self._shm = self._open()
+        self._buf = self._shm.buf
+
+    def _open(self) -> shared_memory.SharedMemory:
+        for _ in range(READ_RETRIES):
+            try:
+                shm = shared_memory.SharedMemory(self.name, create=True, size=self.size)
+                logger.info(f"Created price board {self.name} of {self.size} bytes")
+            except FileExistsError:
+                try:
+                    shm = shared_memory.SharedMemory(self.name)
+                except ValueError:
+                    # created, but not sized yet by its creator
+                    time.sleep(0.01)
+                    continue
+            # the segment outlives processes, resource tracker would remove it when any of them exits,
+            # it tracks the POSIX name with the leading slash
+            resource_tracker.unregister(f"/{shm.name}", "shared_memory")
+            if shm.size < self.size:
+                raise RuntimeError(f"Price board {self.name} has {shm.size} bytes, expected {self.size}")
+            return shm
+        raise RuntimeError(f"Price board {self.name} was not sized by its creator")
+
+    @property
+    def generation(self) -> int:
+        return GENERATION.unpack_from(self._buf, 0)[0]
+
+    def get(self, pair: Pair, exchanger: Optional[str] = None) -> Optional[dict]:
+        """
+        Get the preferred row of the pair, or the row of the exchanger.
+
+        Returns:
+            dict: row of the pair or None when the slot is empty or it is not on the board
+        """
+        index = self._indexes.get((pair, exchanger))
+        if index is None:
+            return None
+        offset = GENERATION.size + index * SLOT_SIZE
+        if SEQUENCE.unpack_from(self._buf, offset)[0] == self._sequences[index]:
+            return self._rows[index]
+        for _ in range(READ_RETRIES):
+            sequence = SEQUENCE.unpack_from(self._buf, offset)[0]
+            if not sequence & 1:
+                value, exchanger_id, epoch, spread = PRICE.unpack_from(self._buf, offset + SEQUENCE.size)
+                if SEQUENCE.unpack_from(self._buf, offset)[0] == sequence:
+                    self._sequences[index] = sequence
+                    self._rows[index] = self.make_row(pair, value, exchanger_id, epoch, spread)
+                    return self._rows[index]
+            # the writer may be preempted in the middle of the write, give it the CPU
+            time.sleep(0)
+        logger.warning(f"Slot of {pair} is being written for too long")
+        return None
+
+    def make_row(  # pylint: disable=too-many-arguments
+            self,
+            pair: Pair,
+            value: float,
+            exchanger_id: int,
+            epoch: float,
+            spread: float,
+    ) -> Optional[dict]:
+        if not exchanger_id:
+            return None
+        return {
+            'token': pair[0],
+            'currency': pair[1],
+            'value': value,
+            'exchanger': self.exchangers[exchanger_id - 1],
+            'timestamp': datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).replace(tzinfo=None),
+            'epoch': epoch,
+            'spread': None if math.isnan(spread) else spread,
+        }
+
+    def write(self, row: dict, default: bool = False) -> None:
+        """
+        Put the row into the slot of its exchanger, or into the default slot of its pair.
+
+        Only one process may write the board.
+        """
+        pair = (row['token'], row['currency'])
+        index = self._indexes.get((pair, None if default else row['exchanger']))
+        exchanger_id = self._exchanger_ids.get(row['exchanger'])
+        if index is None or exchanger_id is None:
+            logger.debug(f"Skipped {pair} of {row['exchanger']}, it is not on the board")
+            return
+        spread = row.get('spread')
+        self._write(index, row['value'], exchanger_id, row['epoch'], math.nan if spread is None else spread)
+
+    def clear(self, pair: Pair, exchanger: Optional[str] = None) -> None:
+        index = self._indexes.get((pair, exchanger))
+        if index is not None:
+            self._write(index, 0.0, 0, 0.0, math.nan)
+
+    def _write(  # pylint: disable=too-many-arguments
+            self,
+            index: int,
+            value: float,
+            exchanger_id: int,
+            epoch: float,
+            spread: float,
+    ) -> None:
+        offset = GENERATION.size + index * SLOT_SIZE
+        # odd even if a previous writer died in the middle of a write
+        sequence = SEQUENCE.unpack_from(self._buf, offset)[0] | 1
+        SEQUENCE.pack_into(self._buf, offset, sequence)
+        PRICE.pack_into(self._buf, offset + SEQUENCE.size, value, exchanger_id, epoch, spread)
+        SEQUENCE.pack_into(self._buf, offset, sequence + 1)
+
+    def commit(self) -> None:
+        """Bump generation, so readers look for changed slots."""
+        GENERATION.pack_into(self._buf, 0, self.generation + 1)
+
+    def changes(self) -> Dict[Pair, dict]:
+        """
+        Get pairs whose preferred value or exchanger changed since the previous call in this process.
+
+        Returns:
+            dict: new row by (token, currency)
+        """
+        res = {}
+        for pair in self.pairs:
+            row = self.get(pair)
+            if row is None:
+                continue
+            published = (row['value'], row['exchanger'])
+            if self._published.get(pair) != published:
+                self._published[pair] = published
+                res[pair] = row
+        return res
+
+    def close(self) -> None:
+        """Detach from the segment and remove it when no other process uses the board."""
+        self._buf.release()
+        self._shm.close()
+        if self._users is None:
+            self.unlink()
+            return
+        try:
+            fcntl.flock(self._users.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            logger.info(f"Price board {self.name} is still used by other processes")
+        else:
+            self.unlink()
+        finally:
+            self._users.close()
+            self._users = None
+
+    def unlink(self) -> None:
+        # unlink() unregisters the segment from resource tracker, it was unregistered on open
+        resource_tracker.register(f"/{self.name}", "shared_memory")
+        try:
+            self._shm.unlink()
+            logger.info(f"Removed price board {self.name}")
+        except FileNotFoundError:
+            resource_tracker.unregister(f"/{self.name}", "shared_memory")
+
+
+class ProcessLock:
+    """Exclusive lock of a file, released by the OS when the holding process exits."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file: Optional[IO] = None
+
+    @property
+    def acquired(self) -> bool:
+        return self._file is not None
+
+    def acquire(self) -> bool:
+        """
+        Try to take the lock without waiting.
+
+        Returns:
+            bool: True when the process holds the lock
+        """
+        if self._file is not None:
+            return True
+        file = open(self.path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+        try:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            file.close()
+            return False
+        self._file = file
+        return True
+
+    def release(self) -> None:
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
@@ -1,8 +1,11 @@
 """Base Repository for the Spanner Models."""
+import json
 import logging
-from typing import TYPE_CHECKING, Any, ClassVar, Optional, Type
+from typing import TYPE_CHECKING, Any, ClassVar, List, Optional, Type
 
-from sqlalchemy import orm
+from sqlalchemy import func, orm, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.inspection import inspect
 
 if TYPE_CHECKING:
@@ -12,6 +15,9 @@ __all__ = ("BaseRepository",)
 
 logger = logging.getLogger(__name__)
 
+# Postgres rejects NOTIFY payloads of 8000 bytes and more
+MAX_NOTIFY_PAYLOAD = 7999
+
 
 class BaseRepository:
     """Base Repository.
@@ -22,17 +28,101 @@ class BaseRepository:
     Model: ClassVar[Type["DeclarativeMeta"]]
 
     def insert_or_update(self, session: orm.Session, **kwargs: Any) -> "DeclarativeMeta":
-        cancelled_label_object = session.query(self.Model).filter_by(**kwargs).with_for_update().one_or_none()
+        """Insert the row or update the row with the same primary key, locked until the end of the transaction."""
+        cancelled_label_object = session.query(self.Model).filter_by(
+            **self.primary_key_of(kwargs)).with_for_update().one_or_none()
         if cancelled_label_object is None:
-            cancelled_label_object = self.Model(**kwargs)
+            return session.merge(self.Model(**kwargs))
+
+        return self.apply(cancelled_label_object, kwargs)
+
+    def bulk_upsert(self, session: orm.Session, rows: List[dict]) -> None:
+        """Insert rows or update them on primary key conflict with one statement."""
+        if rows:
+            session.execute(self.upsert_statement(rows))
 
-        return session.merge(cancelled_label_object)
+    async def bulk_upsert_async(self, session: AsyncSession, rows: List[dict]) -> None:
+        """Insert rows or update them on primary key conflict with one statement."""
+        if rows:
+            await session.execute(self.upsert_statement(rows))
+
+    def notify(self, session: orm.Session, rows: List[dict]) -> None:
+        """
+        Notify listeners of the table channel about changed rows.
+
+        The notification is delivered on commit. Rows which do not fit into
+        the payload limit are replaced with an empty payload, meaning "reload all".
+        """
+        payload = json.dumps(rows, default=str)
+        if len(payload.encode()) > MAX_NOTIFY_PAYLOAD:
+            payload = ""
+        session.execute(select(func.pg_notify(self.Model.__tablename__, payload)))
+
+    @classmethod
+    def upsert_statement(cls, rows: List[dict]) -> Any:
+        primary_key = [column.name for column in inspect(cls.Model).primary_key]
+        statement = insert(cls.Model).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=primary_key,
+            set_={column.name: statement.excluded[column.name]
+                  for column in inspect(cls.Model).columns if column.name not in primary_key},
+            where=cls.upsert_condition(statement.excluded),
+        )
+
+    @classmethod
+    def upsert_condition(cls, excluded: Any) -> Optional[Any]:  # pylint: disable=unused-argument
+        """
+        Condition of updating a conflicting row.
+
+        Returns:
+            Any: SQL expression over the table and `excluded` row, None to always update
+        """
+        return None
+
+    @classmethod
+    def primary_key_of(cls, row: dict) -> dict:
+        return {column.name: row[column.name] for column in inspect(cls.Model).primary_key}
 
     def get_row(self, session: orm.Session, token: str, currency: str) -> Optional["DeclarativeMeta"]:
         return session.query(self.Model).select_from(self.Model).filter_by(
             token=token,
             currency=currency).first()
 
+    def get_all(self, session: orm.Session) -> List["DeclarativeMeta"]:
+        return session.query(self.Model).all()
+
+    async def insert_or_update_async(self, session: AsyncSession, **kwargs: Any) -> "DeclarativeMeta":
+        """Insert the row or update the row with the same primary key, locked until the end of the transaction."""
+        result = await session.execute(select(self.Model).filter_by(
+            **self.primary_key_of(kwargs)).with_for_update())
+        cancelled_label_object = result.scalars().one_or_none()
+        if cancelled_label_object is None:
+            return await session.merge(self.Model(**kwargs))
+
+        return self.apply(cancelled_label_object, kwargs)
+
+    @staticmethod
+    def apply(model: "DeclarativeMeta", values: dict) -> "DeclarativeMeta":
+        """
+        Set column values of a loaded model, they are written on flush.
+
+        Returns:
+            DeclarativeMeta: the same model
+        """
+        for key, value in values.items():
+            setattr(model, key, value)
+        return model
+
+    async def get_row_async(self, session: AsyncSession, token: str, currency: str) -> Optional["DeclarativeMeta"]:
+        result = await session.execute(select(self.Model).filter_by(
+            token=token,
+            currency=currency).limit(1))
+        return result.scalars().first()
+
+    async def get_all_async(self, session: AsyncSession) -> List["DeclarativeMeta"]:
+        result = await session.execute(select(self.Model))
+        return list(result.scalars().all())
+
     @classmethod
     def model_as_dict(cls, model: "DeclarativeMeta") -> dict:
         return {c.key: getattr(model, c.key)
@@ -0,0 +1,82 @@
+"""Repository of the Currency Candles Model."""
+import datetime
+import logging
+from typing import Dict, List
+
+from sqlalchemy import case, func, orm, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bwg.lib.models.currency_candles import CurrencyCandles
+from bwg.lib.repositories.base import BaseRepository
+
+__all__ = (
+    "CANDLE_RESOLUTIONS",
+    "CurrencyCandlesRepository",
+)
+
+logger = logging.getLogger(__name__)
+
+# resolution name -> bucket size in seconds
+CANDLE_RESOLUTIONS: Dict[str, int] = {
+    "1m": 60,
+    "5m": 300,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+
+class CurrencyCandlesRepository(BaseRepository):
+    """Currency Candles Repository."""
+
+    Model = CurrencyCandles
+
+    def merge_candles(self, session: orm.Session, rows: List[dict]) -> None:
+        """
+        Merge candles of new ticks into stored ones.
+
+        Batches may come out of order, e.g. from overlapping cycles or several consumers,
+        so open and close are replaced only by ticks earlier or later than the stored ones.
+        """
+        if not rows:
+            return
+        table = self.Model.__table__
+        statement = insert(self.Model).values(rows)
+        excluded = statement.excluded
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[column.name for column in table.primary_key],
+            set_={
+                "open": case((excluded.opened_at < table.c.opened_at, excluded.open), else_=table.c.open),
+                "high": func.greatest(table.c.high, excluded.high),
+                "low": func.least(table.c.low, excluded.low),
+                "close": case((excluded.closed_at >= table.c.closed_at, excluded.close), else_=table.c.close),
+                "ticks": table.c.ticks + excluded.ticks,
+                "opened_at": func.least(table.c.opened_at, excluded.opened_at),
+                "closed_at": func.greatest(table.c.closed_at, excluded.closed_at),
+            },
+        ))
+
+    def replace_candles(self, session: orm.Session, rows: List[dict]) -> None:
+        """Overwrite stored candles, e.g. when they are recomputed from all ticks of the bucket."""
+        if rows:
+            session.execute(self.upsert_statement(rows))
+
+    async def get_candles_async(  # pylint: disable=too-many-arguments
+            self,
+            session: AsyncSession,
+            token: str,
+            currency: str,
+            exchanger: str,
+            resolution: str,
+            start: datetime.datetime,
+            end: datetime.datetime,
+    ) -> List["CurrencyCandles"]:
+        result = await session.execute(select(self.Model).filter(
+            self.Model.token == token,
+            self.Model.currency == currency,
+            self.Model.exchanger == exchanger,
+            self.Model.resolution == resolution,
+            self.Model.bucket >= start,
+            self.Model.bucket < end,
+        ).order_by(self.Model.bucket))
+        return list(result.scalars().all())
@@ -1,9 +1,17 @@
 """Repository of the Spanner Task Engine Items Model."""
 import logging
+from typing import TYPE_CHECKING, Any, Optional
+
+from sqlalchemy import orm, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from bwg.lib.models.currency_pairs import CurrencyPairs
+from bwg.lib.pair_registry import CONSOLIDATED
 from bwg.lib.repositories.base import BaseRepository
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.declarative.api import DeclarativeMeta
+
 __all__ = ("CurrencyPairsRepository",)
 
 logger = logging.getLogger(__name__)
@@ -13,3 +21,43 @@ class CurrencyPairsRepository(BaseRepository):
     """Currency Pairs Repository."""
 
     Model = CurrencyPairs
+
+    def get_row(
+            self,
+            session: orm.Session,
+            token: str,
+            currency: str,
+            exchanger: Optional[str] = None,
+    ) -> Optional["DeclarativeMeta"]:
+        return session.execute(self.row_statement(token, currency, exchanger)).scalars().first()
+
+    async def get_row_async(
+            self,
+            session: AsyncSession,
+            token: str,
+            currency: str,
+            exchanger: Optional[str] = None,
+    ) -> Optional["DeclarativeMeta"]:
+        result = await session.execute(self.row_statement(token, currency, exchanger))
+        return result.scalars().first()
+
+    @classmethod
+    def row_statement(cls, token: str, currency: str, exchanger: Optional[str] = None) -> Any:
+        """
+        Select the row of the exchanger, or the newest row of the pair preferring consolidated one.
+
+        Returns:
+            Any: select statement
+        """
+        statement = select(cls.Model).filter_by(token=token, currency=currency)
+        if exchanger is not None:
+            return statement.filter_by(exchanger=exchanger)
+        return statement.order_by(
+            cls.Model.timestamp.desc(),
+            (cls.Model.exchanger == CONSOLIDATED).desc(),
+        ).limit(1)
+
+    @classmethod
+    def upsert_condition(cls, excluded: Any) -> Optional[Any]:
+        """Keep a newer row, consumers may write events out of order."""
+        return cls.Model.timestamp < excluded.timestamp
@@ -0,0 +1,89 @@
+"""Repository of the Currency Ticks Model."""
+import datetime
+import logging
+from typing import List
+
+from sqlalchemy import func, orm, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bwg.lib.models.currency_ticks import CurrencyTicks
+from bwg.lib.repositories.base import BaseRepository
+
+__all__ = ("CurrencyTicksRepository",)
+
+logger = logging.getLogger(__name__)
+
+BUCKETS_ORIGIN = datetime.datetime(2000, 1, 1)
+
+
+class CurrencyTicksRepository(BaseRepository):
+    """Currency Ticks Repository."""
+
+    Model = CurrencyTicks
+
+    def bulk_insert(self, session: orm.Session, rows: List[dict]) -> List[dict]:
+        """
+        Insert ticks, ticks already stored are skipped.
+
+        Returns:
+            list: inserted ticks
+        """
+        if not rows:
+            return []
+        statement = insert(self.Model).values(rows).on_conflict_do_nothing().returning(*self.Model.__table__.columns)
+        return [dict(row) for row in session.execute(statement).mappings()]
+
+    def get_ticks(self, session: orm.Session, start: datetime.datetime, end: datetime.datetime) -> List[tuple]:
+        """
+        Get ticks of all pairs in the time range.
+
+        Returns:
+            list: (token, currency, exchanger, timestamp, value) ordered by time
+        """
+        return session.query(
+            self.Model.token,
+            self.Model.currency,
+            self.Model.exchanger,
+            self.Model.timestamp,
+            self.Model.value,
+        ).filter(
+            self.Model.timestamp >= start,
+            self.Model.timestamp < end,
+        ).order_by(self.Model.timestamp).all()
+
+    def create_partition(self, session: orm.Session, day: datetime.date) -> None:
+        """Create partition with ticks of the day if it does not exist."""
+        table = self.Model.__tablename__
+        session.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {table}_p{day:%Y%m%d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{day:%Y-%m-%d}') TO ('{day + datetime.timedelta(days=1):%Y-%m-%d}')"
+        ))
+
+    async def get_history_async(  # pylint: disable=too-many-arguments
+            self,
+            session: AsyncSession,
+            token: str,
+            currency: str,
+            start: datetime.datetime,
+            end: datetime.datetime,
+            resolution: datetime.timedelta,
+            exchanger: str,
+    ) -> List[tuple]:
+        """
+        Get prices of the pair on the exchanger downsampled to `resolution`.
+
+        Returns:
+            list: (bucket start, average value) pairs ordered by time
+        """
+        bucket = func.date_bin(resolution, self.Model.timestamp, BUCKETS_ORIGIN).label("bucket")
+        query = select(bucket, func.avg(self.Model.value)).filter(
+            self.Model.token == token,
+            self.Model.currency == currency,
+            self.Model.timestamp >= start,
+            self.Model.timestamp < end,
+            self.Model.exchanger == exchanger,
+        )
+        # group by the label, bucket expression holds bind parameters and would not match itself
+        result = await session.execute(query.group_by(text("bucket")).order_by(text("bucket")))
+        return list(map(tuple, result.all()))
@@ -0,0 +1,38 @@
+"""currency ticks
+
+Revision ID: 5b1e7d3a9c42
+Revises: c0d32971fa9e
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7d3a9c42'
+down_revision: Union[str, None] = 'c0d32971fa9e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Daily partitions are created ahead by the worker (CurrencyTicksRepository.create_partition),
+    # the default partition only catches ticks written before their partition exists.
+    # Primary key (token, currency, timestamp, exchanger) serves pair range queries.
+    op.create_table('currency_ticks',
+    sa.Column('token', sa.String(length=20), nullable=False),
+    sa.Column('currency', sa.String(length=20), nullable=False),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.Column('exchanger', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.Float(precision=50), nullable=False),
+    sa.PrimaryKeyConstraint('token', 'currency', 'timestamp', 'exchanger'),
+    postgresql_partition_by='RANGE (timestamp)',
+    )
+    op.execute('CREATE TABLE currency_ticks_default PARTITION OF currency_ticks DEFAULT')
+
+
+def downgrade() -> None:
+    op.drop_table('currency_ticks')
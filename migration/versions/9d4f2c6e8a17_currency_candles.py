@@ -0,0 +1,37 @@
+"""currency candles
+
+Revision ID: 9d4f2c6e8a17
+Revises: 5b1e7d3a9c42
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4f2c6e8a17'
+down_revision: Union[str, None] = '5b1e7d3a9c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('currency_candles',
+    sa.Column('token', sa.String(length=20), nullable=False),
+    sa.Column('currency', sa.String(length=20), nullable=False),
+    sa.Column('resolution', sa.String(length=4), nullable=False),
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('open', sa.Float(precision=50), nullable=False),
+    sa.Column('high', sa.Float(precision=50), nullable=False),
+    sa.Column('low', sa.Float(precision=50), nullable=False),
+    sa.Column('close', sa.Float(precision=50), nullable=False),
+    sa.Column('ticks', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('token', 'currency', 'resolution', 'bucket')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('currency_candles')
@@ -0,0 +1,32 @@
+"""currency candles tick times
+
+Revision ID: b4e8d1f7a2c5
+Revises: f1c8a4d2b6e3
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e8d1f7a2c5'
+down_revision: Union[str, None] = 'f1c8a4d2b6e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('currency_candles', sa.Column('opened_at', sa.DateTime(), nullable=True))
+    op.add_column('currency_candles', sa.Column('closed_at', sa.DateTime(), nullable=True))
+    # tick times of stored candles are unknown: with the bucket start their open stays and a new tick replaces close
+    op.execute('UPDATE currency_candles SET opened_at = bucket, closed_at = bucket')
+    op.alter_column('currency_candles', 'opened_at', nullable=False)
+    op.alter_column('currency_candles', 'closed_at', nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column('currency_candles', 'closed_at')
+    op.drop_column('currency_candles', 'opened_at')
@@ -0,0 +1,26 @@
+"""currency pairs spread
+
+Revision ID: e3a7b1c5d920
+Revises: 9d4f2c6e8a17
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a7b1c5d920'
+down_revision: Union[str, None] = '9d4f2c6e8a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('currency_pairs', sa.Column('spread', sa.Float(precision=50), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('currency_pairs', 'spread')
@@ -0,0 +1,35 @@
+"""currency candles exchanger
+
+Revision ID: f1c8a4d2b6e3
+Revises: e3a7b1c5d920
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c8a4d2b6e3'
+down_revision: Union[str, None] = 'e3a7b1c5d920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # stored candles mix ticks of all exchangers, recompute them with currency-pairs-backfill-candles
+    op.execute('DELETE FROM currency_candles')
+    op.drop_constraint('currency_candles_pkey', 'currency_candles', type_='primary')
+    op.add_column('currency_candles', sa.Column('exchanger', sa.String(length=20), nullable=False))
+    op.create_primary_key(
+        'currency_candles_pkey', 'currency_candles', ['token', 'currency', 'exchanger', 'resolution', 'bucket'],
+    )
+
+
+def downgrade() -> None:
+    op.execute('DELETE FROM currency_candles')
+    op.drop_constraint('currency_candles_pkey', 'currency_candles', type_='primary')
+    op.drop_column('currency_candles', 'exchanger')
+    op.create_primary_key('currency_candles_pkey', 'currency_candles', ['token', 'currency', 'resolution', 'bucket'])
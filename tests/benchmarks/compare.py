@@ -0,0 +1,75 @@
+"""Compare benchmark results with a baseline and fail on regressions.
+
+    python -m tests.benchmarks.compare benchmark-results/baseline-micro.json benchmark-results/micro.json \
+        --threshold 0.2
+
+Exits with 1 when any metric of a benchmark present in both files is worse than the baseline
+by more than `threshold`, e.g. 0.2 is 20% slower or 20% less throughput.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+# compared metrics, True when lower is better
+METRICS: Dict[str, bool] = {
+    "p50_us": True,
+    "p50_ms": True,
+    "p99_ms": True,
+    "throughput_rps": False,
+    "failures": True,
+}
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> Tuple[List[str], List[str]]:
+    """
+    Compare metrics of benchmarks present in both results.
+
+    Returns:
+        tuple: lines of the report and lines of regressions
+    """
+    report, regressions = [], []
+    for name, stats in sorted(current["benchmarks"].items()):
+        base_stats = baseline["benchmarks"].get(name)
+        if base_stats is None:
+            report.append(f"{name}: new")
+            continue
+        for metric, lower_is_better in METRICS.items():
+            if metric not in stats or metric not in base_stats:
+                continue
+            old, new = base_stats[metric], stats[metric]
+            change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+            worse = change > threshold if lower_is_better else change < -threshold
+            line = f"{name} {metric}: {old:.2f} -> {new:.2f} ({change:+.1%})"
+            report.append(f"{line} REGRESSION" if worse else line)
+            if worse:
+                regressions.append(line)
+    report += [f"{name}: missing" for name in sorted(set(baseline["benchmarks"]) - set(current["benchmarks"]))]
+    return report, regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare benchmark results with a baseline.")
+    parser.add_argument("baseline", help="JSON results of the baseline run")
+    parser.add_argument("current", help="JSON results of the current run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative change, 0.2 is 20%%")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    with open(args.current, encoding="utf-8") as file:
+        current = json.load(file)
+    if baseline["suite"] != current["suite"]:
+        sys.exit(f"Cannot compare {baseline['suite']} results with {current['suite']} results")
+    if baseline["params"] != current["params"]:
+        print(f"Parameters differ: {baseline['params']} and {current['params']}", file=sys.stderr)
+
+    report, regressions = compare(baseline, current, args.threshold)
+    print("\n".join(report))
+    if regressions:
+        print(f"{len(regressions)} regressions above {args.threshold:.0%}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
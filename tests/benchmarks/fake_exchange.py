@@ -0,0 +1,175 @@
+"""Fake exchange servers: Binance and CoinGecko REST endpoints and the Binance ticker stream used by the worker.
+
+Prices are quoted around fixed USD rates with a small random walk, so every cycle of the worker
+writes changed prices. Every response is delayed by `delay` seconds to stand in for the network.
+
+    python -m tests.benchmarks.fake_exchange --port 8765
+
+Point the worker to it with `exchanges.binance.api_url: "http://127.0.0.1:8765/binance/api"`
+and `exchanges.coingecko.api_url: "http://127.0.0.1:8765/coingecko/api/v3/"`.
+`FakeTickerStream` serves the combined mini ticker stream, `exchanges.binance.ws_url: "ws://127.0.0.1:<port>"`.
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+from urllib.parse import parse_qs, urlparse
+
+__all__ = (
+    "FakeExchange",
+    "FakeTickerStream",
+    "start",
+)
+
+# USD price of assets by their Binance and CoinGecko names
+USD_PRICES: Dict[str, float] = {
+    "BTC": 50000.0,
+    "ETH": 3000.0,
+    "USDT": 1.0,
+    "RUB": 1 / 90.0,
+}
+COINGECKO_IDS = {"bitcoin": "BTC", "ethereum": "ETH", "tether": "USDT"}
+COINGECKO_CURRENCIES = {"usd": "USDT", "rub": "RUB"}
+
+
+class FakeExchange(ThreadingHTTPServer):
+    """HTTP server answering like Binance and CoinGecko."""
+
+    daemon_threads = True
+
+    def __init__(self, port: int, delay: float = 0.05, volatility: float = 0.0005) -> None:
+        super().__init__(("127.0.0.1", port), FakeExchangeHandler)
+        self.delay = delay
+        self.volatility = volatility
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def price(self, base: str, quote: str) -> float:
+        with self._lock:
+            self.requests += 1
+        drift = 1 + random.uniform(-self.volatility, self.volatility)
+        return USD_PRICES[base] / USD_PRICES[quote] * drift
+
+
+class FakeExchangeHandler(BaseHTTPRequestHandler):
+    """Handler of Binance `/binance/api/v3/...` and CoinGecko `/coingecko/api/v3/...` requests."""
+
+    server: FakeExchange
+
+    def log_message(self, *args: Any) -> None:  # pylint: disable=arguments-differ
+        pass
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        time.sleep(self.server.delay)
+        if url.path.endswith("/ping"):
+            self.send_json({"gecko_says": "(V3) To the Moon!"} if url.path.startswith("/coingecko") else {})
+        elif url.path == "/binance/api/v3/ticker/price":
+            self.send_json(self.binance_tickers(json.loads(query.get("symbols", ["[]"])[0])))
+        elif url.path == "/coingecko/api/v3/simple/price":
+            self.send_json(self.coingecko_prices(query["ids"][0].split(","), query["vs_currencies"][0].split(",")))
+        else:
+            self.send_error(404)
+
+    def binance_tickers(self, symbols: list) -> list:
+        tickers = []
+        for symbol in symbols:
+            for base in USD_PRICES:
+                quote = symbol[len(base):]
+                if symbol.startswith(base) and quote in USD_PRICES:
+                    tickers.append({"symbol": symbol, "price": f"{self.server.price(base, quote):.8f}"})
+                    break
+        return tickers
+
+    def coingecko_prices(self, ids: list, currencies: list) -> dict:
+        return {
+            coin: {
+                currency: self.server.price(COINGECKO_IDS[coin], COINGECKO_CURRENCIES[currency])
+                for currency in currencies if currency in COINGECKO_CURRENCIES
+            }
+            for coin in ids if coin in COINGECKO_IDS
+        }
+
+    def send_json(self, body: Any) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeTickerStream:
+    """Binance combined stream `/stream?streams=btcusdt@miniTicker/...` sending `prices` every `interval` seconds."""
+
+    def __init__(self, port: int, prices: Dict[str, float], interval: float = 0.05) -> None:
+        self.port = port
+        self.prices = prices
+        self.interval = interval
+        self.connections = 0
+        self._loop = asyncio.new_event_loop()
+        self._stopped: "asyncio.Future[None]" = self._loop.create_future()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._loop.run_until_complete, args=(self._serve(),),
+                                        name="fake-ticker-stream", daemon=True)
+
+    def start(self) -> "FakeTickerStream":
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def shutdown(self) -> None:
+        self._loop.call_soon_threadsafe(self._stopped.set_result, None)
+        self._thread.join(5)
+
+    async def _serve(self) -> None:
+        import websockets  # pylint: disable=import-outside-toplevel
+
+        async with websockets.serve(self._handle, "127.0.0.1", self.port):
+            self._ready.set()
+            await self._stopped
+
+    async def _handle(self, connection: Any) -> None:
+        # request path of websockets >= 14, path of the legacy server before
+        path = connection.request.path if hasattr(connection, "request") else connection.path
+        streams = parse_qs(urlparse(path).query).get("streams", [""])[0].split("/")
+        self.connections += 1
+        while True:
+            for stream in streams:
+                symbol = stream.partition("@")[0].upper()
+                if symbol in self.prices:
+                    data = {"e": "24hrMiniTicker", "E": int(time.time() * 1000), "s": symbol,
+                            "c": f"{self.prices[symbol]:.8f}"}
+                    await connection.send(json.dumps({"stream": stream, "data": data}))
+            await asyncio.sleep(self.interval)
+
+
+def start(port: int, delay: float = 0.05) -> FakeExchange:
+    """
+    Serve the fake exchange in a background thread.
+
+    Returns:
+        FakeExchange: running server, stop it with shutdown()
+    """
+    server = FakeExchange(port, delay)
+    threading.Thread(target=server.serve_forever, name="fake-exchange", daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve fake Binance and CoinGecko REST endpoints.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.05, help="seconds every response is delayed by")
+    args = parser.parse_args()
+    server = FakeExchange(args.port, args.delay)
+    print(f"Serving fake exchanges on http://127.0.0.1:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
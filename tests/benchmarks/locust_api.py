@@ -0,0 +1,59 @@
+"""Locust scenario of the API with endpoints reading Postgres on every request.
+
+`/history` and `/candles` query the database, `/courses` is served from the snapshot, so a blocked
+event loop shows up in the latency of all of them. Run by `tests.benchmarks.locust_db`, or alone:
+
+    locust -f tests/benchmarks/locust_api.py --host http://127.0.0.1:8900
+"""
+import datetime
+
+from locust import FastHttpUser, between, task
+
+from tests.benchmarks.common import load_config
+
+CONFIG = load_config()
+PREFIX = CONFIG["fastapi"]["prefix_v1"]
+PAIRS = [
+    (token.lower(), currency.lower())
+    for token in CONFIG["pairs"]["tokens"] for currency in CONFIG["pairs"]["currencies"]
+]
+# seconds of history and candles requested, ending now
+WINDOW = 600
+
+
+class ApiUser(FastHttpUser):
+    """User of courses, history and candles of every configured pair."""
+
+    wait_time = between(0, 0.01)
+
+    def on_start(self) -> None:
+        self.number = 0
+
+    def next_pair(self) -> tuple:
+        self.number += 1
+        return PAIRS[self.number % len(PAIRS)]
+
+    @staticmethod
+    def window() -> str:
+        end = datetime.datetime.utcnow()
+        start = end - datetime.timedelta(seconds=WINDOW)
+        return f"start={start.isoformat()}&end={end.isoformat()}"
+
+    @task(2)
+    def courses(self) -> None:
+        token, currency = self.next_pair()
+        self.client.get(f"{PREFIX}/courses?token={token}&currency={currency}", name="/courses")
+
+    @task
+    def history(self) -> None:
+        token, currency = self.next_pair()
+        self.client.get(
+            f"{PREFIX}/history?token={token}&currency={currency}&{self.window()}&resolution=10", name="/history",
+        )
+
+    @task
+    def candles(self) -> None:
+        token, currency = self.next_pair()
+        self.client.get(
+            f"{PREFIX}/candles?token={token}&currency={currency}&{self.window()}&resolution=1m", name="/candles",
+        )
@@ -0,0 +1,165 @@
+"""Micro-benchmarks of the API hot path and repository methods.
+
+Run from the repository root:
+
+    python -m tests.benchmarks.micro --output benchmark-results/micro.json
+
+The API services are built by the API container with prices put on a price board
+of their own (`bwg_benchmark`), so a running API is not affected. Repository benchmarks
+write rows of exchanger `benchmark` in transactions rolled back after every sample,
+skip them with `--no-db` when Postgres is not available.
+"""
+import argparse
+import contextlib
+import datetime
+import itertools
+import logging
+import sys
+from typing import Any, Dict, List
+
+from tests.benchmarks.common import DEFAULT_DSN, measure, measure_async, write_results
+
+EXCHANGERS = ("binance", "coingecko")
+
+
+def make_rows(pairs: List[tuple]) -> List[dict]:
+    now = datetime.datetime.utcnow()
+    return [
+        {
+            'token': token,
+            'currency': currency,
+            'value': 100.0 + index,
+            'exchanger': exchanger,
+            'timestamp': now,
+            'spread': None,
+        }
+        for index, (token, currency) in enumerate(pairs)
+        for exchanger in EXCHANGERS
+    ]
+
+
+def make_container(dsn: str) -> Any:
+    from bwg.currency_pairs_api.containers import create_container  # pylint: disable=import-outside-toplevel
+
+    container = create_container()
+    container.config.from_dict({
+        "postgres": {
+            "dsn": dsn,
+            "async_dsn": dsn.replace("+psycopg2", "+asyncpg"),
+            "replica_dsns": [],
+            "async_replica_dsns": [],
+        },
+        # no users lock: the benchmark is the only user of its board and does not share the API's lock
+        "price_board": {"name": "bwg_benchmark", "lock_path": "/tmp/bwg_benchmark.lock", "users_path": None},
+    })
+    return container
+
+
+def bench_api(container: Any, number: int, repeat: int) -> Dict[str, dict]:
+    # timestamps are refreshed before every benchmark, so prices stay fresh however long the run is
+    snapshot = container.snapshot()
+    pairs = list(container.pair_registry().pairs)
+    currency_pairs = container.currency_pairs()
+
+    def refresh() -> None:
+        snapshot.update(make_rows(pairs), replace=True)
+
+    results = {}
+    refresh()
+    results["currency_pairs.execute"] = measure_async(lambda: currency_pairs.execute("btc", "usd"), number, repeat)
+    refresh()
+    results["currency_pairs.execute_exchanger"] = measure_async(
+        lambda: currency_pairs.execute("btc", "usd", "binance"), number, repeat,
+    )
+    refresh()
+    results["currency_pairs.execute_batch"] = measure(
+        lambda: currency_pairs.execute_batch(None, None), number // 10, repeat,
+    )
+    refresh()
+    row = snapshot.get("BTC", "USD")
+    results["currency_pairs.check_if_data_expired"] = measure(
+        lambda: currency_pairs.check_if_data_expired(row), number, repeat,
+    )
+    return results
+
+
+def bench_repository(container: Any, number: int, repeat: int) -> Dict[str, dict]:
+    from bwg.lib.models.currency_pairs import CurrencyPairs  # pylint: disable=import-outside-toplevel
+
+    repository = container.currency_pairs_repository()
+    model = CurrencyPairs(**make_rows(list(container.pair_registry().pairs))[0])
+    return {
+        "base_repository.model_as_dict": measure(lambda: repository.model_as_dict(model), number, repeat),
+    }
+
+
+def bench_database(container: Any, number: int, repeat: int) -> Dict[str, dict]:
+    db = container.postgres_package.db()
+    repository = container.currency_pairs_repository()
+    rows = [
+        dict(row, exchanger="benchmark")
+        for row in make_rows(list(container.pair_registry().pairs)) if row['exchanger'] == EXCHANGERS[0]
+    ]
+    counter = itertools.count()
+
+    def changed(row: dict) -> dict:
+        # upsert skips rows not newer than stored ones
+        number = next(counter)
+        return dict(row, value=float(number), timestamp=row['timestamp'] + datetime.timedelta(microseconds=number))
+
+    state: Dict[str, Any] = {}
+
+    def begin() -> None:
+        state['stack'] = contextlib.ExitStack()
+        state['session'] = state['stack'].enter_context(db.session())
+
+    def rollback() -> None:
+        state['session'].rollback()
+        state['stack'].close()
+
+    def insert_or_update() -> None:
+        repository.insert_or_update(state['session'], **changed(rows[0]))
+        state['session'].flush()
+
+    def bulk_upsert() -> None:
+        repository.bulk_upsert(state['session'], [changed(row) for row in rows])
+
+    return {
+        "base_repository.insert_or_update": measure(insert_or_update, number, repeat, begin, rollback),
+        "base_repository.bulk_upsert": measure(bulk_upsert, number, repeat, begin, rollback),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run micro-benchmarks and write results as JSON.")
+    parser.add_argument("--output", help="path of the JSON results, printed when omitted")
+    parser.add_argument("--dsn", default=DEFAULT_DSN, help="sync SQLAlchemy DSN of Postgres (env BENCHMARK_DSN)")
+    parser.add_argument("--no-db", action="store_true", help="skip benchmarks which need Postgres")
+    parser.add_argument("--number", type=int, default=2000, help="calls per sample of in-memory benchmarks")
+    parser.add_argument("--db-number", type=int, default=50, help="calls per sample of database benchmarks")
+    parser.add_argument("--repeat", type=int, default=20, help="samples of every benchmark")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    container = make_container(args.dsn)
+    try:
+        benchmarks = {
+            **bench_api(container, args.number, args.repeat),
+            **bench_repository(container, args.number, args.repeat),
+        }
+        if not args.no_db:
+            benchmarks.update(bench_database(container, args.db_number, args.repeat))
+    finally:
+        # the only user of the benchmark board, closing removes its shared memory
+        container.price_board().close()
+    for name, stats in benchmarks.items():
+        print(f"{name}: p50 {stats['p50_us']:.2f}us, {stats['ops_per_second']:.0f} ops/s", file=sys.stderr)
+    write_results(args.output, "micro", benchmarks, {
+        "number": args.number,
+        "db_number": None if args.no_db else args.db_number,
+        "repeat": args.repeat,
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Tests of the API endpoints with prices put on a price board of their own."""
+import datetime
+import uuid
+from email.utils import format_datetime
+from typing import Iterator
+
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from bwg.currency_pairs_api.app import Application
+
+
+@pytest.fixture(name="app")
+def app_fixture() -> Iterator[FastAPI]:
+    application = Application()
+    application.container.config.from_dict({
+        "price_board": {"name": f"bwg_test_{uuid.uuid4().hex[:8]}", "users_path": None},
+    })
+    app = application.create_api_app()
+    yield app
+    app.container.price_board().close()  # type: ignore[attr-defined]
+
+
+@pytest.fixture(name="client")
+def client_fixture(app: FastAPI) -> TestClient:
+    return TestClient(app)
+
+
+@pytest.fixture(name="priced_client")
+def priced_client_fixture(app: FastAPI, client: TestClient) -> TestClient:
+    app.container.snapshot().update([{  # type: ignore[attr-defined]
+        'token': 'BTC', 'currency': 'USD', 'exchanger': 'binance', 'value': 50000.0,
+        'timestamp': datetime.datetime.utcnow(), 'spread': None,
+    }])
+    return client
+
+
+def test_price_has_validators(priced_client: TestClient) -> None:
+    response = priced_client.get("/api/v1/courses?token=btc&currency=usd")
+
+    assert response.status_code == 200
+    assert response.json()["cources"][0]["value"] == 50000.0
+    assert response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+
+
+def test_matching_etag_is_not_modified(priced_client: TestClient) -> None:
+    etag = priced_client.get("/api/v1/courses?token=btc&currency=usd").headers["ETag"]
+
+    response = priced_client.get("/api/v1/courses?token=btc&currency=usd", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert not response.content
+
+
+def test_other_etag_gets_the_price(priced_client: TestClient) -> None:
+    response = priced_client.get("/api/v1/courses?token=btc&currency=usd", headers={"If-None-Match": '"other"'})
+
+    assert response.status_code == 200
+
+
+def test_not_modified_since_last_modified(priced_client: TestClient) -> None:
+    last_modified = priced_client.get("/api/v1/courses?token=btc&currency=usd").headers["Last-Modified"]
+    earlier = format_datetime(datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc), usegmt=True)
+
+    assert priced_client.get(
+        "/api/v1/courses?token=btc&currency=usd", headers={"If-Modified-Since": last_modified},
+    ).status_code == 304
+    assert priced_client.get(
+        "/api/v1/courses?token=btc&currency=usd", headers={"If-Modified-Since": earlier},
+    ).status_code == 200
+
+
+def test_stream_of_unknown_direction_is_closed_with_the_message(client: TestClient) -> None:
+    with pytest.raises(WebSocketDisconnect) as error:
+        with client.websocket_connect("/api/v1/courses/stream?directions=foo-usd") as websocket:
+            websocket.receive_json()
+
+    assert error.value.code == 1008
+    assert error.value.reason.startswith("Token not found")
@@ -0,0 +1,55 @@
+"""Tests of BinanceStreamService against the fake exchange and ticker stream."""
+import socket
+import time
+from typing import Iterator
+
+import pytest
+
+from bwg.currency_pairs.containers import Container, create_container
+from bwg.currency_pairs.services.binance_stream import STREAM_FALLBACKS
+from tests.benchmarks.fake_exchange import FakeTickerStream, start
+
+# the fake exchange quotes BTC at about 50000 USDT
+STREAM_PRICE = 12345.0
+
+
+def fallbacks() -> float:
+    return next(sample.value for metric in STREAM_FALLBACKS.collect() for sample in metric.samples
+                if sample.name.endswith("_total"))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(name="container")
+def container_fixture() -> Iterator[Container]:
+    exchange = start(free_port(), delay=0)
+    stream = FakeTickerStream(free_port(), {"BTCUSDT": STREAM_PRICE}).start()
+    container = create_container()
+    container.config.from_dict({"exchanges": {"binance": {
+        "api_url": f"http://127.0.0.1:{exchange.server_port}/binance/api",
+        "ws_url": f"ws://127.0.0.1:{stream.port}",
+    }}})
+    yield container
+    stream.shutdown()
+    exchange.shutdown()
+
+
+def test_stream_prices_with_rest_fallback(container: Container) -> None:
+    binance_stream = container.binance_stream()
+    binance_stream.start(["BTCUSDT"])
+    deadline = time.monotonic() + 5
+    while not binance_stream.get_tickers() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    fallbacks_before = fallbacks()
+
+    prices = binance_stream.get_prices()
+
+    assert prices[("BTC", "USD")].value == STREAM_PRICE
+    # ETHUSDT and USDTRUB are not streamed, they are fetched over REST
+    assert prices[("ETH", "USD")].value == pytest.approx(3000, rel=0.01)
+    assert prices[("BTC", "RUB")].value == pytest.approx(STREAM_PRICE * 90, rel=0.01)
+    assert fallbacks() == fallbacks_before + 1
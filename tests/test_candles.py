@@ -0,0 +1,66 @@
+"""Tests of candles aggregation from ticks and of their merge on Postgres of TEST_DSN."""
+import datetime
+from typing import Tuple
+
+from sqlalchemy import orm
+
+from bwg.currency_pairs.services.candles import CandlesAggregator
+from bwg.lib.models.currency_candles import CurrencyCandles
+from bwg.lib.repositories.currency_candles import CurrencyCandlesRepository
+
+START = datetime.datetime(2024, 1, 1)
+
+
+def test_candles_of_exchangers_are_separate() -> None:
+    aggregator = CandlesAggregator({"1m": 60})
+    ticks = [
+        ("BTC", "USD", "binance", START, 100.0),
+        ("BTC", "USD", "coingecko", START + datetime.timedelta(seconds=1), 200.0),
+        ("BTC", "USD", "binance", START + datetime.timedelta(seconds=2), 110.0),
+    ]
+
+    candles = aggregator.aggregate(*zip(*ticks))
+
+    by_exchanger = {candle['exchanger']: candle for candle in candles}
+    assert len(candles) == 2
+    assert by_exchanger["binance"]["open"] == 100.0
+    assert by_exchanger["binance"]["close"] == 110.0
+    assert by_exchanger["binance"]["ticks"] == 2
+    assert by_exchanger["coingecko"]["high"] == 200.0
+    assert by_exchanger["coingecko"]["ticks"] == 1
+
+
+def test_candles_keep_times_of_their_first_and_last_ticks() -> None:
+    aggregator = CandlesAggregator({"1m": 60})
+    ticks = [
+        ("BTC", "USD", "binance", START + datetime.timedelta(seconds=5), 110.0),
+        ("BTC", "USD", "binance", START + datetime.timedelta(seconds=1), 100.0),
+    ]
+
+    candle, = aggregator.aggregate(*zip(*ticks))
+
+    assert candle["opened_at"] == START + datetime.timedelta(seconds=1)
+    assert candle["closed_at"] == START + datetime.timedelta(seconds=5)
+
+
+def test_batches_merged_out_of_order_keep_open_and_close(pg_session: orm.Session) -> None:
+    aggregator = CandlesAggregator({"1m": 60})
+    repository = CurrencyCandlesRepository()
+
+    def merge(*ticks: Tuple[int, float]) -> None:
+        rows = [("BTC", "USD", "binance", START + datetime.timedelta(seconds=second), value)
+                for second, value in ticks]
+        repository.merge_candles(pg_session, aggregator.aggregate(*zip(*rows)))
+
+    merge((20, 120.0), (30, 130.0))
+    # an earlier batch, e.g. of an overlapping cycle, written after the later one
+    merge((10, 110.0), (15, 90.0))
+    pg_session.expire_all()
+    assert pg_session.query(CurrencyCandles.open, CurrencyCandles.close).one() == (110.0, 130.0)
+    merge((40, 140.0))
+    pg_session.expire_all()
+
+    candle = pg_session.query(CurrencyCandles).one()
+    assert (candle.open, candle.high, candle.low, candle.close, candle.ticks) == (110.0, 140.0, 90.0, 140.0, 5)
+    assert candle.opened_at == START + datetime.timedelta(seconds=10)
+    assert candle.closed_at == START + datetime.timedelta(seconds=40)
@@ -0,0 +1,88 @@
+"""Tests of CircuitBreaker states with a fake clock and no jitter."""
+from typing import List
+
+import pytest
+
+from bwg.currency_pairs.services import circuit_breaker
+from bwg.currency_pairs.services.circuit_breaker import (CircuitBreaker,
+                                                         CircuitState)
+
+
+@pytest.fixture(name="clock")
+def clock_fixture(monkeypatch: pytest.MonkeyPatch) -> List[float]:
+    now = [100.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(circuit_breaker.random, "uniform", lambda low, high: 1.0)
+    return now
+
+
+def opened_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=5, max_reset_timeout=12)
+    for _ in range(3):
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_threshold_failures(clock: List[float]) -> None:
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=5)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+
+
+def test_success_resets_failures(clock: List[float]) -> None:
+    breaker = CircuitBreaker("test", failure_threshold=3)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_lets_one_probe_through_after_backoff(clock: List[float]) -> None:
+    breaker = opened_breaker()
+    clock[0] += 4.9
+    assert not breaker.allow()
+
+    clock[0] += 0.1
+
+    assert breaker.allow()
+    assert breaker.state == CircuitState.HALF_OPEN
+    # the probe is in flight
+    assert not breaker.allow()
+
+
+def test_probe_success_closes(clock: List[float]) -> None:
+    breaker = opened_breaker()
+    clock[0] += 5
+    breaker.allow()
+
+    breaker.record_success()
+
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow()
+
+
+def test_probe_failure_reopens_with_doubled_backoff(clock: List[float]) -> None:
+    breaker = opened_breaker()
+    clock[0] += 5
+    breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    clock[0] += 9.9
+    assert not breaker.allow()
+    clock[0] += 0.1
+    assert breaker.allow()
+    # backoff doubles up to max_reset_timeout
+    breaker.record_failure()
+    clock[0] += 12
+    assert breaker.allow()
@@ -0,0 +1,41 @@
+"""Tests of read replica lag checks and of the blocking database path, the query runs on Postgres of TEST_DSN."""
+import asyncio
+from unittest import mock
+
+from sqlalchemy import orm
+
+from bwg.lib.database import REPLICA_LAG_QUERY, BlockingAsyncDatabase, Replica, ReplicaSet
+
+
+def make_replicas() -> ReplicaSet:
+    replica = Replica("replica0", mock.Mock(), mock.Mock())
+    return ReplicaSet("test", [replica], max_lag=5, lag_check_interval=5)
+
+
+def test_replica_of_unknown_lag_is_not_usable() -> None:
+    replicas = make_replicas()
+    replica, = replicas.replicas
+
+    replicas.record_lag(replica, 1.0)
+    assert replicas.is_usable(replica)
+
+    replicas.record_lag(replica, ReplicaSet.lag_of(replica, None))
+    assert not replicas.is_usable(replica)
+
+
+def test_lag_of_a_server_not_streaming_from_the_primary_is_unknown(pg_session: orm.Session) -> None:
+    # TEST_DSN is a primary, a replica which lost the primary does not stream either
+    assert pg_session.execute(REPLICA_LAG_QUERY).scalar() is None
+
+
+def test_blocking_database_runs_async_calls_on_sync_session() -> None:
+    database = mock.MagicMock()
+    sync_session = database.session.return_value.__enter__.return_value
+
+    async def read() -> object:
+        async with BlockingAsyncDatabase(database).session(read_only=True) as session:
+            return await session.execute("statement")
+
+    assert asyncio.run(read()) is sync_session.execute.return_value
+    database.session.assert_called_once_with(read_only=True)
+    sync_session.execute.assert_called_once_with("statement")
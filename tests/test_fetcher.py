@@ -0,0 +1,129 @@
+"""Tests of FetcherService and RateLimiter against the fake exchange."""
+import json
+import socket
+import time
+import urllib.request
+from typing import Iterator
+
+import pytest
+
+from bwg.currency_pairs.containers import Container, create_container
+from bwg.currency_pairs.services.circuit_breaker import CircuitBreaker
+from bwg.currency_pairs.services.fetcher import FetcherService, RateLimiter
+from tests.benchmarks.fake_exchange import FakeExchange, start
+
+DELAY = 0.2
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(name="exchange", scope="module")
+def exchange_fixture() -> Iterator[FakeExchange]:
+    exchange = start(free_port(), delay=DELAY)
+    yield exchange
+    exchange.shutdown()
+
+
+@pytest.fixture(name="fetcher")
+def fetcher_fixture() -> Iterator[FetcherService]:
+    fetcher = FetcherService(max_workers=4)
+    yield fetcher
+    fetcher.close()
+
+
+def ticker(exchange: FakeExchange, symbol: str) -> dict:
+    url = f"http://127.0.0.1:{exchange.server_port}/binance/api/v3/ticker/price?symbols=" + json.dumps([symbol])
+    with urllib.request.urlopen(url, timeout=5) as response:
+        tickers = json.load(response)
+    if not tickers:
+        raise LookupError(f"No market of {symbol}")
+    return tickers[0]
+
+
+def test_map_calls_concurrently(exchange: FakeExchange, fetcher: FetcherService) -> None:
+    symbols = ["BTCUSDT", "ETHUSDT", "USDTRUB", "BTCRUB"]
+
+    started_at = time.monotonic()
+    res = fetcher.map(lambda symbol: ticker(exchange, symbol), symbols, RateLimiter(100, 4), timeout=2)
+
+    # four requests of DELAY seconds each take about DELAY in the pool of four workers
+    assert time.monotonic() - started_at < DELAY * 2
+    assert {symbol: result["symbol"] for symbol, result in res.items()} == {symbol: symbol for symbol in symbols}
+
+
+def test_map_skips_failed_and_timed_out_calls(exchange: FakeExchange, fetcher: FetcherService) -> None:
+    def fetch(symbol: str) -> dict:
+        if symbol == "SLOW":
+            time.sleep(DELAY * 3)
+        return ticker(exchange, "BTCUSDT" if symbol == "SLOW" else symbol)
+
+    res = fetcher.map(fetch, ["BTCUSDT", "UNKNOWN", "SLOW"], RateLimiter(100, 3), timeout=DELAY * 2)
+
+    assert list(res) == ["BTCUSDT"]
+
+
+def test_map_takes_a_token_per_call(exchange: FakeExchange, fetcher: FetcherService) -> None:
+    symbols = ["BTCUSDT", "ETHUSDT", "USDTRUB", "BTCRUB"]
+
+    started_at = time.monotonic()
+    res = fetcher.map(lambda symbol: ticker(exchange, symbol), symbols, RateLimiter(5, 1), timeout=5)
+
+    # the first call takes the burst token, three more wait 1 / rate seconds each
+    assert time.monotonic() - started_at >= 3 / 5
+    assert len(res) == len(symbols)
+
+
+def test_call_skips_requests_while_circuit_is_open(exchange: FakeExchange, fetcher: FetcherService) -> None:
+    breaker = CircuitBreaker("fake", failure_threshold=2, reset_timeout=60)
+    limiter = RateLimiter(100, 10)
+
+    assert fetcher.call("btc", lambda: ticker(exchange, "BTCUSDT"), limiter, timeout=2, circuit_breaker=breaker)
+    for _ in range(2):
+        assert fetcher.call("unknown", lambda: ticker(exchange, "UNKNOWN"), limiter, 2, breaker) is None
+    requests = exchange.requests
+
+    assert fetcher.call("btc", lambda: ticker(exchange, "BTCUSDT"), limiter, 2, breaker) is None
+    assert exchange.requests == requests
+
+
+def test_rate_limiter_allows_burst_then_rate() -> None:
+    limiter = RateLimiter(rate=20, burst=2)
+
+    started_at = time.monotonic()
+    for _ in range(2):
+        limiter.acquire()
+    burst = time.monotonic() - started_at
+    for _ in range(4):
+        limiter.acquire()
+    elapsed = time.monotonic() - started_at
+
+    assert burst < 0.02
+    assert 4 / 20 * 0.9 <= elapsed < 4 / 20 + 0.1
+
+
+@pytest.fixture(name="container")
+def container_fixture(exchange: FakeExchange) -> Container:
+    container = create_container()
+    url = f"http://127.0.0.1:{exchange.server_port}"
+    container.config.from_dict({"exchanges": {
+        "binance": {"api_url": f"{url}/binance/api"},
+        "coingecko": {"api_url": f"{url}/coingecko/api/v3/"},
+    }})
+    return container
+
+
+def test_exchange_services_price_configured_pairs(container: Container) -> None:
+    pair_registry = container.pair_registry()
+
+    binance = container.binance().get_prices()
+    coingecko = container.coingecko().get_prices()
+
+    # Binance has no market of USDT in USD, the other pairs are derived from its basis markets
+    assert set(binance) == set(pair_registry.pairs) - {("USDTTRC", "USD"), ("USDTERC", "USD")}
+    assert set(coingecko) == set(pair_registry.pairs)
+    assert 45000 < binance[("BTC", "USD")].value < 55000
+    assert 45000 < coingecko[("BTC", "USD")].value < 55000
@@ -0,0 +1,41 @@
+"""Tests of HistoryService source selection."""
+from unittest import mock
+
+import pytest
+from fastapi import HTTPException
+
+from bwg.currency_pairs_api.services.currency_pairs import CurrencyPairsService
+from bwg.currency_pairs_api.services.history import HistoryService
+from bwg.lib.pair_registry import PairRegistry
+
+
+@pytest.fixture(name="history")
+def history_fixture() -> HistoryService:
+    currency_pairs = CurrencyPairsService()
+    currency_pairs.pair_registry = PairRegistry(
+        {"BTC": {"binance": "BTC", "coingecko": "bitcoin"}},
+        {"USD": {"binance": "USDT", "coingecko": "usd"}},
+    )
+    currency_pairs.snapshot = mock.MagicMock()
+    history = HistoryService()
+    history.currency_pairs = currency_pairs
+    return history
+
+
+def test_requested_exchanger_is_normalized(history: HistoryService) -> None:
+    assert history.source_of("BTC", "USD", "CoinGecko") == "coingecko"
+
+
+def test_unknown_exchanger_is_rejected(history: HistoryService) -> None:
+    with pytest.raises(HTTPException) as error:
+        history.source_of("BTC", "USD", "kraken")
+
+    assert error.value.status_code == 422
+
+
+def test_default_source_is_the_source_of_the_current_price(history: HistoryService) -> None:
+    history.currency_pairs.snapshot.get.return_value = {'exchanger': 'consolidated'}
+    assert history.source_of("BTC", "USD") == "consolidated"
+
+    history.currency_pairs.snapshot.get.return_value = None
+    assert history.source_of("BTC", "USD") == "binance"
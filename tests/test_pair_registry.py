@@ -0,0 +1,24 @@
+"""Tests of PairRegistry lookup tables."""
+from bwg.lib.pair_registry import PairRegistry
+
+TOKENS = {
+    "BTC": {"binance": "BTC", "coingecko": "bitcoin"},
+    "USDTTRC": {"binance": "USDT", "coingecko": "tether"},
+    "USDTERC": {"binance": "USDT", "coingecko": "tether"},
+}
+CURRENCIES = {"USD": {"binance": "USDT", "coingecko": "usd"}}
+
+
+def test_aliases_share_the_market() -> None:
+    registry = PairRegistry(TOKENS, CURRENCIES)
+
+    assert registry.codes("coingecko")[("tether", "usd")] == [("USDTTRC", "USD"), ("USDTERC", "USD")]
+    assert registry.normalize_token("bitcoin") == "BTC"
+    # USDT names both aliases, it is not normalized to either of them
+    assert registry.normalize_token("usdt") == "USDT"
+
+
+def test_asset_in_itself_has_no_market() -> None:
+    registry = PairRegistry(TOKENS, CURRENCIES)
+
+    assert list(registry.codes("binance")) == [("BTC", "USDT")]
@@ -0,0 +1,37 @@
+"""Tests of PriceBoard shared memory lifecycle."""
+import os
+import uuid
+from pathlib import Path
+
+from bwg.lib.price_board import PriceBoard
+
+PAIRS = [("BTC", "USD")]
+EXCHANGERS = ["binance"]
+ROW = {'token': 'BTC', 'currency': 'USD', 'value': 1.0, 'exchanger': 'binance', 'epoch': 1.0}
+
+
+def segment_exists(board: PriceBoard) -> bool:
+    return os.path.exists(f"/dev/shm/{board.name}")
+
+
+def test_board_is_shared_and_removed_by_the_last_user(tmp_path: Path) -> None:
+    name, users_path = f"bwg_test_{uuid.uuid4().hex[:8]}", str(tmp_path / "users.lock")
+    writer = PriceBoard(name, PAIRS, EXCHANGERS, users_path)
+    reader = PriceBoard(name, PAIRS, EXCHANGERS, users_path)
+
+    writer.write(ROW)
+    assert reader.get(PAIRS[0], "binance")['value'] == 1.0
+
+    writer.close()
+    assert segment_exists(reader)
+    reader.close()
+    assert not segment_exists(reader)
+
+
+def test_board_without_users_path_is_removed_on_close() -> None:
+    board = PriceBoard(f"bwg_test_{uuid.uuid4().hex[:8]}", PAIRS, EXCHANGERS)
+    assert segment_exists(board)
+
+    board.close()
+
+    assert not segment_exists(board)
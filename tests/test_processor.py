@@ -0,0 +1,72 @@
+"""Tests of ProcessorService cycles with fake exchanges and the configured pairs."""
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+from unittest import mock
+
+import yaml
+
+from bwg.currency_pairs.services.cross_rates import Quote
+from bwg.currency_pairs.services.processor import ProcessorService
+from bwg.currency_pairs.services.source_selector import SourceSelector
+from bwg.lib.pair_registry import PairRegistry
+
+CONFIG_PATH = Path(__file__).resolve().parents[1] / "config" / "config.yml"
+
+
+class FakeBroker:
+    """Broker keeping published events."""
+
+    def __init__(self) -> None:
+        self.events: List[dict] = []
+
+    def publish(self, events: List[dict]) -> None:
+        self.events.extend(events)
+
+
+def make_registry() -> PairRegistry:
+    with open(CONFIG_PATH, encoding="utf-8") as file:
+        pairs = yaml.safe_load(file)["pairs"]
+    return PairRegistry(pairs["tokens"], pairs["currencies"])
+
+
+def quotes_of(registry: PairRegistry, exchanger: str) -> Dict[Tuple[str, str], Quote]:
+    # a quote of every pair the exchange has a market of
+    now = time.time()
+    return {pair: Quote(1.0, now) for pairs in registry.codes(exchanger).values() for pair in pairs}
+
+
+def make_processor(registry: PairRegistry) -> Tuple[ProcessorService, FakeBroker]:
+    processor = ProcessorService(mode="poll", consolidate=False)
+    processor.pair_registry = registry
+    processor.source_selector = SourceSelector(latency_budget=1, timeout=2)
+    processor.binance = mock.Mock(get_prices=lambda: quotes_of(registry, "binance"))
+    processor.coingecko = mock.Mock(get_prices=lambda: quotes_of(registry, "coingecko"))
+    processor.broker = FakeBroker()  # type: ignore[assignment]
+    return processor, processor.broker  # type: ignore[return-value]
+
+
+def test_every_configured_pair_is_published() -> None:
+    registry = make_registry()
+    processor, broker = make_processor(registry)
+
+    assert processor.run_cycle() == "binance"
+
+    published = {(event["token"], event["currency"]): event["exchanger"] for event in broker.events}
+    assert set(published) == set(registry.pairs)
+    # Binance has no market of USDT in itself, CoinGecko fills it in the same cycle
+    assert published[("BTC", "USD")] == "binance"
+    assert published[("USDTTRC", "USD")] == "coingecko"
+    assert published[("USDTERC", "USD")] == "coingecko"
+
+
+def test_other_sources_are_not_called_without_missing_pairs() -> None:
+    registry = PairRegistry({"BTC": {"binance": "BTC", "coingecko": "bitcoin"}},
+                            {"USD": {"binance": "USDT", "coingecko": "usd"}})
+    processor, broker = make_processor(registry)
+    processor.coingecko = mock.Mock(get_prices=mock.Mock(return_value={}))
+    # the selector would hedge with CoinGecko only after the latency budget
+    processor.run_cycle()
+
+    processor.coingecko.get_prices.assert_not_called()
+    assert [event["exchanger"] for event in broker.events] == ["binance"]
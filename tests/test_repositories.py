@@ -0,0 +1,81 @@
+"""Tests of repository writes on an in-memory SQLite database, and on Postgres of TEST_DSN when it is set.
+
+Postgres tests use `pg_session` of conftest.py.
+"""
+import datetime
+from typing import Iterator
+
+import pytest
+from sqlalchemy import create_engine, orm
+
+from bwg.lib.models.currency_pairs import CurrencyPairs
+from bwg.lib.models.currency_ticks import CurrencyTicks
+from bwg.lib.repositories.currency_pairs import CurrencyPairsRepository
+from bwg.lib.repositories.currency_ticks import CurrencyTicksRepository
+
+NOW = datetime.datetime(2024, 1, 1)
+
+
+@pytest.fixture(name="session")
+def session_fixture() -> Iterator[orm.Session]:
+    engine = create_engine("sqlite://")
+    CurrencyPairs.metadata.create_all(engine, tables=[CurrencyPairs.__table__])
+    with orm.Session(engine) as opened:
+        yield opened
+
+
+def pair(value: float, timestamp: datetime.datetime) -> dict:
+    return {'token': 'BTC', 'currency': 'USD', 'exchanger': 'binance', 'value': value, 'timestamp': timestamp,
+            'spread': None}
+
+
+def stored_value(session: orm.Session) -> float:
+    session.expire_all()
+    return session.query(CurrencyPairs).filter_by(token="BTC", currency="USD", exchanger="binance").one().value
+
+
+def test_insert_or_update_inserts_missing_row(session: orm.Session) -> None:
+    repository = CurrencyPairsRepository()
+
+    repository.insert_or_update(session, token="BTC", currency="USD", exchanger="binance", value=1.0, timestamp=NOW)
+    session.commit()
+
+    assert stored_value(session) == 1.0
+
+
+def test_insert_or_update_updates_existing_row(session: orm.Session) -> None:
+    repository = CurrencyPairsRepository()
+    repository.insert_or_update(session, token="BTC", currency="USD", exchanger="binance", value=1.0, timestamp=NOW)
+    session.commit()
+
+    later = NOW + datetime.timedelta(seconds=1)
+    row = repository.insert_or_update(
+        session, token="BTC", currency="USD", exchanger="binance", value=2.0, timestamp=later,
+    )
+    session.commit()
+
+    assert row.value == 2.0
+    assert stored_value(session) == 2.0
+    assert session.query(CurrencyPairs).one().timestamp == later
+
+
+def test_bulk_upsert_keeps_the_newer_row(pg_session: orm.Session) -> None:
+    repository = CurrencyPairsRepository()
+    later = NOW + datetime.timedelta(seconds=1)
+
+    repository.bulk_upsert(pg_session, [pair(1.0, NOW)])
+    repository.bulk_upsert(pg_session, [pair(2.0, later)])
+    # an event of the consumer which came out of order
+    repository.bulk_upsert(pg_session, [pair(3.0, NOW)])
+
+    assert stored_value(pg_session) == 2.0
+
+
+def test_bulk_insert_skips_stored_ticks(pg_session: orm.Session) -> None:
+    repository = CurrencyTicksRepository()
+    tick = {'token': 'BTC', 'currency': 'USD', 'exchanger': 'binance', 'value': 1.0, 'timestamp': NOW}
+    later = dict(tick, timestamp=NOW + datetime.timedelta(seconds=1))
+
+    assert repository.bulk_insert(pg_session, [tick]) == [tick]
+    assert repository.bulk_insert(pg_session, [tick, later]) == [later]
+    assert pg_session.query(CurrencyTicks).count() == 2
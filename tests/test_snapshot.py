@@ -0,0 +1,48 @@
+"""Tests of SnapshotService reads of pairs missing on the board."""
+import asyncio
+import contextlib
+from typing import AsyncIterator
+from unittest import mock
+
+import pytest
+
+from bwg.currency_pairs_api.services import snapshot as snapshot_module
+from bwg.currency_pairs_api.services.snapshot import SnapshotService
+
+
+class FakeDatabase:
+    """Async database counting opened sessions."""
+
+    def __init__(self) -> None:
+        self.sessions = 0
+
+    @contextlib.asynccontextmanager
+    async def session(self, read_only: bool = False) -> AsyncIterator[object]:
+        self.sessions += 1
+        yield object()
+
+
+def make_snapshot() -> SnapshotService:
+    snapshot = SnapshotService(miss_ttl=1)
+    snapshot.db_postgres_async = FakeDatabase()  # type: ignore[assignment]
+    snapshot.currency_pairs_repository = mock.Mock(get_row_async=mock.AsyncMock(return_value=None))
+    return snapshot
+
+
+def test_missing_pair_is_not_read_again_until_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr(snapshot_module.time, "monotonic", lambda: now[0])
+    snapshot = make_snapshot()
+    database: FakeDatabase = snapshot.db_postgres_async  # type: ignore[assignment]
+
+    assert asyncio.run(snapshot.fetch("BTC", "USD")) is None
+    assert asyncio.run(snapshot.fetch("BTC", "USD")) is None
+    assert database.sessions == 1
+
+    # other pairs and exchangers are read
+    asyncio.run(snapshot.fetch("BTC", "USD", "binance"))
+    assert database.sessions == 2
+
+    now[0] += 1
+    asyncio.run(snapshot.fetch("BTC", "USD"))
+    assert database.sessions == 3
@@ -0,0 +1,67 @@
+"""Tests of SourceSelector hedging and failover."""
+import time
+from typing import Callable, Dict
+
+from bwg.currency_pairs.services.source_selector import (SOURCE_FAILOVERS,
+                                                         SOURCE_HEDGES,
+                                                         SourceSelector)
+
+
+def counter_value(counter: object, source: str) -> float:
+    metric = counter.labels(source=source)  # type: ignore[attr-defined]
+    return next(sample.value for family in metric.collect() for sample in family.samples
+                if sample.name.endswith("_total"))
+
+
+def slow(value: dict, delay: float) -> Callable[[], dict]:
+    def fetch() -> dict:
+        time.sleep(delay)
+        return value
+    return fetch
+
+
+def failing() -> dict:
+    raise RuntimeError("exchange is down")
+
+
+def fetch(sources: Dict[str, Callable[[], dict]], latency_budget: float = 0.05) -> tuple:
+    selector = SourceSelector(latency_budget=latency_budget, timeout=2)
+    return selector.fetch(sources)
+
+
+def test_first_source_in_budget_wins_without_hedge() -> None:
+    hedges = counter_value(SOURCE_HEDGES, "second")
+
+    result = fetch({"first": slow({"BTC": 1}, 0), "second": slow({"BTC": 2}, 0)})
+
+    assert result == ("first", {"BTC": 1})
+    assert counter_value(SOURCE_HEDGES, "second") == hedges
+
+
+def test_slow_source_is_hedged() -> None:
+    hedges = counter_value(SOURCE_HEDGES, "second")
+    failovers = counter_value(SOURCE_FAILOVERS, "second")
+
+    result = fetch({"first": slow({"BTC": 1}, 0.5), "second": slow({"BTC": 2}, 0)})
+
+    assert result == ("second", {"BTC": 2})
+    assert counter_value(SOURCE_HEDGES, "second") == hedges + 1
+    assert counter_value(SOURCE_FAILOVERS, "second") == failovers + 1
+
+
+def test_fast_failure_is_a_failover_not_a_hedge() -> None:
+    hedges = counter_value(SOURCE_HEDGES, "second")
+    failovers = counter_value(SOURCE_FAILOVERS, "second")
+    started_at = time.monotonic()
+
+    result = fetch({"first": failing, "second": slow({"BTC": 2}, 0)}, latency_budget=1)
+
+    assert result == ("second", {"BTC": 2})
+    # the next source is called at once, not after the latency budget
+    assert time.monotonic() - started_at < 0.5
+    assert counter_value(SOURCE_HEDGES, "second") == hedges
+    assert counter_value(SOURCE_FAILOVERS, "second") == failovers + 1
+
+
+def test_all_sources_failed() -> None:
+    assert fetch({"first": failing, "second": lambda: {}}) == (None, None)
@@ -0,0 +1,79 @@
+"""Tests of TicksWriter buffering with the database replaced by mocks."""
+from typing import List
+from unittest import mock
+
+import pytest
+
+from bwg.currency_pairs.services.ticks_writer import TicksWriter
+
+
+def make_writer(max_buffer: int = 10000, max_failures: int = 3) -> TicksWriter:
+    writer = TicksWriter(batch_size=1000, flush_interval=3600, max_buffer=max_buffer, max_failures=max_failures)
+    writer.db_postgres = mock.MagicMock()
+    writer.currency_ticks_repository = mock.MagicMock()
+    writer.currency_ticks_repository.bulk_insert.side_effect = lambda session, rows: rows
+    writer.candles_aggregator = mock.MagicMock()
+    return writer
+
+
+def event(value: float, second: int = 0, exchanger: str = "binance") -> dict:
+    return {
+        'token': 'BTC',
+        'currency': 'USD',
+        'exchanger': exchanger,
+        'value': value,
+        'timestamp': f"2024-01-01T00:00:{second:02d}.000000Z",
+    }
+
+
+def inserted_rows(writer: TicksWriter) -> List[dict]:
+    return writer.currency_ticks_repository.bulk_insert.call_args.args[1]
+
+
+def test_quote_published_again_is_one_tick() -> None:
+    writer = make_writer()
+
+    writer.write([event(1.0), event(1.0), event(1.0, exchanger="coingecko")])
+    writer.write([event(1.0)])
+    writer.flush()
+
+    assert len(inserted_rows(writer)) == 2
+    writer.candles_aggregator.update.assert_called_once()
+
+
+def test_candles_get_only_inserted_ticks() -> None:
+    writer = make_writer()
+    writer.currency_ticks_repository.bulk_insert.side_effect = lambda session, rows: rows[1:]
+
+    writer.write([event(1.0, 1), event(2.0, 2)])
+    writer.flush()
+
+    assert [row['value'] for row in writer.candles_aggregator.update.call_args.args[1]] == [2.0]
+
+
+def test_failed_ticks_are_capped() -> None:
+    writer = make_writer(max_buffer=2)
+    writer.currency_ticks_repository.bulk_insert.side_effect = RuntimeError("duplicate key")
+
+    writer.write([event(1.0, 1), event(2.0, 2), event(3.0, 3)])
+    with pytest.raises(RuntimeError):
+        writer.flush()
+
+    writer.currency_ticks_repository.bulk_insert.side_effect = lambda session, rows: rows
+    writer.flush()
+    assert [row['value'] for row in inserted_rows(writer)] == [2.0, 3.0]
+
+
+def test_ticks_are_dropped_after_failed_writes() -> None:
+    writer = make_writer(max_failures=2)
+    writer.currency_ticks_repository.bulk_insert.side_effect = RuntimeError("duplicate key")
+    writer.write([event(1.0, 1)])
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            writer.flush()
+
+    writer.currency_ticks_repository.bulk_insert.side_effect = lambda session, rows: rows
+    writer.write([event(2.0, 2)])
+    writer.flush()
+    assert [row['value'] for row in inserted_rows(writer)] == [2.0]
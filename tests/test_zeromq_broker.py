@@ -0,0 +1,78 @@
+"""Tests of ZeroMQBroker over a local TCP port."""
+import socket
+import threading
+from typing import Iterator, List
+
+import pytest
+
+from bwg.lib.broker import ZeroMQBroker
+
+pytest.importorskip("zmq")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(name="broker")
+def broker_fixture() -> Iterator[ZeroMQBroker]:
+    broker = ZeroMQBroker(url=f"tcp://127.0.0.1:{free_port()}")
+    yield broker
+    broker.close()
+
+
+def test_two_publishing_threads_share_the_bound_socket(broker: ZeroMQBroker) -> None:
+    # events are dropped by the non-blocking send until the consumer is connected
+    while not broker.consume(1, 0.1):
+        broker.publish([{'probe': True}])
+    broker.consume(100, 0.1)
+    errors: List[Exception] = []
+
+    def publish(thread: int) -> None:
+        try:
+            for number in range(50):
+                broker.publish([{'thread': thread, 'number': number}])
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            errors.append(exc)
+
+    threads = [threading.Thread(target=publish, args=(thread,)) for thread in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    events: List[dict] = []
+    while len(events) < 100:
+        batch = broker.consume(100, 2)
+        if not batch:
+            break
+        events += batch
+    assert not errors
+    assert sorted((event['thread'], event['number']) for event in events) == [
+        (thread, number) for thread in range(2) for number in range(50)
+    ]
+
+
+def test_malformed_messages_are_skipped(broker: ZeroMQBroker) -> None:
+    import zmq  # pylint: disable=import-outside-toplevel
+
+    producer = zmq.Context.instance().socket(zmq.PUSH)
+    producer.bind(broker.url)
+    try:
+        # connects the PULL socket, sends below wait for it
+        broker.consume(1, 0.1)
+        for message in (b"{not json", b"\xff", b"[1, 2]", b'{"token": "BTC"}'):
+            producer.send(message)
+
+        events: List[dict] = []
+        while not events:
+            batch = broker.consume(10, 2)
+            if not batch:
+                break
+            events += batch
+    finally:
+        producer.close(linger=0)
+
+    assert events == [{"token": "BTC"}]